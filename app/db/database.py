@@ -4,7 +4,7 @@ import uuid
 from pathlib import Path
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 from typing import AsyncGenerator
 from sqlalchemy.engine.url import make_url
 from models import Base
@@ -44,20 +44,69 @@ def prepared_statement_name_func():
     """각 prepared statement에 고유한 이름을 생성하여 중복 오류를 방지합니다."""
     return f"stmt_{uuid.uuid4().hex[:8]}"
 
+# 연결 풀링 모드
+# - "pooled": AsyncAdaptedQueuePool로 연결을 재사용하고 prepared statement 캐시를 사용합니다.
+#             DB에 직접 붙거나 session 모드 풀러 뒤에 있을 때 사용합니다.
+# - "pgbouncer-transaction": 연결 풀링과 statement 캐시를 끕니다. (기존 동작)
+#             PgBouncer/Supabase pooler 같은 transaction 모드 풀러 뒤에서는 이 모드를 사용해야 합니다.
+POOL_MODE_POOLED = "pooled"
+POOL_MODE_PGBOUNCER_TRANSACTION = "pgbouncer-transaction"
+POOL_MODES = (POOL_MODE_POOLED, POOL_MODE_PGBOUNCER_TRANSACTION)
+
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", POOL_MODE_PGBOUNCER_TRANSACTION).strip().lower()
+if DB_POOL_MODE not in POOL_MODES:
+    raise ValueError(f"DB_POOL_MODE 값이 올바르지 않습니다: {DB_POOL_MODE} (가능한 값: {', '.join(POOL_MODES)})")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # 초 단위
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # 초 단위
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+
+
+def build_engine_kwargs(pool_mode: str = DB_POOL_MODE) -> dict:
+    """
+    풀링 모드에 맞는 create_async_engine 인자를 생성합니다.
+    벤치마크 스크립트 등에서 모드별 엔진을 만들 때도 사용합니다.
+    """
+    ssl_ctx = insecure_ctx if USE_INSECURE else strict_ctx
+
+    if pool_mode == POOL_MODE_PGBOUNCER_TRANSACTION:
+        return {
+            "pool_pre_ping": True,
+            "poolclass": NullPool,  # 연결 풀링 비활성화로 prepared statement 충돌 방지
+            "execution_options": {
+                "prepared_cache_size": 0,  # prepared statement 캐싱 비활성화
+            },
+            "connect_args": {
+                "ssl": ssl_ctx,
+                "statement_cache_size": 0,  # asyncpg 레벨에서도 캐싱 비활성화
+                "prepared_statement_name_func": prepared_statement_name_func,  # 동적 이름 생성
+            },
+        }
+
+    if pool_mode == POOL_MODE_POOLED:
+        return {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "connect_args": {
+                "ssl": ssl_ctx,
+                # 연결이 재사용되므로 asyncpg statement 캐시를 켜서 파싱/플래닝 비용을 줄입니다.
+                "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            },
+        }
+
+    raise ValueError(f"지원하지 않는 DB_POOL_MODE: {pool_mode}")
+
+
 # 비동기 엔진 생성
-engine = create_async_engine(
-    async_db_url,
-    pool_pre_ping=True,
-    poolclass=NullPool,  # 연결 풀링 비활성화로 prepared statement 충돌 방지
-    execution_options={
-        "prepared_cache_size": 0,  # prepared statement 캐싱 비활성화
-    },
-    connect_args={
-        "ssl": insecure_ctx if USE_INSECURE else strict_ctx,
-        "statement_cache_size": 0,  # asyncpg 레벨에서도 캐싱 비활성화
-        "prepared_statement_name_func": prepared_statement_name_func,  # 동적 이름 생성
-    },
-)
+print(f"[DB_DEBUG] DB_POOL_MODE = {DB_POOL_MODE}")
+engine = create_async_engine(async_db_url, **build_engine_kwargs(DB_POOL_MODE))
 
 # 비동기 세션 메이커
 AsyncSessionLocal = async_sessionmaker(
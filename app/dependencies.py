@@ -7,11 +7,30 @@ from typing import Optional
 from app.db.database import get_db
 from app.repositories import users as user_repo
 from app.utils import token as token_util
+from app.utils.principal_cache import principal_cache
 from models import Users # models.py에서 Users 모델 임포트
 
 # OAuth2PasswordBearer 인스턴스 생성
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False) # auto_error=False로 설정
 
+async def _resolve_principal(db: AsyncSession, token_data) -> Optional[Users]:
+    """
+    검증된 토큰 데이터로 사용자 객체를 얻습니다.
+    1. 토큰에 user_id(uid)가 들어 있으면 DB 조회 없이 사용자 객체를 구성합니다.
+    2. 그렇지 않으면 (sub, iat) 기준 principal 캐시를 확인하고, 없을 때만 DB에서 조회합니다.
+    """
+    if token_data.user_id is not None:
+        return Users(user_id=token_data.user_id, email=token_data.email)
+
+    user = principal_cache.get(token_data.email, token_data.issued_at)
+    if user is not None:
+        return user
+
+    user = await user_repo.get_user_by_email(db, token_data.email)
+    if user is not None:
+        principal_cache.set(token_data.email, token_data.issued_at, user)
+    return user
+
 # 의존성 주입 함수: 토큰을 검증하고 사용자 객체를 반환
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> Users:
     """
@@ -32,7 +51,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     except Exception as e:
         raise credentials_exception from e
 
-    user = await user_repo.get_user_by_email(db, token_data.email)
+    user = await _resolve_principal(db, token_data)
     if user is None:
         raise credentials_exception
     return user
@@ -46,7 +65,6 @@ async def get_current_user_optional(token: str = Depends(oauth2_scheme), db: Asy
         return None
     try:
         token_data = token_util.verify_token(token)
-        user = await user_repo.get_user_by_email(db, token_data.email)
-        return user
+        return await _resolve_principal(db, token_data)
     except Exception:
         return None
@@ -1,10 +1,24 @@
 # import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import youtube, auth, users, websocket
+from app.routers import youtube, auth, users, websocket, metrics, places
+from app.services.jobs import get_job_queue
+from crawlers.media_worker import get_media_worker
 
-app = FastAPI(title="Location Extractor API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # URL 처리 작업 큐의 워커 풀을 시작하고, 종료 시 작업 큐와 미디어 워커 프로세스를 정리합니다.
+    job_queue = get_job_queue()
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    get_media_worker().shutdown()
+
+
+app = FastAPI(title="Location Extractor API", lifespan=lifespan)
 
 # CORS 미들웨어 설정: 모든 Origin, 자격 증명, 메서드, 헤더를 허용합니다.
 # 이는 개발 및 테스트 목적으로 사용되며, 실제 배포 시에는 보안 강화를 위해 특정 Origin만 허용하도록 변경해야 합니다.
@@ -14,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "ETag"],  # 페이지 커서/offset, places ETag
 )
 
 # 라우터 포함 시 의존성 추가
@@ -23,6 +38,8 @@ app.include_router(youtube.router)
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(websocket.router)
+app.include_router(metrics.router)
+app.include_router(places.router)
 
 # if __name__ == "__main__":
 #     uvicorn.run("app.main:app", host="0.0.0.0", port=1636, reload=True, ssl_keyfile = "C:/finalproject/certs/192.168.18.124+3-key.pem",
@@ -1,14 +1,37 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import and_, delete, func, literal, or_, tuple_
 from sqlalchemy.orm import joinedload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from models import Contents, Places, ContentPlaces, UserContentHistory
 from sqlalchemy.exc import IntegrityError
 from typing import List
+from datetime import datetime
+from app.utils.metrics import stage
+from app.utils.progress import report
+from app.utils.geo import (
+    EARTH_RADIUS_M,
+    bbox_around,
+    geohash_cover,
+    geohash_encode,
+    geohash_prefix_upper_bound,
+)
+from nlp.chunking import normalize_name
+from nlp.segments import TranscriptSegments
 
 async def get_content_by_id(db: AsyncSession, content_id: str) -> Contents | None:
     result = await db.execute(select(Contents).filter(Contents.content_id == content_id))
     return result.scalars().first()
 
+async def get_existing_content_ids(db: AsyncSession, content_ids: list[str]) -> set[str]:
+    """주어진 content_id 중 이미 Contents에 있는 ID들을 한 번의 IN 쿼리로 조회합니다."""
+    if not content_ids:
+        return set()
+    result = await db.execute(
+        select(Contents.content_id).filter(Contents.content_id.in_(content_ids))
+    )
+    return set(result.scalars().all())
+
 async def create_or_update_content(
     db: AsyncSession,
     content_id: str,
@@ -17,7 +40,15 @@ async def create_or_update_content(
     transcript: str | None,
     title: str = None,
     thumbnail_url: str = None,
+    commit: bool = True,
+    transcript_source: str | None = None,
+    segments: bytes | None = None,
 ):
+    """
+    콘텐츠를 생성하거나 비어 있는 필드를 채웁니다.
+    segments는 TranscriptSegments.pack()으로 묶은 시간 정보가 있는 스크립트입니다.
+    commit=False이면 flush만 하고, 커밋은 호출한 쪽에서 한 번에 처리합니다.
+    """
     content = await get_content_by_id(db, content_id)
     if content:
         if not content.title and title:
@@ -26,6 +57,12 @@ async def create_or_update_content(
             content.thumbnail_url = thumbnail_url
         if not content.transcript and transcript:
             content.transcript = transcript
+            content.transcript_source = transcript_source
+        if not content.segments and segments:
+            content.segments = segments
+        if not commit:
+            await db.flush()
+            return content
         await db.commit()
         await db.refresh(content)
         return content
@@ -34,15 +71,25 @@ async def create_or_update_content(
         content_id=content_id,
         content_type=content_type,
         transcript=transcript,
+        transcript_source=transcript_source,
+        segments=segments,
         youtube_url=url,
         title=title,
         thumbnail_url=thumbnail_url,
     )
     db.add(new_content)
+    if not commit:
+        await db.flush()
+        return new_content
     await db.commit()
     await db.refresh(new_content)
     return new_content
 
+def _geohash(lat: float | None, lng: float | None) -> str | None:
+    if lat is None or lng is None:
+        return None
+    return geohash_encode(lat, lng)
+
 async def upsert_place(
     db: AsyncSession, name: str, lat: float | None, lng: float | None
 ) -> Places:
@@ -52,7 +99,13 @@ async def upsert_place(
     if place:
         return place
 
-    new_place = Places(name=name, lat=lat, lng=lng)
+    new_place = Places(
+        name=name,
+        lat=lat,
+        lng=lng,
+        geohash=_geohash(lat, lng),
+        normalized_name=normalize_name(name),
+    )
     db.add(new_place)
     try:
         await db.commit()
@@ -63,7 +116,9 @@ async def upsert_place(
         result = await db.execute(select(Places).filter_by(name=name, lat=lat, lng=lng))
         return result.scalars().first()
 
-async def link_content_place(db: AsyncSession, content_id: str, place_id: int):
+async def link_content_place(
+    db: AsyncSession, content_id: str, place_id: int, start_seconds: float | None = None
+):
     result = await db.execute(
         select(ContentPlaces).filter(
             ContentPlaces.content_id == content_id, ContentPlaces.place_id == place_id
@@ -72,10 +127,133 @@ async def link_content_place(db: AsyncSession, content_id: str, place_id: int):
     exists = result.scalars().first()
     
     if not exists:
-        db.add(ContentPlaces(content_id=content_id, place_id=place_id))
+        db.add(ContentPlaces(content_id=content_id, place_id=place_id, start_seconds=start_seconds))
+        await db.commit()
+    elif start_seconds is not None and (exists.start_seconds is None or start_seconds < exists.start_seconds):
+        exists.start_seconds = start_seconds
         await db.commit()
 
-async def save_extracted_data(
+def _place_key(name: str, lat: float | None, lng: float | None) -> tuple:
+    return (name, lat, lng)
+
+def _valid_locations(locations: list) -> list[tuple]:
+    """
+    LLM 결과에서 저장 가능한 장소만 골라 (name, lat, lng) 키 목록으로 반환합니다.
+    같은 키가 여러 번 나오면 처음 한 번만 남깁니다.
+    (ON CONFLICT DO UPDATE는 한 문장에서 같은 행을 두 번 갱신할 수 없습니다.)
+    """
+    keys = []
+    seen = set()
+    for loc in locations:
+        if not isinstance(loc, dict) or not loc.get("name"):
+            continue
+        key = _place_key(loc.get("name"), loc.get("lat"), loc.get("lng"))
+        if key in seen:
+            continue
+        seen.add(key)
+        keys.append(key)
+    return keys
+
+def location_start_seconds(locations: list) -> dict[tuple, float]:
+    """
+    LLM 결과에서 (name, lat, lng) -> 처음 언급된 영상 시각(초) 매핑을 만듭니다. 같은 키는 가장 이른 시각을 남깁니다.
+    """
+    starts: dict[tuple, float] = {}
+    for loc in locations or []:
+        if not isinstance(loc, dict) or not loc.get("name") or loc.get("start_seconds") is None:
+            continue
+        key = _place_key(loc.get("name"), loc.get("lat"), loc.get("lng"))
+        if key not in starts or loc["start_seconds"] < starts[key]:
+            starts[key] = loc["start_seconds"]
+    return starts
+
+async def bulk_upsert_places(db: AsyncSession, keys: list[tuple]) -> dict[tuple, Places]:
+    """
+    여러 장소를 한 번에 upsert하고 (name, lat, lng) -> Places 매핑을 반환합니다. 커밋하지 않습니다.
+    - 좌표가 있는 장소: INSERT ... ON CONFLICT (name, lat, lng) DO UPDATE ... RETURNING 한 문장
+    - 좌표가 NULL인 장소: 고유 제약이 NULL을 구분하지 않으므로, 기존 upsert_place와 같이
+      이름으로 한 번에 조회한 뒤 없는 것만 한 번에 INSERT 합니다.
+    """
+    places: dict[tuple, Places] = {}
+
+    # 여러 행 upsert는 VALUES 순서대로 행 잠금을 잡습니다. 장소를 공유하는 두 영상이 서로 다른 순서로
+    # 저장하면 교착 상태(DeadlockDetected, IntegrityError 아님)가 될 수 있으므로 항상 같은 순서로 정렬합니다.
+    with_coords = sorted(k for k in keys if k[1] is not None and k[2] is not None)
+    without_coords = [k for k in keys if k[1] is None or k[2] is None]
+
+    if with_coords:
+        stmt = pg_insert(Places).values(
+            [
+                {
+                    "name": name,
+                    "lat": lat,
+                    "lng": lng,
+                    "geohash": _geohash(lat, lng),
+                    "normalized_name": normalize_name(name),
+                }
+                for name, lat, lng in with_coords
+            ]
+        )
+        # 충돌 시에도 RETURNING으로 기존 행을 돌려받기 위해 업데이트를 수행합니다.
+        # (geohash는 좌표로 정해지는 값이므로 기존 행에 비어 있던 값을 채우는 것 외에는 바뀌지 않습니다.)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Places.name, Places.lat, Places.lng],
+            set_={"geohash": stmt.excluded.geohash},
+        ).returning(Places)
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        for place in result.scalars().all():
+            places[_place_key(place.name, place.lat, place.lng)] = place
+
+    if without_coords:
+        result = await db.execute(
+            select(Places).filter(
+                Places.name.in_([k[0] for k in without_coords]),
+                or_(Places.lat.is_(None), Places.lng.is_(None)),
+            )
+        )
+        for place in result.scalars().all():
+            places.setdefault(_place_key(place.name, place.lat, place.lng), place)
+
+        missing = [k for k in without_coords if k not in places]
+        if missing:
+            new_places = [
+                Places(name=name, lat=lat, lng=lng, normalized_name=normalize_name(name))
+                for name, lat, lng in missing
+            ]
+            db.add_all(new_places)
+            await db.flush()
+            for place in new_places:
+                places[_place_key(place.name, place.lat, place.lng)] = place
+
+    return places
+
+async def bulk_link_content_places(
+    db: AsyncSession,
+    content_id: str,
+    place_ids: list[int],
+    start_seconds: dict[int, float | None] | None = None,
+):
+    """
+    콘텐츠와 여러 장소의 연결을 한 문장으로 추가합니다. 커밋하지 않습니다.
+    start_seconds(place_id -> 영상 시각)가 주어지면 함께 저장하며,
+    이미 있는 연결은 더 이른 시각으로만 갱신합니다. (LEAST는 NULL을 무시합니다)
+    """
+    if not place_ids:
+        return
+    start_seconds = start_seconds or {}
+    stmt = pg_insert(ContentPlaces).values(
+        [
+            {"content_id": content_id, "place_id": place_id, "start_seconds": start_seconds.get(place_id)}
+            for place_id in dict.fromkeys(place_ids)
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ContentPlaces.content_id, ContentPlaces.place_id],
+        set_={"start_seconds": func.least(ContentPlaces.start_seconds, stmt.excluded.start_seconds)},
+    )
+    await db.execute(stmt)
+
+async def _save_extracted_data_per_row(
     db: AsyncSession,
     video_id: str,
     url: str,
@@ -83,12 +261,16 @@ async def save_extracted_data(
     locations: list,
     title: str | None,
     thumbnail_url: str | None,
+    transcript_source: str | None = None,
+    segments: bytes | None = None,
 ) -> list[Places]:
     """
-    추출된 콘텐츠, 장소 및 관련 데이터를 데이터베이스에 저장하고 연결합니다.
+    장소를 한 건씩 upsert/연결하는 기존 저장 경로입니다.
+    일괄 저장이 IntegrityError로 실패했을 때의 대체 경로로 사용합니다.
     """
     await create_or_update_content(
-        db, video_id, "youtube", url, transcript, title, thumbnail_url
+        db, video_id, "youtube", url, transcript, title, thumbnail_url,
+        transcript_source=transcript_source, segments=segments,
     )
 
     if not locations:
@@ -103,11 +285,55 @@ async def save_extracted_data(
             db, name=loc.get("name"), lat=loc.get("lat"), lng=loc.get("lng")
         )
         if place_obj:
-            await link_content_place(db, video_id, place_obj.place_id)
+            await link_content_place(db, video_id, place_obj.place_id, loc.get("start_seconds"))
             saved_places.append(place_obj)
 
     return saved_places
 
+@stage("db_save")
+async def save_extracted_data(
+    db: AsyncSession,
+    video_id: str,
+    url: str,
+    transcript: str | None,
+    locations: list,
+    title: str | None,
+    thumbnail_url: str | None,
+    transcript_source: str | None = None,
+    segments: TranscriptSegments | None = None,
+) -> list[Places]:
+    """
+    추출된 콘텐츠, 장소 및 관련 데이터를 데이터베이스에 저장하고 연결합니다.
+    콘텐츠, 장소, 연결을 일괄 문장으로 처리하고 영상당 한 번만 커밋합니다.
+    장소별 영상 시각(start_seconds)은 연결(ContentPlaces)에, 스크립트 구간은 Contents.segments에 저장합니다.
+    동시 저장 등으로 IntegrityError가 발생하면 롤백 후 한 건씩 저장하는 경로로 재시도합니다.
+    """
+    keys = _valid_locations(locations or [])
+    starts = location_start_seconds(locations)
+    packed = segments.pack() if segments else None
+    await report("save", 0.0, "saving ...")
+    try:
+        await create_or_update_content(
+            db, video_id, "youtube", url, transcript, title, thumbnail_url, commit=False,
+            transcript_source=transcript_source, segments=packed,
+        )
+        places_by_key = await bulk_upsert_places(db, keys) if keys else {}
+        saved = [(k, places_by_key[k]) for k in keys if k in places_by_key]
+        saved_places = [place for _, place in saved]
+        await bulk_link_content_places(
+            db, video_id, [p.place_id for p in saved_places], {p.place_id: starts.get(k) for k, p in saved}
+        )
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        print(f"[Repo] 일괄 저장 중 IntegrityError 발생, 한 건씩 저장합니다: {e}")
+        saved_places = await _save_extracted_data_per_row(
+            db, video_id, url, transcript, locations, title, thumbnail_url,
+            transcript_source=transcript_source, segments=packed,
+        )
+    await report("save", 1.0, "saved")
+    return saved_places
+
 async def create_user_content_history(db: AsyncSession, user_id: int, content_id: str):
     print(f"[Repo] create_user_content_history 호출됨: user_id={user_id}, content_id={content_id}")
     if not user_id:
@@ -131,16 +357,212 @@ async def get_places_by_content_id(db: AsyncSession, content_id: str) -> list[Pl
     )
     return result.scalars().all()
 
-async def get_user_history_details(db: AsyncSession, user_id: int) -> list[UserContentHistory]:
+async def get_places_with_start_by_content_id(
+    db: AsyncSession, content_id: str
+) -> list[tuple[Places, float | None]]:
+    """콘텐츠의 장소와 영상에서 처음 언급된 시각(초)을 시각 순으로 조회합니다. (시각이 없으면 뒤로)"""
     result = await db.execute(
+        select(Places, ContentPlaces.start_seconds)
+        .join(ContentPlaces, ContentPlaces.place_id == Places.place_id)
+        .filter(ContentPlaces.content_id == content_id)
+        .order_by(ContentPlaces.start_seconds.asc().nulls_last(), ContentPlaces.id)
+    )
+    return [(place, start) for place, start in result.all()]
+
+async def replace_content_places_in_range(
+    db: AsyncSession,
+    content_id: str,
+    start: float,
+    end: float,
+    locations: list,
+) -> list[Places]:
+    """
+    영상의 [start, end) 초 구간만 다시 추출한 결과로 그 구간의 장소 연결을 바꿉니다.
+    처음 언급 시각이 구간 안인 기존 연결을 지우고, 새 장소를 일괄 upsert/연결한 뒤 한 번 커밋합니다.
+    구간 밖에서 먼저 언급된 장소는 기존 연결(과 더 이른 시각)이 그대로 남습니다.
+    """
+    keys = _valid_locations(locations or [])
+    starts = location_start_seconds(locations)
+    await db.execute(
+        delete(ContentPlaces).filter(
+            ContentPlaces.content_id == content_id,
+            ContentPlaces.start_seconds >= start,
+            ContentPlaces.start_seconds < end,
+        )
+    )
+    places_by_key = await bulk_upsert_places(db, keys) if keys else {}
+    saved = [(k, places_by_key[k]) for k in keys if k in places_by_key]
+    await bulk_link_content_places(
+        db, content_id, [p.place_id for _, p in saved], {p.place_id: starts.get(k) for k, p in saved}
+    )
+    await db.commit()
+    return [place for _, place in saved]
+
+async def get_user_history_details(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 50,
+    cursor: tuple[datetime, int] | None = None,
+) -> tuple[list[UserContentHistory], dict[str, list[tuple[Places, float | None]]]]:
+    """
+    사용자의 콘텐츠 기록을 (created_at, id) 내림차순 키셋 페이지네이션으로 조회합니다.
+    cursor가 주어지면 그 위치 이후(더 오래된) 기록부터 limit건을 반환합니다.
+    콘텐츠는 다대일이므로 JOIN으로 가져오고, 장소 목록은 연결(ContentPlaces)의 처음 언급 시각과 함께
+    IN 쿼리 한 번으로 가져와 컬렉션 JOIN으로 인한 행 중복(cartesian)을 피합니다.
+    (기록 목록, content_id -> [(장소, 처음 언급 시각)]) 을 반환합니다. 장소 순서는 /places 조회와 같습니다.
+    """
+    stmt = (
         select(UserContentHistory)
         .filter(UserContentHistory.user_id == user_id)
-        .options(
-            joinedload(UserContentHistory.content).joinedload(
-                Contents.places
+        .options(joinedload(UserContentHistory.content))
+        .order_by(UserContentHistory.created_at.desc(), UserContentHistory.id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        cursor_created_at, cursor_id = cursor
+        stmt = stmt.filter(
+            tuple_(UserContentHistory.created_at, UserContentHistory.id)
+            < tuple_(cursor_created_at, cursor_id)
+        )
+    result = await db.execute(stmt)
+    records = result.scalars().all()
+
+    places_by_content: dict[str, list[tuple[Places, float | None]]] = {}
+    content_ids = list({record.content_id for record in records})
+    if content_ids:
+        result = await db.execute(
+            select(ContentPlaces.content_id, Places, ContentPlaces.start_seconds)
+            .join(Places, ContentPlaces.place_id == Places.place_id)
+            .filter(ContentPlaces.content_id.in_(content_ids))
+            .order_by(ContentPlaces.start_seconds.asc().nulls_last(), ContentPlaces.id)
+        )
+        for content_id, place, start in result.all():
+            places_by_content.setdefault(content_id, []).append((place, start))
+    return records, places_by_content
+
+def _distance_m_expr(lat: float, lng: float):
+    """
+    Places와 (lat, lng) 사이의 대원 거리(미터)를 계산하는 SQL 식 (haversine)
+    radians/least/asin은 PostgreSQL 함수입니다. 이 모듈은 pg_insert 등 PostgreSQL만 대상으로 하므로
+    기본 SQLite에서는 동작하지 않으며, 별도의 SQLite 대체 쿼리는 두지 않습니다.
+    """
+    d_lat = func.radians(Places.lat - lat)
+    d_lng = func.radians(Places.lng - lng)
+    a = func.power(func.sin(d_lat / 2), 2) + func.cos(func.radians(lat)) * func.cos(
+        func.radians(Places.lat)
+    ) * func.power(func.sin(d_lng / 2), 2)
+    # 부동소수점 오차로 1을 살짝 넘으면 asin이 실패하므로 1로 제한합니다.
+    return 2 * EARTH_RADIUS_M * func.asin(func.sqrt(func.least(a, 1.0)))
+
+def _geohash_cover_filter(min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+    """영역을 덮는 geohash 접두사들을 인덱스 범위 조건(geohash >= prefix AND geohash < 다음 prefix)으로 만듭니다."""
+    conditions = []
+    for prefix in geohash_cover(min_lat, min_lng, max_lat, max_lng):
+        upper = geohash_prefix_upper_bound(prefix)
+        if upper is None:
+            conditions.append(Places.geohash >= prefix)
+        else:
+            conditions.append(and_(Places.geohash >= prefix, Places.geohash < upper))
+    return or_(*conditions)
+
+async def find_places_in_bbox(
+    db: AsyncSession,
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    center_lat: float,
+    center_lng: float,
+    limit: int = 50,
+    offset: int = 0,
+    radius_m: float | None = None,
+) -> list[tuple[Places, float]]:
+    """
+    영역(bbox) 안의 장소를 (center_lat, center_lng)에서 가까운 순으로 조회합니다.
+    geohash 인덱스로 후보를 좁힌 뒤 정확한 위경도 범위로 거르고, radius_m이 주어지면 거리로도 거릅니다.
+    (Places, 거리(m)) 목록을 반환합니다.
+    """
+    distance = _distance_m_expr(center_lat, center_lng).label("distance_m")
+    stmt = (
+        select(Places, distance)
+        .filter(
+            _geohash_cover_filter(min_lat, min_lng, max_lat, max_lng),
+            Places.lat.between(min_lat, max_lat),
+            Places.lng.between(min_lng, max_lng),
+        )
+        .order_by(distance, Places.place_id)
+        .limit(limit)
+        .offset(offset)
+    )
+    if radius_m is not None:
+        stmt = stmt.filter(_distance_m_expr(center_lat, center_lng) <= radius_m)
+    result = await db.execute(stmt)
+    return [(place, distance_m) for place, distance_m in result.all()]
+
+async def find_places_near_points(
+    db: AsyncSession, points: list[tuple[float, float]], radius_m: float
+) -> list[Places]:
+    """
+    여러 좌표 각각의 radius_m 주변에 있는 장소들을 한 번의 쿼리로 조회합니다. (geohash 인덱스 사용)
+    장소 정규화(canonicalizer)의 후보 조회에 사용합니다.
+    """
+    if not points:
+        return []
+    conditions = []
+    for lat, lng in points:
+        min_lat, min_lng, max_lat, max_lng = bbox_around(lat, lng, radius_m)
+        conditions.append(
+            and_(
+                _geohash_cover_filter(min_lat, min_lng, max_lat, max_lng),
+                Places.lat.between(min_lat, max_lat),
+                Places.lng.between(min_lng, max_lng),
             )
         )
-        .order_by(UserContentHistory.created_at.desc())
-        .limit(50)
+    result = await db.execute(select(Places).filter(or_(*conditions)).order_by(Places.place_id))
+    return result.scalars().all()
+
+async def find_places_without_coords(db: AsyncSession, normalized_names: list[str]) -> list[Places]:
+    """정규화 이름이 일치하고 좌표가 없는 장소들을 조회합니다."""
+    if not normalized_names:
+        return []
+    result = await db.execute(
+        select(Places)
+        .filter(
+            Places.normalized_name.in_(normalized_names),
+            or_(Places.lat.is_(None), Places.lng.is_(None)),
+        )
+        .order_by(Places.place_id)
+    )
+    return result.scalars().all()
+
+async def merge_places(db: AsyncSession, canonical_id: int, duplicate_ids: list[int]) -> list[str]:
+    """
+    중복 장소들을 canonical_id 하나로 합칩니다. 커밋하지 않습니다.
+    중복 장소의 content_places 연결을 canonical 장소로 옮긴 뒤(이미 있으면 더 이른 start_seconds만 반영) 중복 장소를 삭제합니다.
+    연결이 바뀐 content_id 목록을 반환합니다.
+    """
+    if not duplicate_ids:
+        return []
+    result = await db.execute(
+        select(ContentPlaces.content_id)
+        .filter(ContentPlaces.place_id.in_(duplicate_ids))
+        .distinct()
+    )
+    content_ids = list(result.scalars().all())
+
+    # 처음 언급 시각도 함께 옮기고, 이미 연결이 있으면 bulk_link_content_places와 같이 더 이른 시각을 남깁니다.
+    # (한 콘텐츠에 중복 장소가 여럿이면 같은 행을 두 번 갱신할 수 없으므로 콘텐츠별 가장 이른 시각으로 모읍니다)
+    relink = pg_insert(ContentPlaces).from_select(
+        ["content_id", "place_id", "start_seconds"],
+        select(ContentPlaces.content_id, literal(canonical_id), func.min(ContentPlaces.start_seconds))
+        .filter(ContentPlaces.place_id.in_(duplicate_ids))
+        .group_by(ContentPlaces.content_id),
+    )
+    relink = relink.on_conflict_do_update(
+        index_elements=[ContentPlaces.content_id, ContentPlaces.place_id],
+        set_={"start_seconds": func.least(ContentPlaces.start_seconds, relink.excluded.start_seconds)},
     )
-    return result.unique().scalars().all()
\ No newline at end of file
+    await db.execute(relink)
+    await db.execute(delete(ContentPlaces).filter(ContentPlaces.place_id.in_(duplicate_ids)))
+    await db.execute(delete(Places).filter(Places.place_id.in_(duplicate_ids)))
+    return content_ids
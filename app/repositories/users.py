@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 import models
+from app.utils.principal_cache import principal_cache
 
 async def get_user_by_email(db: AsyncSession, email: str):
     """
@@ -25,6 +26,8 @@ async def update_user_password(db: AsyncSession, user: models.Users, hashed_pass
     user.hashed_password = hashed_password
     await db.commit()
     await db.refresh(user)
+    # 캐시된 인증 정보(principal)를 무효화합니다.
+    principal_cache.invalidate(user.email)
     return user
 
 async def get_user_by_id(db: AsyncSession, user_id: int):
@@ -40,6 +43,7 @@ async def delete_user(db: AsyncSession, user: models.Users):
     """
     await db.delete(user)
     await db.commit()
+    principal_cache.invalidate(user.email)
     return user
 
 async def get_all_users(db: AsyncSession):
@@ -32,7 +32,7 @@ async def register(user: auth_schema.UserCreate, db: AsyncSession = Depends(get_
             detail="Email already registered",
         )
     
-    hashed_password = hash_utils.get_password_hash(user.password)
+    hashed_password = await hash_utils.get_password_hash_async(user.password)
     db_user = models.Users(email=user.email, hashed_password=hashed_password)
     await user_repository.create_user(db, db_user)
     
@@ -55,7 +55,8 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
         )
     
     logger.info(f"User found: {db_user.email}. Verifying password...")
-    if not hash_utils.verify_password(form_data.password, db_user.hashed_password):
+    is_valid, new_hash = await hash_utils.verify_and_update_async(form_data.password, db_user.hashed_password)
+    if not is_valid:
         logger.warning(f"Login failed: Incorrect password for {form_data.username}.")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -63,8 +64,16 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
             headers={"WWW-Authenticate": "Bearer"},
         )
     logger.info(f"Password verified for {form_data.username}.")
+
+    # bcrypt 비용 설정이 바뀌었으면 로그인에 성공한 김에 새 비용으로 다시 해싱해 저장합니다.
+    if new_hash:
+        logger.info(f"Rehashing password for {form_data.username} with updated cost.")
+        await user_repository.update_user_password(db, user=db_user, hashed_password=new_hash)
     
-    access_token = token_utils.create_access_token(data={"sub": db_user.email})
+    claims = {"sub": db_user.email}
+    if token_utils.EMBED_USER_ID_IN_TOKEN:
+        claims["uid"] = db_user.user_id
+    access_token = token_utils.create_access_token(data=claims)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/request-password-reset")
@@ -103,7 +112,7 @@ async def reset_password(
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token or user does not exist")
     
-    hashed_password = hash_utils.get_password_hash(request.new_password)
+    hashed_password = await hash_utils.get_password_hash_async(request.new_password)
     await user_repository.update_user_password(db, user=user, hashed_password=hashed_password)
     
     return {"message": "Password has been reset successfully."}
\ No newline at end of file
@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db
+from app.schemas.places import NearbyPlace
+from app.repositories import locations as loc_repo
+from app.utils.geo import bbox_around
+from app.utils.serialization import json_response, nearby_place_to_dict
+from typing import List, Optional
+import logging
+
+# 로거 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/places",
+    tags=["places"],
+)
+
+# 주변 검색 최대 반경(미터)
+MAX_RADIUS_M = 50_000
+
+
+def _page_response(results: list, limit: int, offset: int):
+    """
+    limit + 1건 조회 결과를 잘라 응답을 만들고, 다음 페이지가 있으면 X-Next-Offset 헤더를 붙입니다.
+    """
+    headers = {}
+    if len(results) > limit:
+        results = results[:limit]
+        headers["X-Next-Offset"] = str(offset + limit)
+    return json_response(
+        [nearby_place_to_dict(place, distance_m) for place, distance_m in results],
+        headers=headers,
+    )
+
+
+@router.get("/nearby", response_model=List[NearbyPlace])
+async def get_nearby_places(
+    lat: float = Query(..., ge=-90, le=90, description="기준 위도"),
+    lng: float = Query(..., ge=-180, le=180, description="기준 경도"),
+    radius_m: float = Query(1000, gt=0, le=MAX_RADIUS_M, description="검색 반경(미터)"),
+    limit: int = Query(50, ge=1, le=200, description="페이지 크기"),
+    offset: int = Query(0, ge=0, description="이전 응답의 X-Next-Offset 헤더 값"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    기준 좌표에서 radius_m 안에 있는 장소를 가까운 순으로 조회합니다. (인증 불필요)
+    다음 페이지가 있으면 X-Next-Offset 헤더로 다음 offset을 반환합니다.
+    """
+    logger.info(f"API /places/nearby 호출됨. ({lat}, {lng}) 반경 {radius_m}m")
+    min_lat, min_lng, max_lat, max_lng = bbox_around(lat, lng, radius_m)
+    results = await loc_repo.find_places_in_bbox(
+        db,
+        min_lat,
+        min_lng,
+        max_lat,
+        max_lng,
+        center_lat=lat,
+        center_lng=lng,
+        limit=limit + 1,
+        offset=offset,
+        radius_m=radius_m,
+    )
+    return _page_response(results, limit, offset)
+
+
+@router.get("/bbox", response_model=List[NearbyPlace])
+async def get_places_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    center_lat: Optional[float] = Query(None, ge=-90, le=90, description="정렬 기준 위도 (기본: 영역 중심)"),
+    center_lng: Optional[float] = Query(None, ge=-180, le=180, description="정렬 기준 경도 (기본: 영역 중심)"),
+    limit: int = Query(50, ge=1, le=200, description="페이지 크기"),
+    offset: int = Query(0, ge=0, description="이전 응답의 X-Next-Offset 헤더 값"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    지도 화면 영역(bbox) 안의 장소를 기준 좌표에서 가까운 순으로 조회합니다. (인증 불필요)
+    날짜변경선을 넘는 영역(min_lng > max_lng)은 지원하지 않습니다.
+    """
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat <= max_lat, min_lng <= max_lng 이어야 합니다.",
+        )
+    if center_lat is None:
+        center_lat = (min_lat + max_lat) / 2
+    if center_lng is None:
+        center_lng = (min_lng + max_lng) / 2
+
+    logger.info(f"API /places/bbox 호출됨. ({min_lat}, {min_lng}) ~ ({max_lat}, {max_lng})")
+    results = await loc_repo.find_places_in_bbox(
+        db,
+        min_lat,
+        min_lng,
+        max_lat,
+        max_lng,
+        center_lat=center_lat,
+        center_lng=center_lng,
+        limit=limit + 1,
+        offset=offset,
+    )
+    return _page_response(results, limit, offset)
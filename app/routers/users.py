@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
-from app.schemas.users import UserContentHistoryResponse, Place
+from app.schemas.users import UserContentHistoryResponse
 from app.repositories import locations as loc_repo
 from app.dependencies import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.serialization import history_to_dict, json_response
 import models
-from typing import List
+from typing import List, Optional
 import logging
 
 # 로거 설정
@@ -21,29 +23,37 @@ router = APIRouter(
 
 @router.get("/history", response_model=List[UserContentHistoryResponse])
 async def get_user_content_history(
+    limit: int = Query(50, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
     db: AsyncSession = Depends(get_db),
     current_user: models.Users = Depends(get_current_user),
 ):
     """
     현재 로그인한 사용자의 콘텐츠 기록을 상세 정보와 함께 비동기적으로 조회합니다.
+    최신순 커서 페이지네이션을 지원하며, 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 반환합니다.
+    ORM 객체를 dict로 바로 변환해 orjson으로 직렬화합니다. (Pydantic 모델 생성/재검증 생략)
     """
     logger.info(f"API /history 호출됨. 사용자: {current_user.email}")
-    history_records = await loc_repo.get_user_history_details(db, current_user.user_id)
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    response_data = []
-    for record in history_records:
-        if not record.content:
-            continue
-        places_data = [Place.from_orm(p) for p in record.content.places]
-        video_history = UserContentHistoryResponse(
-            id=record.content.content_id,
-            title=record.content.title,
-            created_at=record.created_at,
-            thumbnail_url=record.content.thumbnail_url,
-            youtube_url=record.content.youtube_url,
-            places=places_data,
-        )
-        response_data.append(video_history)
+    # 다음 페이지 존재 여부를 알기 위해 한 건 더 조회합니다.
+    history_records, places_by_content = await loc_repo.get_user_history_details(
+        db, current_user.user_id, limit=limit + 1, cursor=position
+    )
+    headers = {}
+    if len(history_records) > limit:
+        history_records = history_records[:limit]
+        last = history_records[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    response_data = [
+        history_to_dict(record, places_by_content.get(record.content_id))
+        for record in history_records
+        if record.content
+    ]
 
     logger.info(f"사용자 {current_user.email}의 콘텐츠 상세 기록 {len(response_data)}건 조회 완료.")
-    return response_data
+    return json_response(response_data, headers=headers)
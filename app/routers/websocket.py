@@ -1,9 +1,11 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.db.database import AsyncSessionLocal, get_db
 from app.utils import url as url_util
-from app.tasks import process_youtube_url_with_websocket
-from typing import Dict, Set
+from app.tasks import process_youtube_url_with_websocket, watch_extraction
+from app.services.connections import ConnectionManager
+from app.services.batch import prepare_batch, run_batch
+from app.services.jobs import QueueFullError
 import logging
 import json
 import uuid
@@ -16,38 +18,134 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# 활성 WebSocket 연결 관리
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+# 활성 WebSocket 연결 관리 (연결별 송신 대기열, ping/유휴 연결 정리)
+manager = ConnectionManager()
 
-    async def connect(self, websocket: WebSocket, connection_id: str):
-        await websocket.accept()
-        self.active_connections[connection_id] = websocket
-        logger.info(f"WebSocket 연결 성공: {connection_id}")
+async def resolve_user_id(user_identifier) -> int | None:
+    """
+    메시지의 user_id 값(이메일 또는 user_id)을 실제 user_id로 변환합니다.
+    """
+    if not user_identifier:
+        return None
+    if isinstance(user_identifier, str) and "@" in user_identifier:
+        # 이메일인 경우 데이터베이스에서 사용자 조회
+        from app.repositories.users import get_user_by_email
+        async with AsyncSessionLocal() as db:
+            user = await get_user_by_email(db, user_identifier)
+            if user:
+                logger.info(f"이메일 {user_identifier}를 user_id {user.user_id}로 변환")
+                return user.user_id
+        return None
+    # 이미 정수 user_id인 경우
+    try:
+        return int(user_identifier)
+    except (ValueError, TypeError):
+        logger.warning(f"유효하지 않은 user_id: {user_identifier}")
+        return None
 
-    def disconnect(self, connection_id: str):
-        if connection_id in self.active_connections:
-            del self.active_connections[connection_id]
-            logger.info(f"WebSocket 연결 종료: {connection_id}")
+async def process_batch(connection_id: str, message: dict):
+    """
+    process_batch 액션: 여러 URL(또는 재생목록)을 처리하며 항목별 결과를 끝나는 순서대로 전송합니다.
+    """
+    actual_user_id = await resolve_user_id(message.get("user_id"))
+    try:
+        async with AsyncSessionLocal() as db:
+            plan = await prepare_batch(db, message.get("urls") or [], message.get("playlist_url"))
+    except Exception as e:
+        await manager.send_progress(connection_id, {
+            "status": "error",
+            "message": f"배치를 준비하지 못했습니다: {str(e)}",
+        })
+        return
 
-    async def send_progress(self, connection_id: str, data: dict):
-        if connection_id in self.active_connections:
-            websocket = self.active_connections[connection_id]
-            try:
-                await websocket.send_text(json.dumps(data, ensure_ascii=False))
-                logger.info(f"진행 상황 전송 완료: {connection_id} - {data}")
-            except Exception as e:
-                logger.error(f"WebSocket 메시지 전송 실패: {connection_id} - {e}")
-                self.disconnect(connection_id)
+    async for item in run_batch(plan, actual_user_id):
+        item_type = item.pop("type")
+        await manager.send_progress(connection_id, {"status": f"batch_{item_type}", **item})
 
-manager = ConnectionManager()
+async def process_url(connection_id: str, url: str, user_id: int | None):
+    """
+    process_url 액션: URL 하나를 처리하며 진행 상황과 최종 결과를 전송합니다.
+    """
+    video_id = url_util.extract_video_id(url)
+    try:
+        # WebSocket을 통해 진행 상황을 실시간 전송하며 처리
+        result = await process_youtube_url_with_websocket(
+            url, user_id, connection_id, manager
+        )
+
+        # 최종 결과 전송
+        await manager.send_progress(connection_id, {
+            "status": "completed",
+            "message": "처리가 완료되었습니다!",
+            "progress": 100,
+            "video_id": video_id,
+            "result": result
+        })
+
+    except QueueFullError as e:
+        # HTTP의 429와 같은 의미입니다. 클라이언트는 retry_after초 뒤에 다시 요청합니다.
+        logger.warning(f"작업 대기열 초과로 WebSocket 요청 거절: {url}")
+        await manager.send_progress(connection_id, {
+            "status": "busy",
+            "message": str(e),
+            "retry_after": 30,
+            "video_id": video_id,
+        })
+
+    except Exception as e:
+        logger.error(f"처리 중 오류 발생: {e}")
+        await manager.send_progress(connection_id, {
+            "status": "error",
+            "message": f"처리 중 오류가 발생했습니다: {str(e)}",
+            "progress": 0,
+            "video_id": video_id,
+        })
+
+async def subscribe_video(connection_id: str, video_id: str):
+    """
+    subscribe 액션: 다른 연결(탭)이나 HTTP 요청이 이미 처리 중인 영상의 진행 상황을 함께 받습니다.
+    처리 중인 작업이 없으면 새로 시작하지 않고 오류를 전송합니다.
+    """
+    async def subscriber(data: dict):
+        await manager.send_progress(connection_id, {**data, "video_id": video_id}, key=video_id)
+
+    try:
+        result, joined = await watch_extraction(video_id, subscriber)
+    except Exception as e:
+        await manager.send_progress(connection_id, {
+            "status": "error",
+            "message": f"처리 중 오류가 발생했습니다: {str(e)}",
+            "progress": 0,
+            "video_id": video_id,
+        })
+        return
+
+    if not joined:
+        await manager.send_progress(connection_id, {
+            "status": "error",
+            "message": "처리 중인 작업이 없습니다.",
+            "video_id": video_id,
+        })
+        return
+
+    await manager.send_progress(connection_id, {
+        "status": "completed",
+        "message": "처리가 완료되었습니다!",
+        "progress": 100,
+        "video_id": video_id,
+        "result": {"status": "Completed", "title": result["title"], "mode": "new", "places": list(result["places"])},
+    })
 
 @router.websocket("/ws/process")
 async def websocket_process_endpoint(websocket: WebSocket):
     """
     YouTube URL 처리를 위한 WebSocket 엔드포인트
     실시간으로 처리 진행 상황을 클라이언트에게 전송합니다.
+    진행 메시지(status=processing)에는 단계(stage)와 실제 진행률이 담기며,
+    LLM 청크가 끝날 때마다 부분 추출 장소(status=partial, places)가 먼저 전송됩니다.
+    처리는 백그라운드에서 실행되므로 한 연결에서 여러 작업을 요청하거나 subscribe할 수 있고,
+    서버는 주기적으로 status=ping 프레임을 보냅니다. (클라이언트는 {"action": "pong"}으로 응답 가능)
+    process_url은 HTTP 요청과 같은 작업 큐에서 실행되며, 대기열이 가득 차면 status=busy 프레임(retry_after)을 보냅니다.
     """
     connection_id = str(uuid.uuid4())
     await manager.connect(websocket, connection_id)
@@ -56,30 +154,42 @@ async def websocket_process_endpoint(websocket: WebSocket):
         while True:
             # 클라이언트로부터 메시지 수신
             data = await websocket.receive_text()
-            message = json.loads(data)
-            
-            if message.get("action") == "process_url":
+            manager.touch(connection_id)
+            try:
+                message = json.loads(data)
+            except ValueError:
+                await manager.send_progress(connection_id, {
+                    "status": "error",
+                    "message": "JSON 형식의 메시지가 아닙니다."
+                })
+                continue
+            action = message.get("action")
+
+            if action == "pong":
+                continue
+
+            if action == "subscribe":
+                video_id = message.get("video_id") or url_util.extract_video_id(message.get("url") or "")
+                if not video_id:
+                    await manager.send_progress(connection_id, {
+                        "status": "error",
+                        "message": "video_id 또는 url이 제공되지 않았습니다."
+                    })
+                    continue
+                manager.run(connection_id, subscribe_video(connection_id, video_id))
+
+            elif action == "process_batch":
+                if not message.get("urls") and not message.get("playlist_url"):
+                    await manager.send_progress(connection_id, {
+                        "status": "error",
+                        "message": "urls 또는 playlist_url이 제공되지 않았습니다."
+                    })
+                    continue
+                manager.run(connection_id, process_batch(connection_id, message))
+
+            elif action == "process_url":
                 url = message.get("url")
-                user_identifier = message.get("user_id")  # 이메일 또는 user_id일 수 있음
-                
-                # user_identifier가 이메일인 경우 실제 user_id로 변환
-                actual_user_id = None
-                if user_identifier:
-                    if isinstance(user_identifier, str) and "@" in user_identifier:
-                        # 이메일인 경우 데이터베이스에서 사용자 조회
-                        from app.db.database import AsyncSessionLocal
-                        from app.repositories.users import get_user_by_email
-                        async with AsyncSessionLocal() as db:
-                            user = await get_user_by_email(db, user_identifier)
-                            if user:
-                                actual_user_id = user.user_id
-                                logger.info(f"이메일 {user_identifier}를 user_id {actual_user_id}로 변환")
-                    else:
-                        # 이미 정수 user_id인 경우
-                        try:
-                            actual_user_id = int(user_identifier)
-                        except (ValueError, TypeError):
-                            logger.warning(f"유효하지 않은 user_id: {user_identifier}")
+                actual_user_id = await resolve_user_id(message.get("user_id"))
                 
                 if not url:
                     await manager.send_progress(connection_id, {
@@ -101,37 +211,17 @@ async def websocket_process_endpoint(websocket: WebSocket):
                 await manager.send_progress(connection_id, {
                     "status": "started",
                     "message": "처리를 시작합니다...",
-                    "progress": 0
+                    "progress": 0,
+                    "video_id": video_id,
                 })
-                
-                try:
-                    # WebSocket을 통해 진행 상황을 실시간 전송하며 처리
-                    result = await process_youtube_url_with_websocket(
-                        url, actual_user_id, connection_id, manager
-                    )
-                    
-                    # 최종 결과 전송
-                    await manager.send_progress(connection_id, {
-                        "status": "completed",
-                        "message": "처리가 완료되었습니다!",
-                        "progress": 100,
-                        "result": result
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"처리 중 오류 발생: {e}")
-                    await manager.send_progress(connection_id, {
-                        "status": "error",
-                        "message": f"처리 중 오류가 발생했습니다: {str(e)}",
-                        "progress": 0
-                    })
+                manager.run(connection_id, process_url(connection_id, url, actual_user_id))
                     
     except WebSocketDisconnect:
-        manager.disconnect(connection_id)
+        await manager.disconnect(connection_id)
         logger.info(f"클라이언트가 연결을 종료했습니다: {connection_id}")
     except Exception as e:
         logger.error(f"WebSocket 오류: {e}")
-        manager.disconnect(connection_id)
+        await manager.disconnect(connection_id)
 
 # ConnectionManager를 다른 모듈에서 사용할 수 있도록 export
 def get_connection_manager():
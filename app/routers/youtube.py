@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
-from app.schemas.youtube import URLRequest, PlaceResponse, Place
+from app.schemas.youtube import (
+    URLRequest,
+    BatchURLRequest,
+    PlaceResponse,
+    Place,
+    JobAcceptedResponse,
+    JobStatusResponse,
+)
 from app.repositories import locations as loc_repo
 from app.utils import url as url_util
 from app.dependencies import get_current_user
-from app.tasks import process_youtube_url
+from app.services.jobs import JobStatus, QueueFullError, get_job_queue
+from app.services.places_cache import etag_matches, places_cache
+from app.services.batch import prepare_batch, run_batch
+from app.utils.serialization import dumps
 import models
 from typing import List, Optional
 import logging
@@ -21,14 +32,25 @@ router = APIRouter(
     tags=["youtube"],
 )
 
-@router.post("/process", response_model=PlaceResponse, status_code=status.HTTP_200_OK)
+@router.post(
+    "/process",
+    response_model=PlaceResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        202: {"model": JobAcceptedResponse, "description": "async_mode=true: 작업이 대기열에 접수됨"},
+        429: {"description": "작업 대기열이 가득 참"},
+    },
+)
 async def process_youtube_url_and_get_places(
     request: URLRequest,
+    async_mode: bool = Query(False, description="true이면 처리 완료를 기다리지 않고 202와 job_id를 즉시 반환합니다."),
     db: AsyncSession = Depends(get_db),
     current_user: Optional[models.Users] = Depends(get_current_user), # Optional user
 ):
     """
-    YouTube URL을 받아 동기적으로 처리하고, 추출된 장소 목록을 반환합니다.
+    YouTube URL을 받아 처리하고, 추출된 장소 목록을 반환합니다.
+    처리는 작업 큐의 고정 크기 워커 풀에서 실행되며, 대기열이 가득 차면 429를 반환합니다.
+    async_mode=true이면 202와 job_id를 즉시 반환하고, /jobs/{job_id}로 상태와 결과를 조회합니다.
     """
     user_id = current_user.user_id if current_user else None
     requester = f"user_id {user_id}" if user_id else "guest"
@@ -44,12 +66,30 @@ async def process_youtube_url_and_get_places(
         logger.info(f"이미 분석된 비디오: {video_id}. 캐시된 결과 반환.")
         if user_id:
             await loc_repo.create_user_content_history(db, user_id, video_id)
-        places = await loc_repo.get_places_by_content_id(db, video_id)
-        return PlaceResponse(mode="db", places=[Place.from_orm(p) for p in places])
+        cached = await places_cache.get_or_load(db, video_id)
+        places = cached.places if cached else []
+        return PlaceResponse(mode="db", places=[Place(**p) for p in places])
+
+    # 2. 작업 큐에 제출합니다. (동시에 실행되는 파이프라인 수는 워커 수로 제한됨)
+    job_queue = get_job_queue()
+    try:
+        job = await job_queue.submit(request.url, user_id)
+    except QueueFullError as e:
+        logger.warning(f"작업 대기열 초과로 요청 거절: {request.url}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "30"},
+        )
+
+    if async_mode:
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobAcceptedResponse(job_id=job.job_id, status=job.status).model_dump(),
+        )
 
-    # 2. Celery가 없으므로 직접 함수를 호출합니다.
     try:
-        result = await process_youtube_url(request.url, user_id)
+        result = await job_queue.wait(job)
         if result.get('status') == 'Failure':
             raise HTTPException(status_code=400, detail=result.get('message'))
         
@@ -58,23 +98,98 @@ async def process_youtube_url_and_get_places(
         places = [Place(**p) for p in places_data]
         return PlaceResponse(mode="new", places=places)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"URL 처리 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/process/batch")
+async def process_youtube_urls_batch(
+    request: BatchURLRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[models.Users] = Depends(get_current_user), # Optional user
+):
+    """
+    여러 YouTube URL 또는 재생목록 URL을 한 번에 처리합니다.
+    video_id로 중복을 제거하고 이미 분석된 영상은 한 번의 쿼리로 확인해 바로 반환하며,
+    나머지는 단건 요청과 같은 작업 큐(워커 풀)에서 처리합니다. (대기열이 가득 차 거절된 항목은 failed)
+    결과는 NDJSON(application/x-ndjson)으로 항목이 끝나는 순서대로 스트리밍됩니다.
+    (첫 줄: type=accepted 요약, 중간: type=item 항목 결과, 마지막 줄: type=done 집계)
+    """
+    user_id = current_user.user_id if current_user else None
+    logger.info(
+        f"배치 처리 요청 접수: urls {len(request.urls)}개, playlist={request.playlist_url} "
+        f"(요청자: {f'user_id {user_id}' if user_id else 'guest'})"
+    )
+    try:
+        plan = await prepare_batch(db, request.urls, request.playlist_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"배치 준비 중 오류 발생: {e}")
+        raise HTTPException(status_code=502, detail=f"배치를 준비하지 못했습니다: {e}")
 
-@router.get("/places/{video_id}", response_model=List[Place])
-async def get_places_for_video(video_id: str, db: AsyncSession = Depends(get_db)):
+    async def ndjson_lines():
+        async for item in run_batch(plan, user_id):
+            yield dumps(item) + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """
+    작업 큐에 제출된 작업의 상태를 조회합니다.
+    """
+    job = await get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+    return JobStatusResponse(**job)
+
+
+@router.get("/jobs/{job_id}/result", response_model=PlaceResponse)
+async def get_job_result(job_id: str):
+    """
+    완료된 작업의 장소 목록을 반환합니다.
+    아직 완료되지 않았으면 409, 실패한 작업이면 500을 반환합니다.
+    """
+    job = await get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+    if job["status"] == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"작업이 아직 완료되지 않았습니다. (status: {job['status']})")
+
+    result = job["result"] or {}
+    if result.get("status") == "Failure":
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return PlaceResponse(mode="new", places=[Place(**p) for p in result.get("places", [])])
+
+
+
+@router.get("/places/{video_id}", response_model=List[Place], responses={304: {"description": "If-None-Match와 ETag가 일치함"}})
+async def get_places_for_video(
+    video_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
     """
     특정 video_id에 해당하는 장소 목록을 비동기적으로 조회합니다. (인증 불필요)
+    장소 캐시(프로세스 내 LRU + 선택적 Redis)에서 직렬화된 본문을 바로 반환하며,
+    ETag/If-None-Match를 지원하여 변경이 없으면 본문 없이 304를 반환합니다.
     """
     logger.info(f"API /places/{video_id} 호출됨.")
-    places = await loc_repo.get_places_by_content_id(db, video_id)
-    if not places:
+    cached = await places_cache.get_or_load(db, video_id)
+    if cached is None:
         logger.warning(f"video_id {video_id}에 대한 장소 정보가 없습니다.")
         raise HTTPException(
             status_code=404, detail="해당 영상에 대한 장소 정보가 없습니다."
         )
-    logger.info(f"video_id {video_id}에 대한 장소 {len(places)}개 조회 완료.")
-    return [Place.from_orm(p) for p in places]
\ No newline at end of file
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    logger.info(f"video_id {video_id}에 대한 장소 {len(cached.places)}개 조회 완료.")
+    return Response(content=cached.body, media_type="application/json", headers=headers)
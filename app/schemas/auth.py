@@ -20,8 +20,11 @@ class TokenData(BaseModel):
     """
     토큰 페이로드에서 추출된 데이터를 위한 Pydantic 스키마.
     주로 이메일 정보를 포함합니다.
+    user_id(uid 클레임)가 있으면 DB 조회 없이 사용자를 식별할 수 있습니다.
     """
     email: EmailStr | None = None
+    user_id: int | None = None
+    issued_at: int | None = None
 
 class User(BaseModel):
     """
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+class NearbyPlace(BaseModel):
+    """
+    주변/영역 장소 검색 결과를 위한 Pydantic 스키마.
+    기준 좌표로부터의 거리(미터)를 포함합니다.
+    """
+    place_id: int
+    name: str
+    lat: float
+    lng: float
+    distance_m: float
+
+    class Config:
+        from_attributes = True
@@ -5,11 +5,12 @@ from datetime import datetime
 class Place(BaseModel):
     """
     장소 정보를 나타내는 Pydantic 스키마.
-    이름, 위도, 경도를 포함합니다.
+    이름, 위도, 경도와 영상에서 처음 언급된 시각(초, 없으면 None)을 포함합니다.
     """
     name: str
     lat: Optional[float] = None
     lng: Optional[float] = None
+    start_seconds: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 from typing import List, Optional
 from datetime import datetime
 
@@ -8,14 +8,29 @@ class URLRequest(BaseModel):
     """
     url: str
 
+class BatchURLRequest(BaseModel):
+    """
+    여러 YouTube URL(또는 재생목록 URL)을 한 번에 처리하기 위한 Pydantic 스키마.
+    urls와 playlist_url 중 하나 이상이 필요합니다.
+    """
+    urls: List[str] = []
+    playlist_url: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.urls and not self.playlist_url:
+            raise ValueError("urls 또는 playlist_url 중 하나는 필요합니다.")
+        return self
+
 class Place(BaseModel):
     """
     장소 정보를 나타내는 Pydantic 스키마.
-    이름, 위도, 경도를 포함합니다.
+    이름, 위도, 경도와 영상에서 처음 언급된 시각(초, 없으면 None)을 포함합니다.
     """
     name: str
     lat: Optional[float] = None
     lng: Optional[float] = None
+    start_seconds: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -46,3 +61,22 @@ class ApiVideoHistory(BaseModel):
 
     class Config:
         from_attributes = True
+
+class JobAcceptedResponse(BaseModel):
+    """
+    비동기 처리 모드(202)에서 작업 접수 결과를 나타내는 Pydantic 스키마.
+    """
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    """
+    작업 상태 조회 응답을 위한 Pydantic 스키마.
+    status는 "queued", "running", "completed", "failed" 중 하나입니다.
+    """
+    job_id: str
+    status: str
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
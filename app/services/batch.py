@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator
+
+from app.db.database import AsyncSessionLocal
+from app.repositories import locations as loc_repo
+from app.services.places_cache import places_cache
+from app.services.jobs import QueueFullError, get_job_queue
+from app.utils import url as url_util
+from crawlers.youtube import fetch_playlist_video_ids
+
+logger = logging.getLogger(__name__)
+
+# 배치 하나가 작업 큐에 동시에 넣어 둘 수 있는 작업 수 (한 배치가 대기열을 독차지하지 않도록)
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", 3))
+# 배치 하나에 포함할 수 있는 최대 영상 수 (재생목록 확장 결과 포함)
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 200))
+
+
+class BatchItemStatus:
+    CACHED = "cached"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    INVALID = "invalid"
+
+
+class BatchPlan:
+    """
+    중복 제거와 기존 콘텐츠 확인이 끝난 배치 처리 계획입니다.
+    - items: (video_id, 표준 URL) 목록, 입력 순서 유지
+    - existing_ids: 이미 Contents에 있는 video_id
+    - invalid_urls: video_id를 찾을 수 없는 입력 URL
+    """
+
+    def __init__(self, items: list[tuple[str, str]], existing_ids: set[str], invalid_urls: list[str]):
+        self.items = items
+        self.existing_ids = existing_ids
+        self.invalid_urls = invalid_urls
+
+    def summary(self) -> dict:
+        return {
+            "type": "accepted",
+            "total": len(self.items),
+            "cached": len(self.existing_ids),
+            "queued": len(self.items) - len(self.existing_ids),
+            "invalid": len(self.invalid_urls),
+        }
+
+
+def dedupe_video_ids(urls: list[str]) -> tuple[list[str], list[str]]:
+    """
+    URL 목록에서 video_id를 추출해 입력 순서대로 중복을 제거합니다.
+    (video_id 목록, 잘못된 URL 목록)을 반환합니다.
+    """
+    seen: set[str] = set()
+    video_ids: list[str] = []
+    invalid_urls: list[str] = []
+    for url in urls:
+        video_id = url_util.extract_video_id(url)
+        if not video_id:
+            invalid_urls.append(url)
+            continue
+        if video_id not in seen:
+            seen.add(video_id)
+            video_ids.append(video_id)
+    return video_ids, invalid_urls
+
+
+async def prepare_batch(
+    db,
+    urls: list[str] | None = None,
+    playlist_url: str | None = None,
+    max_items: int = BATCH_MAX_ITEMS,
+) -> BatchPlan:
+    """
+    URL 목록과 재생목록 URL을 영상 단위로 펼치고 video_id로 중복을 제거한 뒤,
+    이미 분석된 영상을 한 번의 IN 쿼리로 확인합니다.
+    영상 수가 max_items를 넘으면 ValueError를 발생시킵니다.
+    """
+    urls = list(urls or [])
+    video_ids, invalid_urls = dedupe_video_ids(urls)
+
+    if playlist_url:
+        if not url_util.extract_playlist_id(playlist_url):
+            invalid_urls.append(playlist_url)
+        else:
+            playlist_ids = await fetch_playlist_video_ids(playlist_url, limit=max_items + 1)
+            seen = set(video_ids)
+            video_ids += [vid for vid in playlist_ids if not (vid in seen or seen.add(vid))]
+
+    if len(video_ids) > max_items:
+        raise ValueError(f"배치 하나에는 최대 {max_items}개의 영상만 처리할 수 있습니다.")
+
+    existing_ids = await loc_repo.get_existing_content_ids(db, video_ids)
+    items = [(vid, url_util.canonical_video_url(vid)) for vid in video_ids]
+    return BatchPlan(items, existing_ids, invalid_urls)
+
+
+async def _cached_result(video_id: str, url: str, user_id: int | None) -> dict:
+    """이미 분석된 영상의 장소 목록을 캐시(또는 DB)에서 가져오고 사용자 기록을 남깁니다."""
+    async with AsyncSessionLocal() as db:
+        if user_id:
+            await loc_repo.create_user_content_history(db, user_id, video_id)
+        cached = await places_cache.get_or_load(db, video_id)
+    return {
+        "type": "item",
+        "video_id": video_id,
+        "url": url,
+        "status": BatchItemStatus.CACHED,
+        "places": list(cached.places) if cached else [],
+    }
+
+
+async def _process_result(video_id: str, url: str, user_id: int | None, semaphore: asyncio.Semaphore) -> dict:
+    """
+    새 영상을 공용 작업 큐(워커 풀)로 처리하고, 실패해도 예외 대신 실패 항목을 반환합니다.
+    대기열이 가득 차 접수되지 않은 항목도 실패 항목으로 보고합니다.
+    """
+    async with semaphore:
+        job_queue = get_job_queue()
+        try:
+            job = await job_queue.submit(url, user_id)
+            result = await job_queue.wait(job)
+        except QueueFullError as e:
+            logger.warning(f"작업 대기열 초과로 배치 항목 거절: {video_id}")
+            return {
+                "type": "item",
+                "video_id": video_id,
+                "url": url,
+                "status": BatchItemStatus.FAILED,
+                "error": str(e),
+            }
+        except Exception as e:
+            logger.error(f"배치 항목 처리 실패: {video_id} - {e}")
+            return {
+                "type": "item",
+                "video_id": video_id,
+                "url": url,
+                "status": BatchItemStatus.FAILED,
+                "error": str(e),
+            }
+    if result.get("status") != "Completed":
+        return {
+            "type": "item",
+            "video_id": video_id,
+            "url": url,
+            "status": BatchItemStatus.FAILED,
+            "error": result.get("message"),
+        }
+    return {
+        "type": "item",
+        "video_id": video_id,
+        "url": url,
+        "status": BatchItemStatus.COMPLETED,
+        "title": result.get("title"),
+        "places": result.get("places", []),
+    }
+
+
+async def run_batch(
+    plan: BatchPlan,
+    user_id: int | None = None,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+) -> AsyncIterator[dict]:
+    """
+    배치 계획을 실행하며 항목별 결과를 끝나는 순서대로 내보냅니다.
+    처음에 요약(accepted), 마지막에 집계(done)를 내보냅니다.
+    새 영상은 HTTP/WebSocket 요청과 같은 작업 큐에 넣어 처리하므로 프로세스 전체의 동시 파이프라인 수는
+    작업 큐의 워커 수로 제한되고, 배치 하나는 동시에 max_concurrency개까지만 큐에 넣습니다.
+    소비자가 중간에 멈추면 남은 작업을 취소합니다.
+    """
+    yield plan.summary()
+    for url in plan.invalid_urls:
+        yield {"type": "item", "url": url, "status": BatchItemStatus.INVALID, "error": "Invalid YouTube URL"}
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [
+        asyncio.create_task(
+            _cached_result(vid, url, user_id)
+            if vid in plan.existing_ids
+            else _process_result(vid, url, user_id, semaphore)
+        )
+        for vid, url in plan.items
+    ]
+    counts = {BatchItemStatus.CACHED: 0, BatchItemStatus.COMPLETED: 0, BatchItemStatus.FAILED: 0}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                item = await next_done
+            except Exception as e:
+                # 캐시 조회 단계의 DB 오류 등
+                logger.error(f"배치 항목 조회 실패: {e}")
+                item = {"type": "item", "status": BatchItemStatus.FAILED, "error": str(e)}
+            counts[item["status"]] += 1
+            yield item
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    yield {"type": "done", **counts, "invalid": len(plan.invalid_urls)}
@@ -0,0 +1,198 @@
+import bisect
+import os
+
+from app.repositories import locations as loc_repo
+from app.utils.geo import bbox_around, geohash_cover, geohash_encode, geohash_prefix_upper_bound, haversine_m
+from nlp.chunking import normalize_name
+
+# 같은 장소로 볼 최대 좌표 차이(미터). LLM이 같은 가게에 대해 조금씩 다른 좌표를 내는 범위를 흡수합니다.
+PLACE_MERGE_DISTANCE_M = float(os.getenv("PLACE_MERGE_DISTANCE_M", 150))
+# 같은 장소로 볼 최소 이름 유사도 (정규화 이름의 trigram Jaccard 유사도, 0~1)
+PLACE_NAME_SIMILARITY = float(os.getenv("PLACE_NAME_SIMILARITY", 0.5))
+# 중복 정리(compact) 시 몇 개의 병합 그룹마다 커밋할지
+COMPACT_COMMIT_EVERY = int(os.getenv("PLACE_COMPACT_COMMIT_EVERY", 200))
+
+
+def name_trigrams(normalized: str) -> frozenset[str]:
+    """
+    정규화 이름의 문자 trigram 집합을 만듭니다. (pg_trgm과 같이 앞뒤 경계를 포함)
+    """
+    padded = f"^{normalized}$"
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def name_similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """두 trigram 집합의 Jaccard 유사도를 반환합니다."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class PlaceCandidate:
+    """
+    정규화 비교용 장소 정보입니다.
+    - place_id: 기존 Places 행이면 ID, 이번 배치에서 새로 나온 장소면 None
+    """
+
+    __slots__ = ("place_id", "name", "lat", "lng", "normalized", "trigrams", "geohash")
+
+    def __init__(self, name: str, lat: float | None, lng: float | None, place_id: int | None = None):
+        self.place_id = place_id
+        self.name = name
+        self.lat = lat
+        self.lng = lng
+        self.normalized = normalize_name(name)
+        self.trigrams = name_trigrams(self.normalized)
+        self.geohash = geohash_encode(lat, lng) if self.has_coords else None
+
+    @property
+    def has_coords(self) -> bool:
+        return self.lat is not None and self.lng is not None
+
+    @classmethod
+    def from_place(cls, place) -> "PlaceCandidate":
+        return cls(place.name, place.lat, place.lng, place.place_id)
+
+
+class PlaceIndex:
+    """
+    정규화 후보를 찾기 위한 메모리 인덱스입니다.
+    - 좌표가 있는 장소: geohash 정렬 목록에서 접두사 범위(bisect)로 주변 후보를 찾고,
+      거리(distance_m)와 이름 유사도(similarity)를 모두 만족하는 가장 비슷한 장소를 고릅니다.
+    - 좌표가 없는 장소: 정규화 이름이 완전히 같은 좌표 없는 장소끼리만 합칩니다.
+    """
+
+    def __init__(self, distance_m: float = PLACE_MERGE_DISTANCE_M, similarity: float = PLACE_NAME_SIMILARITY):
+        self.distance_m = distance_m
+        self.similarity = similarity
+        self._geo_keys: list[tuple[str, int]] = []
+        self._candidates: list[PlaceCandidate] = []
+        self._without_coords: dict[str, PlaceCandidate] = {}
+
+    def add(self, candidate: PlaceCandidate):
+        if not candidate.has_coords:
+            self._without_coords.setdefault(candidate.normalized, candidate)
+            return
+        self._candidates.append(candidate)
+        bisect.insort(self._geo_keys, (candidate.geohash, len(self._candidates) - 1))
+
+    def _nearby(self, lat: float, lng: float):
+        for prefix in geohash_cover(*bbox_around(lat, lng, self.distance_m)):
+            upper = geohash_prefix_upper_bound(prefix)
+            start = bisect.bisect_left(self._geo_keys, (prefix, -1))
+            end = len(self._geo_keys) if upper is None else bisect.bisect_left(self._geo_keys, (upper, -1))
+            for _, index in self._geo_keys[start:end]:
+                yield self._candidates[index]
+
+    def find(self, candidate: PlaceCandidate) -> PlaceCandidate | None:
+        """candidate와 같은 장소로 볼 수 있는 기존 항목을 찾습니다. 없으면 None을 반환합니다."""
+        if not candidate.has_coords:
+            return self._without_coords.get(candidate.normalized)
+
+        best, best_score = None, None
+        for other in self._nearby(candidate.lat, candidate.lng):
+            if other is candidate:
+                continue
+            if other.normalized == candidate.normalized:
+                similarity = 1.0
+            else:
+                similarity = name_similarity(other.trigrams, candidate.trigrams)
+                if similarity < self.similarity:
+                    continue
+            distance = haversine_m(other.lat, other.lng, candidate.lat, candidate.lng)
+            if distance > self.distance_m:
+                continue
+            # 유사도가 높은 순, 같으면 가까운 순, 같으면 먼저 생긴(place_id가 작은) 장소
+            score = (-similarity, distance, other.place_id if other.place_id is not None else float("inf"))
+            if best_score is None or score < best_score:
+                best, best_score = other, score
+        return best
+
+
+async def canonicalize_locations(
+    db,
+    locations: list,
+    distance_m: float = PLACE_MERGE_DISTANCE_M,
+    similarity: float = PLACE_NAME_SIMILARITY,
+) -> list:
+    """
+    저장 전에 LLM이 추출한 장소를 기존 Places 행(또는 같은 배치의 앞선 장소)에 맞춥니다.
+    같은 장소로 판단되면 이름과 좌표를 기존 장소의 값으로 바꿔, 저장 시 새 행 대신 기존 행에 연결되도록 합니다.
+    후보는 좌표 주변(geohash 인덱스)과 좌표 없는 동일 이름으로 각각 한 번씩만 조회합니다.
+    """
+    valid = [loc for loc in locations or [] if isinstance(loc, dict) and loc.get("name")]
+    if not valid:
+        return []
+
+    incoming = [PlaceCandidate(loc["name"], loc.get("lat"), loc.get("lng")) for loc in valid]
+    points = [(c.lat, c.lng) for c in incoming if c.has_coords]
+    names = sorted({c.normalized for c in incoming if not c.has_coords})
+
+    index = PlaceIndex(distance_m, similarity)
+    for place in await loc_repo.find_places_near_points(db, points, distance_m):
+        index.add(PlaceCandidate.from_place(place))
+    for place in await loc_repo.find_places_without_coords(db, names):
+        index.add(PlaceCandidate.from_place(place))
+
+    canonicalized = []
+    merged = 0
+    for loc, candidate in zip(valid, incoming):
+        match = index.find(candidate)
+        if match is None:
+            index.add(candidate)
+            canonicalized.append(loc)
+            continue
+        merged += 1
+        canonicalized.append({**loc, "name": match.name, "lat": match.lat, "lng": match.lng})
+
+    if merged:
+        print(f"🔗 장소 {len(valid)}개 중 {merged}개를 기존(또는 앞선) 장소로 정규화했습니다.")
+    return canonicalized
+
+
+async def compact_duplicate_places(
+    db,
+    distance_m: float = PLACE_MERGE_DISTANCE_M,
+    similarity: float = PLACE_NAME_SIMILARITY,
+    dry_run: bool = False,
+) -> dict:
+    """
+    이미 저장된 Places의 중복을 찾아 하나로 합칩니다. (백필/주기 작업용)
+    place_id 순으로 훑으며 앞선(가장 오래된) 장소를 대표로 삼고, 중복 장소의 content_places 연결을
+    대표 장소로 옮긴 뒤 중복 행을 삭제합니다. 연결이 바뀐 콘텐츠의 장소 캐시는 무효화합니다.
+    """
+    from sqlalchemy import select
+    from models import Places
+    from app.services.places_cache import places_cache
+
+    result = await db.execute(
+        select(Places.place_id, Places.name, Places.lat, Places.lng).order_by(Places.place_id)
+    )
+    index = PlaceIndex(distance_m, similarity)
+    groups: dict[int, list[int]] = {}
+    scanned = 0
+    for row in result.all():
+        scanned += 1
+        candidate = PlaceCandidate(row.name, row.lat, row.lng, row.place_id)
+        match = index.find(candidate)
+        if match is None:
+            index.add(candidate)
+        else:
+            groups.setdefault(match.place_id, []).append(candidate.place_id)
+
+    duplicates = sum(len(ids) for ids in groups.values())
+    stats = {"scanned": scanned, "groups": len(groups), "duplicates": duplicates, "contents": 0}
+    if dry_run or not groups:
+        return stats
+
+    affected: set[str] = set()
+    for i, (canonical_id, duplicate_ids) in enumerate(groups.items(), start=1):
+        affected.update(await loc_repo.merge_places(db, canonical_id, duplicate_ids))
+        if i % COMPACT_COMMIT_EVERY == 0:
+            await db.commit()
+    await db.commit()
+
+    for content_id in affected:
+        await places_cache.invalidate(content_id)
+    stats["contents"] = len(affected)
+    return stats
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from fastapi import WebSocket
+
+from app.utils.serialization import dumps_text
+
+logger = logging.getLogger(__name__)
+
+# 연결별 송신 대기열 최대 길이. 가득 차면 진행률 프레임은 버리고, 그 외 프레임이면 연결을 끊습니다.
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 64))
+# 프레임 하나를 보내는 데 허용하는 최대 시간(초). 넘기면 느린 클라이언트로 보고 연결을 끊습니다.
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", 10))
+# ping 프레임 전송 및 유휴 연결 검사 주기(초)
+WS_PING_INTERVAL_SECONDS = float(os.getenv("WS_PING_INTERVAL_SECONDS", 20))
+# 클라이언트 메시지도, 진행 중인 작업도 없는 연결을 끊기까지의 시간(초)
+WS_IDLE_TIMEOUT_SECONDS = float(os.getenv("WS_IDLE_TIMEOUT_SECONDS", 300))
+
+# 같은 작업의 새 프레임으로 대체해도 되는(오래된 값은 의미 없는) 상태들
+COALESCIBLE_STATUSES = {"processing", "ping"}
+
+
+class Connection:
+    """
+    WebSocket 연결 하나와 그 송신 대기열입니다.
+    처리 코루틴은 send()로 대기열에 넣기만 하고, 실제 전송은 연결별 writer Task가 담당하므로
+    느린 클라이언트가 처리 코루틴을 멈추지 않습니다.
+    - 진행률 프레임(processing/ping)은 같은 키의 이전 프레임이 아직 대기 중이면 그 자리를 최신 값으로 바꿉니다.
+    - 대기열이 가득 찬 상태에서 진행률이 아닌 프레임이 들어오면 연결을 끊습니다.
+    """
+
+    def __init__(self, connection_id: str, websocket: WebSocket, max_queue_size: int = WS_SEND_QUEUE_SIZE):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.last_seen = time.monotonic()
+        self.tasks: set[asyncio.Task] = set()
+        self.closed = False
+        self._frames: deque[list] = deque()
+        self._slots: Dict[str, list] = {}
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.coalesced = 0
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def touch(self):
+        self.last_seen = time.monotonic()
+
+    def is_idle(self, now: float, idle_timeout: float) -> bool:
+        return not self.tasks and now - self.last_seen > idle_timeout
+
+    def send(self, data: dict, key: str | None = None) -> bool:
+        """
+        프레임을 송신 대기열에 넣습니다. 연결을 끊어야 하면 False를 반환합니다.
+        key가 있고 상태가 진행률 프레임이면 같은 key의 대기 중인 프레임을 대체합니다.
+        """
+        if self.closed:
+            return False
+        coalescible = data.get("status") in COALESCIBLE_STATUSES
+        slot_key = f"{key or ''}:{data.get('status')}" if coalescible else None
+
+        if slot_key is not None and slot_key in self._slots:
+            self._slots[slot_key][1] = data
+            self.coalesced += 1
+            return True
+        if len(self._frames) >= self.max_queue_size:
+            if coalescible:
+                # 최신 진행률은 다음 프레임으로 다시 전달되므로 버려도 됩니다.
+                self.coalesced += 1
+                return True
+            logger.warning(f"WebSocket 송신 대기열 초과, 연결을 끊습니다: {self.connection_id}")
+            return False
+
+        frame = [slot_key, data]
+        if slot_key is not None:
+            self._slots[slot_key] = frame
+        self._frames.append(frame)
+        self._ready.set()
+        return True
+
+    async def _write_loop(self):
+        try:
+            while True:
+                await self._ready.wait()
+                while self._frames:
+                    slot_key, data = self._frames.popleft()
+                    if slot_key is not None:
+                        self._slots.pop(slot_key, None)
+                    await asyncio.wait_for(
+                        self.websocket.send_text(dumps_text(data)), WS_SEND_TIMEOUT_SECONDS
+                    )
+                    logger.debug(f"진행 상황 전송 완료: {self.connection_id} - {data.get('status')}")
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"WebSocket 메시지 전송 실패: {self.connection_id} - {e}")
+            await self.close(code=1011)
+
+    async def close(self, code: int = 1000):
+        if self.closed:
+            return
+        self.closed = True
+        for task in list(self.tasks):
+            task.cancel()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+
+class ConnectionManager:
+    """
+    활성 WebSocket 연결을 관리합니다.
+    - 연결별 송신 대기열 + writer Task로 느린 클라이언트를 처리 코루틴과 분리합니다.
+    - 하나의 작업 진행 상황을 여러 연결(탭)에 전달할 수 있습니다. (SingleFlight 구독자마다 send_progress 호출)
+    - 주기적으로 ping 프레임을 보내고, 유휴 연결을 정리합니다.
+    """
+
+    def __init__(
+        self,
+        ping_interval: float = WS_PING_INTERVAL_SECONDS,
+        idle_timeout: float = WS_IDLE_TIMEOUT_SECONDS,
+    ):
+        self.active_connections: Dict[str, Connection] = {}
+        self.ping_interval = ping_interval
+        self.idle_timeout = idle_timeout
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def connect(self, websocket: WebSocket, connection_id: str) -> Connection:
+        await websocket.accept()
+        connection = Connection(connection_id, websocket)
+        connection.start()
+        self.active_connections[connection_id] = connection
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+        logger.info(f"WebSocket 연결 성공: {connection_id} (활성 연결 {len(self.active_connections)}개)")
+        return connection
+
+    async def disconnect(self, connection_id: str, code: int = 1000):
+        connection = self.active_connections.pop(connection_id, None)
+        if connection is not None:
+            await connection.close(code=code)
+            logger.info(f"WebSocket 연결 종료: {connection_id}")
+
+    def get(self, connection_id: str) -> Optional[Connection]:
+        return self.active_connections.get(connection_id)
+
+    def touch(self, connection_id: str):
+        connection = self.active_connections.get(connection_id)
+        if connection is not None:
+            connection.touch()
+
+    def run(self, connection_id: str, coro) -> Optional[asyncio.Task]:
+        """
+        연결에 속한 처리 작업을 백그라운드 Task로 실행합니다.
+        수신 루프가 막히지 않으며, 연결이 끊기면 작업도 취소됩니다. (추출 작업 자체는 SingleFlight가 보호)
+        """
+        connection = self.active_connections.get(connection_id)
+        if connection is None:
+            coro.close()
+            return None
+        task = asyncio.create_task(coro)
+        connection.tasks.add(task)
+        task.add_done_callback(connection.tasks.discard)
+        return task
+
+    async def send_progress(self, connection_id: str, data: dict, key: str | None = None):
+        """
+        프레임을 연결의 송신 대기열에 넣습니다. 전송을 기다리지 않습니다.
+        key는 진행률 프레임을 합칠 단위(예: video_id)입니다.
+        """
+        connection = self.active_connections.get(connection_id)
+        if connection is None:
+            return
+        if not connection.send(data, key=key):
+            await self.disconnect(connection_id, code=1013)
+
+    async def _reap_loop(self):
+        while self.active_connections:
+            await asyncio.sleep(self.ping_interval)
+            now = time.monotonic()
+            for connection_id, connection in list(self.active_connections.items()):
+                if connection.closed:
+                    self.active_connections.pop(connection_id, None)
+                elif connection.is_idle(now, self.idle_timeout):
+                    logger.info(f"유휴 WebSocket 연결 정리: {connection_id}")
+                    await self.disconnect(connection_id, code=1001)
+                else:
+                    await self.send_progress(connection_id, {"status": "ping"})
@@ -1,6 +1,15 @@
 import asyncio
-from crawlers.youtube import get_youtube_metadata, get_youtube_transcript_only
+from crawlers.youtube import (
+    fetch_captions,
+    fetch_video_info,
+    metadata_from_info,
+    transcribe_from_audio,
+)
 from nlp.gemini_location import GeminiService
+from nlp.preprocess import merge_caption_segments, preprocess_segments
+from nlp.segments import TranscriptSegments
+from app.utils.progress import report
+from app.utils.metrics import record_cache, transcript_token_reduction_ratio
 
 class ExtractorService:
     """
@@ -11,28 +20,61 @@ class ExtractorService:
     def __init__(self):
         self.gemini_service = GeminiService()
 
-    async def extract_data_from_youtube(self, youtube_url: str) -> tuple[str | None, list, str | None, str | None]:
+    async def extract_data_from_youtube(
+        self, youtube_url: str
+    ) -> tuple[str | None, list, str | None, str | None, str | None, TranscriptSegments | None]:
         """
-        YouTube URL에서 (스크립트, 장소 목록, 제목, 썸네일) 정보를 비동기적으로 추출하여 반환합니다.
+        YouTube URL에서 (스크립트, 장소 목록, 제목, 썸네일, 스크립트 출처, 스크립트 구간) 정보를 비동기적으로 추출하여 반환합니다.
+        스크립트 출처는 "manual:ko", "generated:en", "translated:ja>ko", "stt" 등입니다.
+        스크립트 구간은 시간 정보가 있는 원본 스크립트이며, 장소마다 처음 언급된 영상 시각(start_seconds)이 붙습니다.
         """
         print(f"➡️ ExtractorService: '{youtube_url}' 처리를 시작합니다.")
         
-        # 1. 메타데이터와 스크립트 추출을 동시에 시작합니다.
+        # 1. 메타데이터(yt-dlp, 한 번만 조회)와 자막 조회를 동시에 시작합니다.
         print("➡️ YouTube 메타데이터 및 스크립트 추출을 논블로킹으로 실행합니다...")
-        metadata_task = asyncio.to_thread(get_youtube_metadata, youtube_url)
-        transcript_task = get_youtube_transcript_only(youtube_url)
+        video_id = youtube_url.split("v=")[1].split("&")[0]
+        await report("metadata", 0.0, "analyzing url ...")
+        info, (segments, transcript_source) = await asyncio.gather(
+            fetch_video_info(youtube_url),
+            asyncio.to_thread(fetch_captions, video_id),
+        )
+        title, thumbnail_url = metadata_from_info(info)
+        # 자막으로 STT를 피한 비율을 /metrics의 cache="captions" 적중률로 확인할 수 있습니다.
+        record_cache("captions", segments is not None)
+        await report(
+            "captions", 1.0, "captions found" if segments else "no captions, listening to audio ..."
+        )
+
+        # 자막이 없으면 이미 조회한 영상 정보를 재사용해 음원을 내려받고 STT를 수행합니다.
+        if not segments:
+            print("➡️ 음원 추출 및 STT를 시작합니다.")
+            segments = await transcribe_from_audio(youtube_url, info)
+            transcript_source = "stt" if segments else None
 
-        # 두 작업을 동시에 기다립니다.
-        (title, thumbnail_url), transcript = await asyncio.gather(metadata_task, transcript_task)
-        
         print("✅ YouTube 메타데이터 및 스크립트 추출 작업 완료.")
 
-        if not transcript:
+        if not segments:
             print("⚠️ 스크립트가 없어 위치 추출을 건너뜁니다.")
-            return None, [], title, thumbnail_url
+            return None, [], title, thumbnail_url, None, None
 
-        # 2. 비동기 Gemini 서비스를 호출합니다.
-        locations = await self.gemini_service.extract_locations_from_transcript(transcript)
+        # 저장하는 스크립트는 롤링 자막의 겹침만 정리한 원문입니다.
+        transcript = merge_caption_segments(segments.texts)
+        locations = await self.extract_locations_from_segments(segments, transcript_source)
         
         print(f"✅ ExtractorService: '{youtube_url}' 처리 완료.")
-        return transcript, locations, title, thumbnail_url
\ No newline at end of file
+        return transcript, locations, title, thumbnail_url, transcript_source, segments
+
+    async def extract_locations_from_segments(
+        self, segments: TranscriptSegments, transcript_source: str | None = None
+    ) -> list:
+        """
+        시간 정보가 있는 스크립트(또는 그 일부 시간 범위)에서 장소를 추출합니다.
+        효과음 표기/필러/반복을 지워 LLM에 보낼 스크립트를 줄이고, 장소마다 영상 시각을 붙입니다.
+        """
+        cleaned = preprocess_segments(segments)
+        transcript_token_reduction_ratio.observe(cleaned.reduction, (transcript_source or "unknown").split(":")[0])
+        print(
+            f"🧹 스크립트 전처리: 토큰 {cleaned.original_tokens} -> {cleaned.tokens} "
+            f"({cleaned.reduction:.0%} 감소)"
+        )
+        return await self.gemini_service.extract_locations_from_transcript(cleaned.text, segments=cleaned.segments)
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.utils.singleflight import ProgressCallback
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis 저장소는 선택 사항입니다.
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# 동시에 실행할 추출 파이프라인 수 (yt-dlp + STT + LLM)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+# 대기열 최대 길이. 가득 차면 새 작업을 429로 거절합니다.
+JOB_QUEUE_MAX_SIZE = int(os.getenv("JOB_QUEUE_MAX_SIZE", 50))
+# 완료된 작업 정보를 보관하는 시간(초)
+JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS", 60 * 60))
+# 작업 상태 저장소: "memory"(기본) | "redis"
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "memory").strip().lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없을 때 발생합니다."""
+
+
+class Job:
+    """
+    대기열에 들어간 하나의 URL 처리 작업입니다.
+    - job_id: 작업 고유 ID
+    - url / user_id: 처리할 URL과 요청한 사용자
+    - status: JobStatus 값
+    - result / error: 완료 결과 또는 오류 메시지
+    - subscriber: 진행 상황을 받을 콜백 (WebSocket 요청 등, 저장소에는 저장하지 않음)
+    """
+
+    def __init__(self, url: str, user_id: int | None, subscriber: ProgressCallback | None = None):
+        self.job_id = uuid.uuid4().hex
+        self.url = url
+        self.user_id = user_id
+        self.subscriber = subscriber
+        self.status = JobStatus.QUEUED
+        self.result: Any = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "url": self.url,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class MemoryJobStore:
+    """프로세스 메모리에 작업 상태를 보관합니다. 보관 기간이 지난 완료 작업은 정리합니다."""
+
+    def __init__(self, ttl_seconds: int = JOB_RESULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, dict] = {}
+
+    async def save(self, job: Job):
+        self._jobs[job.job_id] = job.to_dict()
+        self._purge()
+
+    async def get(self, job_id: str) -> dict | None:
+        return self._jobs.get(job_id)
+
+    def _purge(self):
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["finished_at"] and now - job["finished_at"] > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class RedisJobStore:
+    """
+    Redis에 작업 상태를 보관합니다. 여러 서버 프로세스가 작업 상태를 공유해야 할 때 사용합니다.
+    """
+
+    def __init__(self, url: str = REDIS_URL, ttl_seconds: int = JOB_RESULT_TTL_SECONDS):
+        if aioredis is None:
+            raise RuntimeError("JOB_STORE_BACKEND=redis 를 사용하려면 redis 패키지가 필요합니다.")
+        self.ttl_seconds = ttl_seconds
+        self._redis = aioredis.from_url(url)
+
+    async def save(self, job: Job):
+        await self._redis.set(
+            f"job:{job.job_id}", json.dumps(job.to_dict(), ensure_ascii=False), ex=self.ttl_seconds
+        )
+
+    async def get(self, job_id: str) -> dict | None:
+        value = await self._redis.get(f"job:{job_id}")
+        return json.loads(value) if value else None
+
+
+class JobQueue:
+    """
+    고정 크기 워커 풀로 URL 처리 작업을 실행하는 프로세스 내 작업 큐입니다.
+    - 동시에 실행되는 파이프라인 수를 workers개로 제한합니다.
+    - 대기열이 가득 차면 QueueFullError로 새 작업을 거절합니다. (admission control)
+    - HTTP, WebSocket, 배치 요청이 모두 이 큐를 거치므로 프로세스당 동시 파이프라인 수가 workers개를 넘지 않습니다.
+    handler는 (url, user_id, subscriber)를 받아 작업을 실행하는 코루틴 함수입니다.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, int | None, ProgressCallback | None], Awaitable[Any]],
+        workers: int = JOB_WORKERS,
+        max_queue_size: int = JOB_QUEUE_MAX_SIZE,
+        store=None,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.store = store or MemoryJobStore()
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queue_size)
+        self._worker_tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        if self._worker_tasks:
+            return
+        for i in range(self.workers):
+            self._worker_tasks.append(asyncio.create_task(self._worker(i)))
+        logger.info(f"작업 큐 시작: workers={self.workers}, max_queue_size={self._queue.maxsize}")
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(
+        self, url: str, user_id: int | None = None, subscriber: ProgressCallback | None = None
+    ) -> Job:
+        """
+        작업을 대기열에 넣습니다. 대기열이 가득 찼으면 QueueFullError를 발생시킵니다.
+        subscriber를 넘기면 작업이 실행되는 동안 진행 상황을 받습니다.
+        """
+        job = Job(url, user_id, subscriber)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+        await self.store.save(job)
+        return job
+
+    async def wait(self, job: Job) -> Any:
+        """작업이 끝날 때까지 기다린 뒤 결과를 반환합니다. 실패한 작업은 RuntimeError를 발생시킵니다."""
+        await job.done.wait()
+        if job.status == JobStatus.FAILED:
+            raise RuntimeError(job.error)
+        return job.result
+
+    async def get(self, job_id: str) -> dict | None:
+        return await self.store.get(job_id)
+
+    async def _worker(self, worker_index: int):
+        while True:
+            job = await self._queue.get()
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            await self.store.save(job)
+            try:
+                job.result = await self.handler(job.url, job.user_id, job.subscriber)
+                job.status = JobStatus.COMPLETED
+            except asyncio.CancelledError:
+                job.status = JobStatus.FAILED
+                job.error = "작업이 취소되었습니다."
+                raise
+            except Exception as e:
+                logger.error(f"[worker-{worker_index}] 작업 실패 {job.job_id}: {e}")
+                job.status = JobStatus.FAILED
+                job.error = f"{type(e).__name__}: {e}"
+            finally:
+                job.finished_at = time.time()
+                job.done.set()
+                self._queue.task_done()
+                try:
+                    await self.store.save(job)
+                except Exception as e:
+                    logger.error(f"작업 상태 저장 실패 {job.job_id}: {e}")
+
+
+def create_job_store():
+    if JOB_STORE_BACKEND == "redis":
+        return RedisJobStore()
+    if JOB_STORE_BACKEND == "memory":
+        return MemoryJobStore()
+    raise ValueError(f"지원하지 않는 JOB_STORE_BACKEND: {JOB_STORE_BACKEND}")
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """프로세스 전체에서 공유하는 작업 큐를 반환합니다. (앱 시작 시 start()가 호출됩니다)"""
+    global _job_queue
+    if _job_queue is None:
+        from app.tasks import process_youtube_url
+
+        _job_queue = JobQueue(process_youtube_url, store=create_job_store())
+    return _job_queue
@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import os
+from typing import Optional
+
+import orjson
+from cachetools import TTLCache
+
+from app.utils.metrics import record_cache
+from app.utils.serialization import dumps
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis 계층은 선택 사항입니다.
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 내 LRU 계층 설정. 다른 프로세스의 무효화를 받지 못하므로 TTL로 오래된 값을 제한합니다.
+PLACES_CACHE_LOCAL_MAX_SIZE = int(os.getenv("PLACES_CACHE_LOCAL_MAX_SIZE", 2048))
+PLACES_CACHE_LOCAL_TTL_SECONDS = int(os.getenv("PLACES_CACHE_LOCAL_TTL_SECONDS", 300))
+# Redis 계층 설정 (PLACES_CACHE_REDIS=true일 때만 사용)
+PLACES_CACHE_REDIS = os.getenv("PLACES_CACHE_REDIS", "false").lower() in ("1", "true", "yes")
+PLACES_CACHE_REDIS_TTL_SECONDS = int(os.getenv("PLACES_CACHE_REDIS_TTL_SECONDS", 24 * 60 * 60))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class CachedPlaces:
+    """
+    content_id 하나에 대한 캐시 항목입니다.
+    - places: 장소 dict 목록 (name, lat, lng)
+    - body: orjson으로 직렬화한 응답 본문
+    - etag: body의 해시로 만든 ETag
+    """
+
+    __slots__ = ("places", "body", "etag")
+
+    def __init__(self, places: list[dict], body: bytes):
+        self.places = places
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+    @classmethod
+    def from_places(cls, places: list[dict]) -> "CachedPlaces":
+        return cls(places, dumps(places))
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedPlaces":
+        return cls(orjson.loads(body), body)
+
+
+class RedisPlacesTier:
+    """직렬화된 장소 목록을 Redis에 보관하는 원격 계층입니다."""
+
+    def __init__(self, url: str = REDIS_URL, ttl_seconds: int = PLACES_CACHE_REDIS_TTL_SECONDS):
+        if aioredis is None:
+            raise RuntimeError("PLACES_CACHE_REDIS=true 를 사용하려면 redis 패키지가 필요합니다.")
+        self.ttl_seconds = ttl_seconds
+        self._redis = aioredis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, body: bytes):
+        await self._redis.set(key, body, ex=self.ttl_seconds)
+
+    async def delete(self, key: str):
+        await self._redis.delete(key)
+
+
+class PlacesCache:
+    """
+    content_id별 장소 목록 read-through 캐시입니다. (프로세스 내 LRU + 선택적 원격 계층)
+    - 저장(save_extracted_data)이 커밋된 뒤 reload()로 DB에서 다시 읽어 채웁니다.
+      (커밋 전에 비우면 그 사이의 조회가 이전 장소 목록을 TTL 동안 다시 캐시할 수 있습니다.)
+    - 장소가 없는 결과는 캐시하지 않습니다. (아직 처리되지 않은 영상일 수 있음)
+    - 원격 계층 오류는 로그만 남기고 DB 조회로 대체합니다.
+    """
+
+    def __init__(self, remote=None, local_max_size: int = PLACES_CACHE_LOCAL_MAX_SIZE, local_ttl: int = PLACES_CACHE_LOCAL_TTL_SECONDS):
+        self.remote = remote
+        self._local: TTLCache = TTLCache(maxsize=local_max_size, ttl=local_ttl)
+
+    @staticmethod
+    def _key(content_id: str) -> str:
+        return f"places:{content_id}"
+
+    async def get(self, content_id: str) -> Optional[CachedPlaces]:
+        entry = self._local.get(content_id)
+        if entry is not None:
+            record_cache("places_local", True)
+            return entry
+        record_cache("places_local", False)
+
+        if self.remote is None:
+            return None
+        try:
+            body = await self.remote.get(self._key(content_id))
+        except Exception as e:
+            logger.warning(f"장소 캐시 원격 조회 실패: {content_id} - {e}")
+            return None
+        record_cache("places_remote", body is not None)
+        if body is None:
+            return None
+        entry = CachedPlaces.from_body(body)
+        self._local[content_id] = entry
+        return entry
+
+    async def set(self, content_id: str, places: list[dict]) -> Optional[CachedPlaces]:
+        if not places:
+            await self.invalidate(content_id)
+            return None
+        entry = CachedPlaces.from_places(places)
+        self._local[content_id] = entry
+        if self.remote is not None:
+            try:
+                await self.remote.set(self._key(content_id), entry.body)
+            except Exception as e:
+                logger.warning(f"장소 캐시 원격 저장 실패: {content_id} - {e}")
+        return entry
+
+    async def invalidate(self, content_id: str):
+        self._local.pop(content_id, None)
+        if self.remote is not None:
+            try:
+                await self.remote.delete(self._key(content_id))
+            except Exception as e:
+                logger.warning(f"장소 캐시 원격 무효화 실패: {content_id} - {e}")
+
+    async def get_or_load(self, db, content_id: str) -> Optional[CachedPlaces]:
+        """
+        캐시에서 장소 목록을 찾고, 없으면 DB에서 조회해 캐시를 채웁니다.
+        장소가 없으면 None을 반환합니다.
+        """
+        entry = await self.get(content_id)
+        if entry is not None:
+            return entry
+        return await self.reload(db, content_id)
+
+    async def reload(self, db, content_id: str) -> Optional[CachedPlaces]:
+        """
+        DB에서 장소 목록을 다시 읽어 캐시를 채웁니다. 저장이 커밋된 뒤에 호출합니다.
+        항상 같은 쿼리(처음 언급 시각 순)로 만들므로 내용이 같으면 ETag도 같습니다.
+        """
+        from app.repositories.locations import get_places_with_start_by_content_id
+        from app.utils.serialization import place_to_dict
+
+        places = await get_places_with_start_by_content_id(db, content_id)
+        return await self.set(content_id, [place_to_dict(p, start) for p, start in places])
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 헤더 값이 etag와 일치하는지 확인합니다. (목록, 약한 비교, * 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+places_cache = PlacesCache(remote=RedisPlacesTier() if PLACES_CACHE_REDIS else None)
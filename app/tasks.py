@@ -1,11 +1,112 @@
 from app.utils.url import extract_video_id
+from app.utils.singleflight import SingleFlight
+from app.utils.metrics import record_cache, stage
+from app.utils.progress import use_reporter
+from app.services.places_cache import places_cache
+from app.services.jobs import JobStatus, QueueFullError, get_job_queue
+from app.services.canonicalizer import canonicalize_locations
 from app.services.extractor import ExtractorService
-from app.repositories.locations import save_extracted_data
+from app.repositories.locations import (
+    get_content_by_id,
+    location_start_seconds,
+    replace_content_places_in_range,
+    save_extracted_data,
+)
+from app.utils.serialization import place_to_dict
 from app.db.database import AsyncSessionLocal
+from nlp.segments import TranscriptSegments
 import asyncio
 
 from app.repositories.locations import create_user_content_history
 
+# 같은 video_id에 대한 동시 추출 요청을 하나로 합치는 프로세스 내 레지스트리
+extraction_flights = SingleFlight()
+
+
+@stage("pipeline")
+async def _extract_and_save(url: str, video_id: str, publish) -> dict:
+    """
+    yt-dlp + 스크립트 + Gemini 파이프라인을 실행하고 결과를 DB에 저장합니다.
+    같은 video_id에 대해 동시에 한 번만 실행되며, 진행 상황은 publish로 모든 구독자에게 전달됩니다.
+    각 단계(크롤러, STT, LLM, 저장)는 app.utils.progress.report()로 실제 진행 상황을 발행합니다.
+    """
+    with use_reporter(publish):
+        extractor_service = ExtractorService()
+        transcript, locations, title, thumbnail_url, transcript_source, segments = (
+            await extractor_service.extract_data_from_youtube(url)
+        )
+
+        async with AsyncSessionLocal() as db:
+            # 철자/좌표가 조금씩 다른 같은 장소를 기존 장소로 맞춘 뒤 저장합니다.
+            locations = await canonicalize_locations(db, locations)
+            await save_extracted_data(
+                db, video_id, url, transcript, locations, title, thumbnail_url,
+                transcript_source=transcript_source, segments=segments,
+            )
+            # 커밋이 끝난 뒤 DB에서 다시 읽어 캐시를 채웁니다. (/places 조회와 같은 순서/값)
+            cached = await places_cache.reload(db, video_id)
+
+    return {
+        "title": title,
+        "places": list(cached.places) if cached else [],
+    }
+
+
+@stage("reextract_range")
+async def reextract_time_range(video_id: str, start: float, end: float) -> dict:
+    """
+    저장된 스크립트 구간(Contents.segments)에서 [start, end) 초 범위만 다시 추출해 그 범위의 장소 연결을 바꿉니다.
+    영상 정보/자막/음원을 다시 받지 않고, 범위 밖의 스크립트는 LLM에 보내지 않습니다.
+    (프롬프트나 모델을 바꾼 뒤 일부 구간만 다시 확인하거나, 잘못 추출된 구간을 고칠 때 사용합니다.)
+    """
+    async with AsyncSessionLocal() as db:
+        content = await get_content_by_id(db, video_id)
+        if content is None or not content.segments:
+            return {"status": "Failure", "message": "no stored transcript segments"}
+
+        segments = TranscriptSegments.unpack(content.segments).between(start, end)
+        locations = []
+        if segments:
+            locations = await ExtractorService().extract_locations_from_segments(
+                segments, content.transcript_source
+            )
+            locations = await canonicalize_locations(db, locations)
+        saved_places = await replace_content_places_in_range(db, video_id, start, end, locations)
+        await places_cache.reload(db, video_id)
+
+    starts = location_start_seconds(locations)
+    return {
+        "status": "Completed",
+        "start": start,
+        "end": end,
+        "places": [place_to_dict(p, starts.get((p.name, p.lat, p.lng))) for p in saved_places],
+    }
+
+
+async def _run_extraction(url: str, video_id: str, subscriber=None) -> tuple[dict, bool]:
+    """
+    video_id 단위 single-flight로 추출 파이프라인을 실행합니다.
+    이미 같은 영상이 처리 중이면 새로 실행하지 않고 진행 중인 작업에 합류합니다.
+    """
+    result, shared = await extraction_flights.do(
+        video_id,
+        lambda publish: _extract_and_save(url, video_id, publish),
+        subscriber=subscriber,
+    )
+    record_cache("extraction_singleflight", shared)
+    return result, shared
+
+
+async def watch_extraction(video_id: str, subscriber=None) -> tuple[dict | None, bool]:
+    """
+    이미 처리 중인 영상의 진행 상황을 구독하고 결과를 기다립니다. 새 작업은 시작하지 않습니다.
+    (결과, 합류 여부)를 반환하며, 처리 중인 작업이 없으면 (None, False)를 반환합니다.
+    """
+    result, joined = await extraction_flights.join(video_id, subscriber)
+    if joined:
+        record_cache("extraction_singleflight", True)
+    return result, joined
+
 
 async def process_youtube_url_with_websocket(
     url: str, user_id: int | None = None, connection_id: str | None = None, manager=None
@@ -31,114 +132,69 @@ async def process_youtube_url_with_websocket(
             )
         return {"status": "Failure", "message": "Invalid YouTube URL"}
 
+    subscriber = None
+    if manager and connection_id:
+
+        async def subscriber(data: dict):
+            # 같은 영상의 진행률 프레임은 송신 대기열에서 최신 값으로 합쳐집니다.
+            await manager.send_progress(connection_id, {**data, "video_id": video_id}, key=video_id)
+
     try:
         # 캐시 확인
-        if manager and connection_id:
-            await manager.send_progress(
-                connection_id,
-                {"status": "processing", "message": "checking url ...", "progress": 10},
+        if subscriber:
+            await subscriber(
+                {"status": "processing", "message": "checking url ...", "progress": 10}
             )
 
         async with AsyncSessionLocal() as db:
             # 캐시 확인
-            from app.repositories.locations import (
-                get_content_by_id,
-                get_places_by_content_id,
-            )
+            from app.repositories.locations import get_content_by_id
 
             existing_content = await get_content_by_id(db, video_id)
 
             if existing_content:
                 print(f"[WebSocket Processing] 📋 캐시된 데이터 발견: {video_id}")
-                if manager and connection_id:
-                    await manager.send_progress(
-                        connection_id,
+                if subscriber:
+                    await subscriber(
                         {
                             "status": "processing",
                             "message": "almost done...",
                             "progress": 90,
-                        },
+                        }
                     )
 
                 if user_id:
                     await create_user_content_history(db, user_id, video_id)
 
-                places = await get_places_by_content_id(db, video_id)
+                cached = await places_cache.get_or_load(db, video_id)
                 result = {
                     "status": "Completed",
                     "source_url": url,
                     "title": existing_content.title,
                     "mode": "cached",
-                    "places": [
-                        {"name": p.name, "lat": p.lat, "lng": p.lng} for p in places
-                    ],
+                    "places": list(cached.places) if cached else [],
                 }
                 return result
 
-        # 새로운 처리 시작
-        if manager and connection_id:
-            await manager.send_progress(
-                connection_id,
-                {"status": "processing", "message": "analyzing url...", "progress": 20},
+        # 새로운 처리는 HTTP 요청과 같은 작업 큐의 워커 풀에서 실행합니다.
+        # (같은 영상이 처리 중이면 워커 안에서 해당 작업의 진행 상황 스트림에 합류)
+        job_queue = get_job_queue()
+        job = await job_queue.submit(url, user_id, subscriber)
+        if subscriber and job.status == JobStatus.QUEUED:
+            await subscriber(
+                {"status": "queued", "message": "waiting for a worker ...", "progress": 10}
             )
-
-        extractor_service = ExtractorService()
-
-        # 메타데이터 및 스크립트 추출
-        if manager and connection_id:
-            await manager.send_progress(
-                connection_id,
-                {
-                    "status": "processing",
-                    "message": "understanding video ...",
-                    "progress": 40,
-                },
-            )
-
-        transcript, locations, title, thumbnail_url = (
-            await extractor_service.extract_data_from_youtube(url)
-        )
-
-        # AI 위치 분석
-        if manager and connection_id:
-            await manager.send_progress(
-                connection_id,
-                {
-                    "status": "processing",
-                    "message": "amazing locations ...",
-                    "progress": 70,
-                },
-            )
-
-        # 데이터베이스 저장
-        if manager and connection_id:
-            await manager.send_progress(
-                connection_id,
-                {"status": "processing", "message": "saving ...", "progress": 90},
-            )
-
-        async with AsyncSessionLocal() as db:
-            saved_places = await save_extracted_data(
-                db, video_id, url, transcript, locations, title, thumbnail_url
-            )
-
-            if user_id:
-                print(
-                    f"[WebSocket Processing] 📝 사용자 기록 저장: user_id={user_id}, video_id={video_id}"
-                )
-                await create_user_content_history(db, user_id, video_id)
+        result = await job_queue.wait(job)
+        if result.get("status") != "Completed":
+            return result
 
         print(f"[WebSocket Processing] ✅ 작업 성공!")
-        return {
-            "status": "Completed",
-            "source_url": url,
-            "title": title,
-            "mode": "new",
-            "places": [
-                {"name": p.name, "lat": p.lat, "lng": p.lng} for p in saved_places
-            ],
-        }
+        return {**result, "mode": "new"}
 
+    except QueueFullError:
+        # 대기열이 가득 찬 경우는 오류가 아니므로 호출한 쪽에서 busy 프레임을 보냅니다.
+        print(f"[WebSocket Processing] ⏳ 작업 대기열이 가득 차 거절: {video_id}")
+        raise
     except Exception as e:
         import traceback
 
@@ -146,21 +202,22 @@ async def process_youtube_url_with_websocket(
         error_message = f"{type(e).__name__}: {e}\n{error_traceback}"
         print(f"[WebSocket Processing] ❌ 작업 실패!, 오류: {error_message}")
 
-        if manager and connection_id:
-            await manager.send_progress(
-                connection_id,
+        if subscriber:
+            await subscriber(
                 {
                     "status": "error",
                     "message": f"there is error!: {str(e)}",
                     "progress": 0,
-                },
+                }
             )
         raise
 
 
-async def process_youtube_url(url: str, user_id: int | None = None):
+async def process_youtube_url(url: str, user_id: int | None = None, subscriber=None):
     """
     YouTube URL을 받아 비동기적으로 영상 정보를 추출하고, 위치 정보를 분석하여 DB에 저장합니다.
+    같은 영상에 대한 동시 요청은 하나의 추출 작업을 공유합니다.
+    작업 큐(app.services.jobs)의 워커가 호출하며, subscriber가 있으면 진행 상황을 전달합니다.
     """
     print(f"[Processing] 🚀 작업 시작! (URL: {url}, User ID: {user_id})")
 
@@ -173,20 +230,12 @@ async def process_youtube_url(url: str, user_id: int | None = None):
         return {"status": "Failure", "message": "Invalid YouTube URL"}
 
     try:
-        # The ExtractorService might need to be refactored if it uses the task instance.
-        # Looking at its previous usage, it was passed `self`. Let's assume
-        # it was used for updating state, and now can be instantiated without it.
-        extractor_service = ExtractorService()  # Refactored: removed task instance
-        transcript, locations, title, thumbnail_url = (
-            await extractor_service.extract_data_from_youtube(url)
-        )
-
-        async with AsyncSessionLocal() as db:
-            saved_places = await save_extracted_data(
-                db, video_id, url, transcript, locations, title, thumbnail_url
-            )
+        extracted, shared = await _run_extraction(url, video_id, subscriber)
+        if shared:
+            print(f"[Processing] 🔗 진행 중인 작업 결과를 공유합니다: {video_id}")
 
-            if user_id:
+        if user_id:
+            async with AsyncSessionLocal() as db:
                 print(
                     f"[Processing] 📝 사용자 기록 저장 시도: user_id={user_id}, video_id={video_id}"
                 )
@@ -196,10 +245,8 @@ async def process_youtube_url(url: str, user_id: int | None = None):
         return {
             "status": "Completed",
             "source_url": url,
-            "title": title,
-            "places": [
-                {"name": p.name, "lat": p.lat, "lng": p.lng} for p in saved_places
-            ],
+            "title": extracted["title"],
+            "places": list(extracted["places"]),
         }
 
     except Exception as e:
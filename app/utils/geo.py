@@ -0,0 +1,122 @@
+import math
+
+EARTH_RADIUS_M = 6_371_000
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    두 위경도 좌표 사이의 대원 거리(미터)를 계산합니다.
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+# geohash 기본 문자 집합 (a, i, l, o 제외)
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Places.geohash에 저장하는 정밀도 (9자리: 약 4.8m x 4.8m)
+GEOHASH_PRECISION = 9
+# 영역 검색 시 하나의 질의에 사용할 최대 geohash 셀 수
+GEOHASH_MAX_CELLS = 32
+
+
+def geohash_encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    위경도 좌표를 geohash 문자열로 변환합니다.
+    같은 접두사를 가진 geohash는 같은 격자 셀 안에 있으므로 B-tree 인덱스로 범위 검색할 수 있습니다.
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 번째 비트는 경도, 홀수 번째 비트는 위도
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> tuple[float, float]:
+    """정밀도별 geohash 셀 하나의 (위도 높이, 경도 너비)를 도 단위로 반환합니다."""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def geohash_prefix_upper_bound(prefix: str) -> str | None:
+    """
+    prefix로 시작하는 geohash 전체를 `prefix <= geohash < upper` 범위로 표현할 때의 upper를 반환합니다.
+    prefix가 모두 'z'이면 상한이 없으므로 None을 반환합니다.
+    """
+    chars = list(prefix)
+    while chars:
+        index = GEOHASH_BASE32.index(chars[-1])
+        if index + 1 < len(GEOHASH_BASE32):
+            chars[-1] = GEOHASH_BASE32[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def geohash_cover(
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    max_cells: int = GEOHASH_MAX_CELLS,
+) -> list[str]:
+    """
+    영역(bbox)을 덮는 geohash 접두사 목록을 반환합니다.
+    셀 수가 max_cells를 넘지 않는 가장 세밀한 정밀도를 고르므로, 영역이 작을수록 후보가 적어집니다.
+    날짜변경선을 넘는 영역은 지원하지 않습니다. (min_lng <= max_lng)
+    """
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    min_lng, max_lng = max(min_lng, -180.0), min(max_lng, 180.0)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lng = geohash_cell_size(precision)
+        rows = math.floor((max_lat + 90.0) / cell_lat) - math.floor((min_lat + 90.0) / cell_lat) + 1
+        cols = math.floor((max_lng + 180.0) / cell_lng) - math.floor((min_lng + 180.0) / cell_lng) + 1
+        if rows * cols <= max_cells or precision == 1:
+            break
+
+    cells = []
+    seen = set()
+    row_start = math.floor((min_lat + 90.0) / cell_lat)
+    col_start = math.floor((min_lng + 180.0) / cell_lng)
+    for row in range(row_start, row_start + rows):
+        for col in range(col_start, col_start + cols):
+            # 셀 중심 좌표로 해당 셀의 geohash를 구합니다.
+            center_lat = min(-90.0 + (row + 0.5) * cell_lat, 90.0)
+            center_lng = min(-180.0 + (col + 0.5) * cell_lng, 180.0)
+            cell = geohash_encode(center_lat, center_lng, precision)
+            if cell not in seen:
+                seen.add(cell)
+                cells.append(cell)
+    return cells
+
+
+def bbox_around(lat: float, lng: float, radius_m: float) -> tuple[float, float, float, float]:
+    """
+    중심 좌표에서 radius_m 안의 점을 모두 포함하는 영역 (min_lat, min_lng, max_lat, max_lng)을 반환합니다.
+    """
+    d_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = math.cos(math.radians(lat))
+    d_lng = 180.0 if cos_lat < 1e-12 else min(math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat)), 180.0)
+    return lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng
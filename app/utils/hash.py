@@ -1,6 +1,24 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt 비용(라운드) 설정. 값을 바꾸면 다음 로그인 시 기존 해시가 새 비용으로 다시 해싱됩니다.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# 비밀번호 해싱/검증에 사용할 스레드 수 (bcrypt는 실행 중 GIL을 해제합니다)
+BCRYPT_MAX_WORKERS = int(os.getenv("BCRYPT_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    # 저장된 해시의 비용이 설정과 다르면 needs_update로 표시되어 로그인 시 재해싱됩니다.
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# 이벤트 루프를 막지 않도록 bcrypt 연산을 실행하는 전용 스레드 풀
+_hash_executor = ThreadPoolExecutor(max_workers=BCRYPT_MAX_WORKERS, thread_name_prefix="bcrypt")
 
 def verify_password(plain_password, hashed_password):
     """
@@ -12,4 +30,33 @@ def get_password_hash(password):
     """
     주어진 비밀번호를 해싱합니다.
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+def verify_and_update(plain_password, hashed_password):
+    """
+    비밀번호를 검증하고, 해시의 비용이 현재 설정과 다르면 새 해시도 함께 반환합니다.
+    (일치 여부, 새 해시 또는 None)을 반환합니다.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def _run_in_executor(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, fn, *args)
+
+async def verify_password_async(plain_password, hashed_password):
+    """
+    verify_password를 전용 스레드 풀에서 실행합니다.
+    """
+    return await _run_in_executor(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """
+    get_password_hash를 전용 스레드 풀에서 실행합니다.
+    """
+    return await _run_in_executor(get_password_hash, password)
+
+async def verify_and_update_async(plain_password, hashed_password):
+    """
+    verify_and_update를 전용 스레드 풀에서 실행합니다.
+    """
+    return await _run_in_executor(verify_and_update, plain_password, hashed_password)
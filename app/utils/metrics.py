@@ -0,0 +1,264 @@
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+
+# 파이프라인 단계 지연 시간용 버킷(초). yt-dlp/STT/LLM처럼 수 초~수 분 걸리는 단계를 기준으로 잡았습니다.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    라벨 값 튜플별로 값을 보관하는 메트릭의 공통 부분입니다.
+    hot path에서의 부하를 줄이기 위해 라벨 값은 키워드가 아닌 위치 인자로 받습니다.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check(self, labelvalues: tuple):
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 값 개수가 맞지 않습니다. (필요: {self.labelnames})")
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """단조 증가하는 카운터입니다."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        self._check(labelvalues)
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def get(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """증가/감소할 수 있는 값입니다. (예: 진행 중인 작업 수)"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        self._check(labelvalues)
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, *labelvalues: str, value: float):
+        self._check(labelvalues)
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def get(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """
+    고정 버킷 히스토그램입니다.
+    관측 시에는 해당 버킷 하나만 증가시키고, 누적 값은 출력할 때 계산합니다.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 -> [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        self._check(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def get_count(self, *labelvalues: str) -> int:
+        state = self._values.get(labelvalues)
+        return state[2] if state else 0
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        for labelvalues, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}"
+                )
+            label_str = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class Registry:
+    """메트릭 목록을 보관하고 Prometheus 텍스트 형식으로 출력합니다."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+stage_duration_seconds = REGISTRY.register(
+    Histogram("pind_stage_duration_seconds", "Duration of extraction pipeline stages in seconds.", ["stage"])
+)
+stage_in_flight = REGISTRY.register(
+    Gauge("pind_stage_in_flight", "Number of extraction pipeline stages currently running.", ["stage"])
+)
+stage_errors_total = REGISTRY.register(
+    Counter("pind_stage_errors_total", "Number of failed extraction pipeline stages.", ["stage", "error"])
+)
+cache_requests_total = REGISTRY.register(
+    Counter("pind_cache_requests_total", "Cache lookups by cache name and result (hit/miss).", ["cache", "result"])
+)
+transcript_token_reduction_ratio = REGISTRY.register(
+    Histogram(
+        "pind_transcript_token_reduction_ratio",
+        "Fraction of estimated transcript tokens removed by preprocessing before the LLM.",
+        ["source"],
+        buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9),
+    )
+)
+
+
+class stage:
+    """
+    파이프라인 단계의 소요 시간, 진행 중 개수, 오류 수를 기록합니다.
+    동기/비동기 컨텍스트 매니저와 데코레이터로 모두 사용할 수 있습니다.
+
+        with stage("ytdlp_metadata"): ...
+        async with stage("gemini"): ...
+
+        @stage("db_save")
+        async def save(...): ...
+    """
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        stage_in_flight.inc(self.name)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stage_duration_seconds.observe(time.perf_counter() - self._start, self.name)
+        stage_in_flight.dec(self.name)
+        if exc_type is not None:
+            stage_errors_total.inc(self.name, exc_type.__name__)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def __call__(self, fn):
+        name = self.name
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+def record_cache(cache: str, hit: bool):
+    """캐시 적중/미스를 기록합니다."""
+    cache_requests_total.inc(cache, "hit" if hit else "miss")
@@ -0,0 +1,24 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, record_id: int) -> str:
+    """
+    (created_at, id) 키셋 위치를 URL에 안전한 불투명 커서 문자열로 인코딩합니다.
+    """
+    raw = f"{created_at.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    encode_cursor로 만든 커서를 (created_at, id)로 되돌립니다.
+    형식이 잘못되었으면 ValueError를 발생시킵니다.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, record_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(record_id)
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
@@ -0,0 +1,41 @@
+import os
+from cachetools import TTLCache
+
+# 토큰 검증 후 조회한 사용자(principal)를 보관하는 시간(초)과 최대 개수
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 300))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", 10000))
+
+
+class PrincipalCache:
+    """
+    검증된 액세스 토큰의 (sub, iat) -> Users 객체를 TTL/LRU로 캐시합니다.
+    같은 토큰으로 들어오는 요청마다 이메일로 사용자를 다시 조회하지 않도록 합니다.
+    비밀번호 변경/사용자 삭제 시 invalidate(email)로 해당 사용자의 항목을 모두 제거해야 합니다.
+    """
+
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_MAX_SIZE, ttl: int = PRINCIPAL_CACHE_TTL_SECONDS):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # email -> 해당 사용자의 캐시 키 집합 (무효화용 보조 인덱스)
+        self._keys_by_email: dict[str, set] = {}
+
+    def get(self, email: str, issued_at: int | None):
+        return self._cache.get((email, issued_at))
+
+    def set(self, email: str, issued_at: int | None, user):
+        key = (email, issued_at)
+        self._cache[key] = user
+        keys = self._keys_by_email.setdefault(email, set())
+        # 만료/제거된 키는 인덱스에서도 정리합니다.
+        keys.intersection_update(k for k in keys if k in self._cache)
+        keys.add(key)
+
+    def invalidate(self, email: str):
+        for key in self._keys_by_email.pop(email, set()):
+            self._cache.pop(key, None)
+
+    def clear(self):
+        self._cache.clear()
+        self._keys_by_email.clear()
+
+
+principal_cache = PrincipalCache()
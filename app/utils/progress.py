@@ -0,0 +1,97 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[dict], Awaitable[None]]
+
+# 단계별 진행률 구간(%). 단계 안의 진행률(0~1)을 이 구간에 맞춰 전체 진행률로 바꿉니다.
+# 자막이 있으면 audio_download/stt 단계는 건너뛰므로 captions 다음에 llm으로 바로 넘어갑니다.
+STAGE_RANGES = {
+    "metadata": (10, 20),
+    "captions": (20, 30),
+    "audio_download": (30, 45),
+    "stt": (45, 65),
+    "llm": (65, 90),
+    "save": (90, 99),
+}
+
+
+class ProgressReporter:
+    """
+    하나의 처리 작업에 대한 진행 상황 발행기입니다.
+    단계 이름과 단계 안의 진행률로 전체 진행률을 계산하며, 진행률이 뒤로 가지 않도록 합니다.
+    (메타데이터 조회와 자막 조회처럼 동시에 진행되는 단계가 있기 때문입니다.)
+    """
+
+    def __init__(self, publish: ProgressCallback):
+        self.publish = publish
+        self.progress = 0.0
+
+    async def stage(self, stage: str, fraction: float = 0.0, message: str | None = None, **extra):
+        low, high = STAGE_RANGES[stage]
+        fraction = min(max(fraction, 0.0), 1.0)
+        self.progress = max(self.progress, float(low + (high - low) * fraction))
+        await self._publish(
+            {
+                "status": "processing",
+                "stage": stage,
+                "message": message or stage,
+                "progress": round(self.progress, 1),
+                **extra,
+            }
+        )
+
+    async def places(self, places: list):
+        """LLM 청크 하나에서 추출된 장소를 최종 결과를 기다리지 않고 바로 전달합니다."""
+        if not places:
+            return
+        await self._publish(
+            {
+                "status": "partial",
+                "stage": "llm",
+                "progress": round(self.progress, 1),
+                "places": places,
+            }
+        )
+
+    async def _publish(self, data: dict):
+        # 진행 상황 전달 실패가 처리 자체를 멈추지 않도록 합니다.
+        try:
+            await self.publish(data)
+        except Exception as e:
+            logger.warning(f"진행 상황 발행 실패: {e}")
+
+
+_current_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar("progress_reporter", default=None)
+
+
+@contextmanager
+def use_reporter(publish: ProgressCallback):
+    """
+    현재 컨텍스트(와 그 안에서 만든 Task)에서 report()가 publish로 전달되도록 설정합니다.
+    """
+    token = _current_reporter.set(ProgressReporter(publish))
+    try:
+        yield
+    finally:
+        _current_reporter.reset(token)
+
+
+async def report(stage: str, fraction: float = 0.0, message: str | None = None, **extra):
+    """
+    현재 작업의 진행 상황을 발행합니다. 발행기가 설정되지 않은 컨텍스트에서는 아무것도 하지 않습니다.
+    크롤러, STT, LLM, 저장 단계처럼 웹소켓을 모르는 코드에서 호출합니다.
+    """
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        await reporter.stage(stage, fraction, message, **extra)
+
+
+async def report_places(places: list):
+    """현재 작업에서 부분적으로 추출된 장소 목록을 발행합니다."""
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        await reporter.places(places)
@@ -0,0 +1,58 @@
+import orjson
+from fastapi import Response
+
+# UTC datetime은 Pydantic 기본 출력과 같이 "Z" 접미사로 직렬화합니다.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data) -> bytes:
+    """orjson으로 직렬화합니다. (비 ASCII 문자는 이스케이프하지 않습니다)"""
+    return orjson.dumps(data, option=ORJSON_OPTIONS)
+
+
+def dumps_text(data) -> str:
+    """WebSocket 텍스트 프레임용으로 직렬화합니다."""
+    return orjson.dumps(data, option=ORJSON_OPTIONS).decode("utf-8")
+
+
+def json_response(data, status_code: int = 200, headers: dict | None = None) -> Response:
+    """
+    이미 만들어 둔 dict/list를 그대로 JSON 응답으로 반환합니다.
+    Response를 직접 반환하므로 FastAPI의 response_model 재검증을 거치지 않습니다.
+    """
+    return Response(content=dumps(data), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def place_to_dict(place, start_seconds: float | None = None) -> dict:
+    """
+    Places ORM 객체를 응답용 dict로 변환합니다. (schemas.Place와 같은 필드)
+    start_seconds는 영상에서 장소가 처음 언급된 시각(초)으로, 클라이언트가 바로 해당 위치로 이동할 수 있습니다.
+    """
+    return {"name": place.name, "lat": place.lat, "lng": place.lng, "start_seconds": start_seconds}
+
+
+def nearby_place_to_dict(place, distance_m: float) -> dict:
+    """(Places, 거리) 검색 결과를 schemas.places.NearbyPlace와 같은 모양의 dict로 변환합니다."""
+    return {
+        "place_id": place.place_id,
+        "name": place.name,
+        "lat": place.lat,
+        "lng": place.lng,
+        "distance_m": round(distance_m, 1),
+    }
+
+
+def history_to_dict(record, places: list | None = None) -> dict:
+    """
+    UserContentHistory ORM 객체(content 로드됨)와 그 콘텐츠의 [(Places, start_seconds)] 목록을
+    UserContentHistoryResponse와 같은 모양의 dict로 변환합니다.
+    """
+    content = record.content
+    return {
+        "id": content.content_id,
+        "title": content.title,
+        "created_at": record.created_at,
+        "thumbnail_url": content.thumbnail_url,
+        "youtube_url": content.youtube_url,
+        "places": [place_to_dict(place, start) for place, start in places or []],
+    }
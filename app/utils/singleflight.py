@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[dict], Awaitable[None]]
+
+
+class _Call:
+    """
+    진행 중인 하나의 작업(같은 키)에 대한 상태입니다.
+    - task: 실제 작업을 실행하는 asyncio.Task
+    - subscribers: 진행 상황을 전달받을 콜백 목록
+    """
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.subscribers: List[ProgressCallback] = []
+
+    async def publish(self, data: dict):
+        # 구독자 목록은 작업 도중에도 늘어날 수 있으므로 복사본을 순회합니다.
+        for callback in list(self.subscribers):
+            try:
+                await callback(data)
+            except Exception as e:
+                logger.warning(f"진행 상황 구독자 전송 실패: {e}")
+
+
+class SingleFlight:
+    """
+    같은 키(예: YouTube video_id)에 대한 동시 요청을 하나의 실행으로 합칩니다.
+    먼저 도착한 요청이 작업을 시작하고, 이후 요청들은 같은 결과를 기다립니다.
+    진행 상황은 작업에 붙은 모든 구독자에게 전달됩니다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[ProgressCallback], Awaitable[Any]],
+        subscriber: Optional[ProgressCallback] = None,
+    ) -> tuple[Any, bool]:
+        """
+        key에 대한 작업을 실행하거나, 이미 실행 중이면 그 결과를 기다립니다.
+        fn은 진행 상황 발행 함수(publish)를 인자로 받는 코루틴 함수입니다.
+        (결과, 공유 여부)를 반환합니다. 공유 여부가 True이면 다른 요청이 시작한 작업의 결과입니다.
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call()
+            self._calls[key] = call
+            # 작업을 별도 Task로 실행하여, 처음 요청한 쪽이 취소되어도 다른 대기자에게 영향이 없도록 합니다.
+            call.task = asyncio.create_task(fn(call.publish))
+            call.task.add_done_callback(lambda _t, k=key, c=call: self._forget(k, c))
+        return await self._wait(call, subscriber), shared
+
+    async def join(self, key: str, subscriber: Optional[ProgressCallback] = None) -> tuple[Any, bool]:
+        """
+        key에 대해 이미 실행 중인 작업이 있으면 새로 시작하지 않고 구독만 하여 결과를 기다립니다.
+        (결과, 합류 여부)를 반환하며, 실행 중인 작업이 없으면 (None, False)를 반환합니다.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            return None, False
+        return await self._wait(call, subscriber), True
+
+    async def _wait(self, call: _Call, subscriber: Optional[ProgressCallback]) -> Any:
+        if subscriber is not None:
+            call.subscribers.append(subscriber)
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            if subscriber is not None and subscriber in call.subscribers:
+                call.subscribers.remove(subscriber)
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
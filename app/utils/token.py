@@ -1,3 +1,4 @@
+import os
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from app.schemas.auth import TokenData
@@ -7,15 +8,18 @@ SECRET_KEY = "your-secret-key"  # This should be loaded from environment variabl
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 PASSWORD_RESET_TOKEN_EXPIRE_MINUTES = 15
+# True이면 액세스 토큰에 user_id(uid 클레임)를 넣어, 인증 시 DB 조회를 생략할 수 있게 합니다.
+EMBED_USER_ID_IN_TOKEN = os.getenv("AUTH_EMBED_USER_ID", "false").lower() in ("1", "true", "yes")
 
 def create_access_token(data: dict):
     """
     주어진 데이터를 사용하여 액세스 토큰을 생성합니다.
-    토큰에는 만료 시간(ACCESS_TOKEN_EXPIRE_MINUTES)이 포함됩니다.
+    토큰에는 발급 시간(iat)과 만료 시간(ACCESS_TOKEN_EXPIRE_MINUTES)이 포함됩니다.
     """
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": int(now.timestamp())})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -37,7 +41,7 @@ def verify_token(token: str, credentials_exception=None):
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, user_id=payload.get("uid"), issued_at=payload.get("iat"))
     except JWTError:
         raise credentials_exception
     return token_data
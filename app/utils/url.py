@@ -10,3 +10,20 @@ def extract_video_id(url: str) -> str | None:
         return parsed.path.lstrip("/")
     qs = parse_qs(parsed.query)
     return qs.get("v", [None])[0]
+
+
+def extract_playlist_id(url: str) -> str | None:
+    """
+    주어진 YouTube URL에서 재생목록 ID(list 파라미터)를 추출하여 반환합니다.
+    재생목록 ID가 없으면 None을 반환합니다.
+    """
+    qs = parse_qs(urlparse(url).query)
+    return qs.get("list", [None])[0]
+
+
+def canonical_video_url(video_id: str) -> str:
+    """
+    비디오 ID로 표준 형식의 YouTube URL(https://www.youtube.com/watch?v=...)을 만듭니다.
+    youtu.be 단축 URL 등 여러 형식의 입력을 같은 URL로 맞출 때 사용합니다.
+    """
+    return f"https://www.youtube.com/watch?v={video_id}"
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# 자막/음원/STT 중간 결과를 보관할 디렉토리
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", str(Path(__file__).resolve().parents[1] / ".cache" / "artifacts"))
+# 보관 용량 상한(바이트). 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다.
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", 2 * 1024 * 1024 * 1024))
+
+_VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+_TMP_DIR_NAME = ".tmp"
+
+
+class ArtifactStore:
+    """
+    영상별 처리 중간 결과를 디스크에 보관하는 저장소입니다.
+    - 경로: {root}/{video_id}/{name} (예: captions.json, audio.m4a, stt/whisper-1_600s/chunk_0003.json)
+    - 쓰기는 같은 파일시스템의 임시 파일에 쓴 뒤 os.replace로 교체하므로, 중간에 실패해도 깨진 파일이 남지 않고
+      같은 영상을 동시에 처리하는 작업끼리 파일 이름이 충돌하지 않습니다.
+    - 읽을 때 파일 수정 시각을 갱신하여, 용량 초과 시 오래 사용하지 않은 파일부터 지웁니다. (LRU)
+    - 용량은 처음 쓸 때 한 번만 디스크를 훑어 만든 목록(경로 -> 사용 시각, 크기)으로 추적하고,
+      이후에는 읽기/쓰기/정리 때 목록만 갱신합니다. (다른 프로세스가 쓴 파일은 읽을 때 목록에 추가됩니다)
+    - pin()으로 사용 중인 영상은 정리 대상에서 제외합니다.
+    - 모든 메서드는 블로킹 디스크 I/O이므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+    """
+
+    def __init__(self, root: str = ARTIFACT_DIR, max_bytes: int = ARTIFACT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pinned: dict[str, int] = {}
+        # 경로 -> (최근 사용 시각, 크기, video_id). None이면 아직 디스크를 훑지 않은 상태입니다.
+        self._index: dict[Path, tuple[float, int, str]] | None = None
+        self._total_bytes = 0
+        (self.root / _TMP_DIR_NAME).mkdir(parents=True, exist_ok=True)
+
+    def path(self, video_id: str, name: str) -> Path:
+        if not _VIDEO_ID_PATTERN.match(video_id):
+            raise ValueError(f"잘못된 video_id: {video_id}")
+        return self.root / video_id / name
+
+    # --- 읽기 ---
+
+    def get_file(self, video_id: str, name: str) -> Path | None:
+        """파일이 있으면 경로를 반환하고 최근 사용 시각을 갱신합니다."""
+        path = self.path(video_id, name)
+        try:
+            os.utime(path)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return None
+        self._record(video_id, path, size)
+        return path
+
+    def get_text(self, video_id: str, name: str) -> str | None:
+        path = self.get_file(video_id, name)
+        if path is None:
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:  # 다른 작업이 방금 정리한 경우
+            return None
+
+    def get_json(self, video_id: str, name: str):
+        text = self.get_text(video_id, name)
+        return None if text is None else json.loads(text)
+
+    # --- 쓰기 (임시 파일 + os.replace) ---
+
+    def put_text(self, video_id: str, name: str, text: str) -> Path:
+        path = self.path(video_id, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+        self._added(video_id, path, size)
+        return path
+
+    def put_json(self, video_id: str, name: str, value) -> Path:
+        return self.put_text(video_id, name, json.dumps(value, ensure_ascii=False))
+
+    def put_file(self, video_id: str, name: str, source: str) -> Path:
+        """
+        source 파일을 저장소로 옮깁니다. (workspace()에서 만든 파일이면 같은 파일시스템이므로 rename만 수행)
+        """
+        path = self.path(video_id, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.move(source, tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+        self._added(video_id, path, size)
+        return path
+
+    @contextmanager
+    def workspace(self, prefix: str = "job_"):
+        """저장소와 같은 파일시스템에 작업용 임시 디렉토리를 만들고, 끝나면(취소 포함) 지웁니다."""
+        work_dir = tempfile.mkdtemp(prefix=prefix, dir=self.root / _TMP_DIR_NAME)
+        try:
+            yield work_dir
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    # --- 용량 관리 ---
+
+    @contextmanager
+    def pin(self, video_id: str):
+        """사용 중인 영상의 파일이 정리되지 않도록 합니다."""
+        with self._lock:
+            self._pinned[video_id] = self._pinned.get(video_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pinned[video_id] -= 1
+                if not self._pinned[video_id]:
+                    del self._pinned[video_id]
+
+    def _files(self):
+        for video_dir in self.root.iterdir():
+            if not video_dir.is_dir() or video_dir.name == _TMP_DIR_NAME:
+                continue
+            for path in video_dir.rglob("*"):
+                if path.is_file() and not path.name.endswith(".tmp"):
+                    yield video_dir.name, path
+
+    def _load_index(self):
+        # self._lock을 잡은 상태에서 호출합니다. 프로세스에서 처음 한 번만 디스크를 훑습니다.
+        if self._index is not None:
+            return
+        index = {}
+        for video_id, path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            index[path] = (stat.st_mtime, stat.st_size, video_id)
+        self._index = index
+        self._total_bytes = sum(size for _, size, _ in index.values())
+
+    def _record(self, video_id: str, path: Path, size: int):
+        """파일을 방금 사용한 것으로 목록에 기록하고 전체 용량을 갱신합니다."""
+        with self._lock:
+            if self._index is None:
+                return  # 목록은 처음 쓸 때 디스크에서 만듭니다.
+            previous = self._index.get(path)
+            self._total_bytes += size - (previous[1] if previous else 0)
+            self._index[path] = (time.time(), size, video_id)
+
+    def _added(self, video_id: str, path: Path, size: int):
+        with self._lock:
+            self._load_index()
+        self._record(video_id, path, size)
+        with self._lock:
+            over_quota = self._total_bytes > self.max_bytes
+        if over_quota:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        전체 용량이 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 파일부터 지웁니다.
+        디스크를 다시 훑지 않고 목록만 정렬합니다. 지운 바이트 수를 반환합니다.
+        """
+        with self._lock:
+            self._load_index()
+            freed = 0
+            entries = sorted(self._index.items(), key=lambda item: item[1][0])
+            for path, (_, size, video_id) in entries:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                if video_id in self._pinned:
+                    continue
+                _remove_quietly(path)
+                del self._index[path]
+                self._total_bytes -= size
+                freed += size
+
+        if freed:
+            print(f"🧹 작업 파일 {freed / 1024 / 1024:.1f}MB를 정리했습니다.")
+        return freed
+
+
+class ChunkResultCache:
+    """
+    한 영상의 STT 청크별 결과([{"start", "duration", "text"}] 구간 목록) 캐시입니다.
+    variant(모델, 분할 길이)가 같을 때만 청크 번호가 같은 구간을 가리키므로 경로에 포함합니다.
+    전사 중 이벤트 루프에서 호출하므로 디스크 I/O는 스레드에서 실행합니다.
+    """
+
+    def __init__(self, store: ArtifactStore, video_id: str, variant: str):
+        self.store = store
+        self.video_id = video_id
+        self.variant = variant
+
+    def _name(self, index: int) -> str:
+        return f"stt/{self.variant}/chunk_{index:04d}.json"
+
+    async def get(self, index: int) -> list[dict] | None:
+        return await asyncio.to_thread(self.store.get_json, self.video_id, self._name(index))
+
+    async def put(self, index: int, segments: list[dict]):
+        await asyncio.to_thread(self.store.put_json, self.video_id, self._name(index), segments)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+_store: ArtifactStore | None = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """프로세스 전체에서 공유하는 저장소를 반환합니다."""
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+    return _store
@@ -0,0 +1,233 @@
+import asyncio
+import functools
+import glob
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+try:
+    import resource
+except ImportError:  # Windows에서는 CPU 시간 제한 없이 실행합니다.
+    resource = None
+
+# 음원 분할/재인코딩 작업을 실행할 프로세스 수
+MEDIA_MAX_WORKERS = int(os.getenv("MEDIA_MAX_WORKERS", 2))
+# 작업 하나(ffmpeg 프로세스)에 허용하는 CPU 시간(초). 넘기면 SIGXCPU로 종료됩니다.
+MEDIA_JOB_CPU_SECONDS = int(os.getenv("MEDIA_JOB_CPU_SECONDS", 300))
+# 작업 하나에 허용하는 실제 경과 시간(초)
+MEDIA_JOB_TIMEOUT_SECONDS = float(os.getenv("MEDIA_JOB_TIMEOUT_SECONDS", 900))
+# 작업 공간을 만들 디렉토리 (기본: 시스템 임시 디렉토리)
+MEDIA_WORK_DIR = os.getenv("MEDIA_WORK_DIR") or None
+
+_CANCEL_FLAG = ".cancel"
+_POLL_SECONDS = 0.2
+
+
+class MediaJobError(RuntimeError):
+    """ffmpeg 작업이 실패했거나 시간 제한을 넘긴 경우"""
+
+
+# --- 워커 프로세스에서 실행되는 함수들 (pickle 가능해야 하므로 모듈 최상위에 둡니다) ---
+
+
+def _limit_cpu(cpu_seconds: int):
+    # fork 직후 ffmpeg 프로세스에서 실행됩니다. 워커 프로세스 자신의 CPU 시간은 작업 간에 누적되므로 제한하지 않습니다.
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+
+
+def _run_ffmpeg(args: list[str], work_dir: str, cpu_seconds: int, timeout: float):
+    """
+    ffmpeg를 실행하고 끝날 때까지 기다립니다.
+    작업 공간에 취소 표시 파일이 생기거나 timeout을 넘기면 ffmpeg를 종료합니다.
+    """
+    cancel_flag = os.path.join(work_dir, _CANCEL_FLAG)
+    log_path = os.path.join(work_dir, "ffmpeg.log")
+    deadline = time.monotonic() + timeout
+    preexec_fn = functools.partial(_limit_cpu, cpu_seconds) if resource is not None else None
+
+    with open(log_path, "wb") as log_file:
+        process = subprocess.Popen(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin", "-y", *args],
+            stdout=subprocess.DEVNULL,
+            stderr=log_file,
+            preexec_fn=preexec_fn,
+        )
+        while True:
+            try:
+                process.wait(timeout=_POLL_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                if os.path.exists(cancel_flag):
+                    process.kill()
+                    process.wait()
+                    raise MediaJobError("작업이 취소되었습니다.")
+                if time.monotonic() > deadline:
+                    process.kill()
+                    process.wait()
+                    raise MediaJobError(f"ffmpeg 실행 시간 초과 ({timeout:.0f}초)")
+
+    if process.returncode != 0:
+        with open(log_path, encoding="utf-8", errors="ignore") as f:
+            message = f.read().strip()
+        if resource is not None and process.returncode == -signal.SIGXCPU:
+            message = f"CPU 시간 제한 초과 ({cpu_seconds}초)"
+        raise MediaJobError(f"ffmpeg 실패: {message}")
+
+
+def _segment_job(input_path: str, work_dir: str, segment_seconds: int, cpu_seconds: int, timeout: float) -> list[str]:
+    """
+    ffmpeg segment muxer로 음원을 segment_seconds 단위 파일로 나눕니다.
+    재인코딩 없이 스트림을 복사하므로 전체 음원을 PCM으로 디코딩해 메모리에 올리지 않습니다.
+    """
+    _, ext = os.path.splitext(input_path)
+    ext = ext or ".m4a"
+    pattern = os.path.join(work_dir, f"chunk_%04d{ext}")
+    _run_ffmpeg(
+        [
+            "-i", input_path,
+            "-vn",
+            "-f", "segment",
+            "-segment_time", str(segment_seconds),
+            "-reset_timestamps", "1",
+            "-c", "copy",
+            pattern,
+        ],
+        work_dir, cpu_seconds, timeout,
+    )
+    return sorted(glob.glob(os.path.join(work_dir, f"chunk_*{ext}")))
+
+
+def _resample_job(
+    input_path: str, output_path: str, work_dir: str, sample_rate: int, bitrate: str, cpu_seconds: int, timeout: float
+) -> str:
+    """음원을 모노, sample_rate, bitrate의 AAC(m4a)로 다시 인코딩합니다."""
+    _run_ffmpeg(
+        [
+            "-i", input_path,
+            "-vn",
+            "-ac", "1",
+            "-ar", str(sample_rate),
+            "-c:a", "aac",
+            "-b:a", bitrate,
+            output_path,
+        ],
+        work_dir, cpu_seconds, timeout,
+    )
+    return output_path
+
+
+# --- 이벤트 루프 쪽 ---
+
+
+class MediaJob:
+    """
+    작업 공간 하나를 공유하는 미디어 작업 묶음입니다. MediaWorker.job()으로 만듭니다.
+    결과 파일은 work_dir 안에 만들어지며, 블록을 벗어나면(취소 포함) 실행 중인 ffmpeg를 멈추고 work_dir를 지웁니다.
+    """
+
+    def __init__(self, worker: "MediaWorker", work_dir: str):
+        self.worker = worker
+        self.work_dir = work_dir
+        self._futures: set[Future] = set()
+
+    async def _submit(self, fn, *args):
+        future = self.worker.executor().submit(
+            fn, *args, self.worker.cpu_seconds, self.worker.timeout
+        )
+        self._futures.add(future)
+        # 취소되면 대기 중인 작업은 큐에서 빠지고, 실행 중인 작업은 close()에서 멈춥니다.
+        return await asyncio.wrap_future(future)
+
+    async def segment(self, input_path: str, segment_seconds: int) -> list[str]:
+        """음원을 segment_seconds 단위로 나누고 나뉜 파일 경로를 순서대로 반환합니다."""
+        return await self._submit(_segment_job, input_path, self.work_dir, segment_seconds)
+
+    async def resample(self, input_path: str, sample_rate: int = 16000, bitrate: str = "32k") -> str:
+        """음원을 작은 모노 m4a로 다시 인코딩한 파일 경로를 반환합니다. (Whisper 업로드 크기 줄이기)"""
+        name, _ = os.path.splitext(os.path.basename(input_path))
+        output_path = os.path.join(self.work_dir, f"{name}_{sample_rate}hz.m4a")
+        return await self._submit(_resample_job, input_path, output_path, self.work_dir, sample_rate, bitrate)
+
+    async def close(self):
+        running = [future for future in self._futures if not future.done()]
+        if not running:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            return
+
+        # 워커가 취소 표시를 보고 ffmpeg를 종료합니다. 작업이 모두 끝난 뒤에 작업 공간을 지웁니다.
+        open(os.path.join(self.work_dir, _CANCEL_FLAG), "w").close()
+        remaining = len(running)
+
+        def on_done(_future):
+            nonlocal remaining
+            remaining -= 1
+            if not remaining:
+                shutil.rmtree(self.work_dir, ignore_errors=True)
+
+        for future in running:
+            future.add_done_callback(on_done)
+        # 정리가 끝날 때까지 기다리되, 이 대기가 다시 취소되어도 콜백이 정리를 마칩니다.
+        await asyncio.shield(
+            asyncio.gather(*(asyncio.wrap_future(future) for future in running), return_exceptions=True)
+        )
+
+
+class MediaWorker:
+    """
+    CPU를 쓰는 음원 분할/재인코딩을 이벤트 루프 프로세스 밖(ProcessPoolExecutor)에서 실행합니다.
+    - 작업마다 별도 임시 디렉토리를 쓰므로 작업끼리, 그리고 현재 디렉토리와 파일이 섞이지 않습니다.
+    - ffmpeg 프로세스마다 CPU 시간 제한(RLIMIT_CPU)과 경과 시간 제한을 둡니다.
+    - 작업이 취소되면 실행 중인 ffmpeg를 멈추고 작업 공간을 지웁니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MEDIA_MAX_WORKERS,
+        cpu_seconds: int = MEDIA_JOB_CPU_SECONDS,
+        timeout: float = MEDIA_JOB_TIMEOUT_SECONDS,
+        work_dir: str | None = MEDIA_WORK_DIR,
+    ):
+        self.max_workers = max_workers
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self.work_dir = work_dir
+        self._executor: ProcessPoolExecutor | None = None
+
+    def executor(self) -> ProcessPoolExecutor:
+        # 처음 사용할 때 프로세스를 띄웁니다. (STT가 필요 없는 서버는 프로세스를 만들지 않습니다.)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    @asynccontextmanager
+    async def job(self, prefix: str = "media_", work_dir: str | None = None):
+        """작업 공간을 만들고 MediaJob을 반환합니다. 블록을 벗어나면 작업 공간을 지웁니다."""
+        parent = work_dir or self.work_dir
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        job = MediaJob(self, tempfile.mkdtemp(prefix=prefix, dir=parent))
+        try:
+            yield job
+        finally:
+            await job.close()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_worker: MediaWorker | None = None
+
+
+def get_media_worker() -> MediaWorker:
+    """프로세스 전체에서 공유하는 미디어 워커를 반환합니다."""
+    global _worker
+    if _worker is None:
+        _worker = MediaWorker()
+    return _worker
@@ -0,0 +1,126 @@
+import asyncio
+import os
+
+from openai import AsyncOpenAI
+
+from crawlers.media_worker import get_media_worker
+from nlp.segments import TranscriptSegments
+from app.utils.metrics import stage
+from app.utils.progress import report
+
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "whisper-1")
+WHISPER_API_LIMIT = 25 * 1024 * 1024
+# 분할 단위(초). AAC 128kbps 기준 10분이 약 10MB로 Whisper 업로드 제한보다 충분히 작습니다.
+STT_CHUNK_SECONDS = int(os.getenv("STT_CHUNK_SECONDS", 10 * 60))
+# 한 음원에 대해 동시에 전사할 청크 수
+STT_MAX_CONCURRENCY = int(os.getenv("STT_MAX_CONCURRENCY", 4))
+
+_client: AsyncOpenAI | None = None
+
+
+def get_client() -> AsyncOpenAI:
+    """프로세스 전체에서 공유하는 OpenAI 클라이언트를 반환합니다."""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI()
+    return _client
+
+
+def _segment_value(segment, name: str):
+    # SDK 버전에 따라 segment가 dict 또는 객체입니다.
+    return segment.get(name) if isinstance(segment, dict) else getattr(segment, name, None)
+
+
+async def transcribe_file(path: str, client: AsyncOpenAI | None = None) -> list[dict]:
+    """
+    음원 파일 하나를 Whisper API로 전사하고 [{"start", "duration", "text"}] 구간 목록(파일 기준 시각)을 반환합니다.
+    구간 시각을 주지 않는 모델이면 파일 전체를 한 구간으로 반환합니다.
+    """
+    client = client or get_client()
+    with open(path, "rb") as audio_file:
+        if WHISPER_MODEL.startswith("whisper"):
+            transcription = await client.audio.transcriptions.create(
+                model=WHISPER_MODEL, file=audio_file, response_format="verbose_json"
+            )
+        else:
+            transcription = await client.audio.transcriptions.create(
+                model=WHISPER_MODEL, file=audio_file
+            )
+
+    segments = getattr(transcription, "segments", None)
+    if not segments:
+        duration = getattr(transcription, "duration", None) or 0.0
+        return [{"start": 0.0, "duration": float(duration), "text": transcription.text}]
+    return [
+        {
+            "start": float(_segment_value(segment, "start")),
+            "duration": float(_segment_value(segment, "end")) - float(_segment_value(segment, "start")),
+            "text": _segment_value(segment, "text"),
+        }
+        for segment in segments
+    ]
+
+
+@stage("whisper")
+async def transcribe_audio(
+    input_path: str,
+    max_concurrency: int = STT_MAX_CONCURRENCY,
+    segment_seconds: int = STT_CHUNK_SECONDS,
+    chunk_cache=None,
+) -> TranscriptSegments:
+    """
+    음원 파일 전체를 전사하고 시간 정보가 있는 스크립트를 반환합니다.
+    업로드 제한(25MB)보다 크면 ffmpeg로 임시 디렉토리에 분할한 뒤,
+    청크들을 max_concurrency개씩 동시에 전사하고 원래 순서대로 이어 붙입니다.
+    청크 i의 구간 시각에는 i * segment_seconds를 더해 원래 음원 기준 시각으로 맞춥니다.
+    chunk_cache(코루틴 get(index)/put(index, segments))가 주어지면 청크별 결과를 저장하고,
+    재시도 시 이미 전사한 청크는 건너뛰고 빠진 청크부터 이어서 전사합니다.
+    """
+    client = get_client()
+    file_size = os.path.getsize(input_path)
+    await report("stt", 0.0, "transcribing audio ...")
+    if file_size < WHISPER_API_LIMIT:
+        print("➡️ 파일 크기가 작아 분할 없이 처리합니다.")
+        segments = await chunk_cache.get(0) if chunk_cache else None
+        if segments is None:
+            segments = await transcribe_file(input_path, client)
+            if chunk_cache:
+                await chunk_cache.put(0, segments)
+        await report("stt", 1.0, "audio transcribed")
+        return TranscriptSegments.from_dicts(segments)
+
+    print(
+        f"⚠️ 파일 크기({file_size / 1024 / 1024:.2f}MB)가 25MB를 초과하여 분할 처리를 시작합니다."
+    )
+    # 분할/재인코딩은 미디어 워커 프로세스에서 실행하고, 작업 공간은 블록을 벗어나면(취소 포함) 지워집니다.
+    async with get_media_worker().job(prefix="stt_") as job:
+        chunk_paths = await job.segment(input_path, segment_seconds)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        done = 0
+
+        async def transcribe_chunk(i: int, chunk_path: str) -> TranscriptSegments:
+            nonlocal done
+            segments = await chunk_cache.get(i) if chunk_cache else None
+            if segments is None:
+                if os.path.getsize(chunk_path) >= WHISPER_API_LIMIT:
+                    # 비트레이트가 높아 분할 후에도 업로드 제한을 넘으면 모노 16kHz로 줄입니다.
+                    chunk_path = await job.resample(chunk_path)
+                async with semaphore:
+                    print(f"➡️ {i + 1}/{len(chunk_paths)}번째 조각 처리 중...")
+                    segments = await transcribe_file(chunk_path, client)
+                if chunk_cache:
+                    await chunk_cache.put(i, segments)
+            done += 1
+            await report(
+                "stt",
+                done / len(chunk_paths),
+                f"transcribing audio {done}/{len(chunk_paths)}",
+                chunk=done,
+                chunks=len(chunk_paths),
+            )
+            return TranscriptSegments.from_dicts(segments, offset=i * segment_seconds)
+
+        parts = await asyncio.gather(
+            *(transcribe_chunk(i, path) for i, path in enumerate(chunk_paths))
+        )
+    return TranscriptSegments.concat(parts)
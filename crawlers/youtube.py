@@ -1,137 +1,321 @@
-import openai
+import asyncio
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from youtube_transcript_api import YouTubeTranscriptApi
-from pydub import AudioSegment
 import json  # <<< 추가
 
+from crawlers.artifacts import ChunkResultCache, get_artifact_store
+from crawlers.stt import STT_CHUNK_SECONDS, WHISPER_MODEL, transcribe_audio
+from nlp.segments import TranscriptSegments
+from app.utils.metrics import record_cache, stage
+from app.utils.progress import report
 
-def get_youtube_metadata(video_url: str) -> tuple[str | None, str | None]:
+try:
+    import yt_dlp
+except ImportError:  # 라이브러리가 없으면 yt-dlp CLI(subprocess)로 대체합니다.
+    yt_dlp = None
+
+# yt-dlp 실행 방식: "library"(기본, 프로세스 내 yt_dlp.YoutubeDL) | "subprocess"(yt-dlp CLI)
+YTDLP_BACKEND = os.getenv("YTDLP_BACKEND", "library").strip().lower()
+# 프로세스 내 yt-dlp 호출(메타데이터/다운로드)을 실행할 스레드 수
+YTDLP_MAX_WORKERS = int(os.getenv("YTDLP_MAX_WORKERS", 4))
+# 선호하는 자막 언어 (우선순위 순)
+CAPTION_LANGUAGES = [lang.strip() for lang in os.getenv("CAPTION_LANGUAGES", "ko,en").split(",") if lang.strip()]
+
+_ytdlp_executor = ThreadPoolExecutor(max_workers=YTDLP_MAX_WORKERS, thread_name_prefix="yt-dlp")
+
+
+def _video_id(video_url: str) -> str:
+    return video_url.split("v=")[1].split("&")[0]
+
+
+def _use_library() -> bool:
+    return YTDLP_BACKEND == "library" and yt_dlp is not None
+
+
+def _extract_info_library(video_url: str) -> dict:
+    """yt_dlp.YoutubeDL로 다운로드 없이 영상 정보(info dict)를 가져옵니다."""
+    options = {"quiet": True, "no_warnings": True, "skip_download": True, "noplaylist": True}
+    with yt_dlp.YoutubeDL(options) as ydl:
+        return ydl.extract_info(video_url, download=False)
+
+
+def _extract_info_subprocess(video_url: str) -> dict:
+    """yt-dlp CLI의 --dump-json으로 영상 정보(info dict)를 가져옵니다."""
+    result = subprocess.run(
+        ["yt-dlp", "--dump-json", video_url],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def extract_video_info(video_url: str) -> dict | None:
     """
-    유튜브 영상의 제목과 썸네일 URL을 추출합니다.
+    영상 정보(info dict)를 한 번 조회합니다.
+    프로세스 내 yt-dlp 라이브러리를 우선 사용하고, 실패하면 yt-dlp CLI로 대체합니다.
     """
-    video_id = video_url.split("v=")[1].split("&")[0]
-    title = None
-    thumbnail_url = None
+    print(f"➡️ '{_video_id(video_url)}' 영상의 메타데이터를 가져옵니다.")
+    if _use_library():
+        try:
+            with stage("ytdlp_metadata"):
+                return _extract_info_library(video_url)
+        except Exception as e:
+            print(f"⚠️ yt-dlp 라이브러리 메타데이터 조회 실패, CLI로 재시도합니다: {e}")
     try:
-        print(f"➡️ '{video_id}' 영상의 메타데이터를 가져옵니다.")
-        result = subprocess.run(
-            ["yt-dlp", "--dump-json", video_url],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        video_info = json.loads(result.stdout)
-        title = video_info.get("title")
-        thumbnail_url = video_info.get("thumbnail")
-        print(f"✅ 메타데이터 로드 성공: {title}")
+        with stage("ytdlp_metadata"):
+            return _extract_info_subprocess(video_url)
     except Exception as e:
         print(f"⚠️ 메타데이터 로드 실패: {e}")
-    return title, thumbnail_url
+        return None
+
+
+async def fetch_video_info(video_url: str) -> dict | None:
+    """extract_video_info를 yt-dlp 전용 스레드 풀에서 실행합니다."""
+    loop = asyncio.get_running_loop()
+    info = await loop.run_in_executor(_ytdlp_executor, extract_video_info, video_url)
+    await report("metadata", 1.0, "understanding video ...")
+    return info
+
 
-from openai import AsyncOpenAI # Added import
+def metadata_from_info(info: dict | None) -> tuple[str | None, str | None]:
+    """info dict에서 (제목, 썸네일 URL)을 꺼냅니다."""
+    if not info:
+        return None, None
+    title = info.get("title")
+    print(f"✅ 메타데이터 로드 성공: {title}")
+    return title, info.get("thumbnail")
 
-def get_youtube_metadata(video_url: str) -> tuple[str | None, str | None]:
+
+def _extract_playlist_library(playlist_url: str, limit: int | None) -> dict:
+    """yt_dlp.YoutubeDL의 extract_flat 모드로 재생목록 항목(영상 ID)만 가져옵니다."""
+    options = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "extract_flat": "in_playlist",
+    }
+    if limit:
+        options["playlistend"] = limit
+    with yt_dlp.YoutubeDL(options) as ydl:
+        return ydl.extract_info(playlist_url, download=False)
+
+
+def _extract_playlist_subprocess(playlist_url: str, limit: int | None) -> dict:
+    """yt-dlp CLI의 --flat-playlist --dump-single-json으로 재생목록 항목을 가져옵니다."""
+    command = ["yt-dlp", "--flat-playlist", "--dump-single-json"]
+    if limit:
+        command += ["--playlist-end", str(limit)]
+    result = subprocess.run(
+        command + [playlist_url],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def extract_playlist_video_ids(playlist_url: str, limit: int | None = None) -> list[str]:
     """
-    유튜브 영상의 제목과 썸네일 URL을 추출합니다.
+    재생목록(또는 채널 업로드 목록) URL에 포함된 영상 ID를 순서대로 반환합니다.
+    각 영상의 메타데이터는 조회하지 않으므로 항목 수가 많아도 요청 한 번으로 끝납니다.
     """
-    video_id = video_url.split("v=")[1].split("&")[0]
-    title = None
-    thumbnail_url = None
-    try:
-        print(f"➡️ '{video_id}' 영상의 메타데이터를 가져옵니다.")
-        result = subprocess.run(
-            ["yt-dlp", "--dump-json", video_url],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        video_info = json.loads(result.stdout)
-        title = video_info.get("title")
-        thumbnail_url = video_info.get("thumbnail")
-        print(f"✅ 메타데이터 로드 성공: {title}")
-    except Exception as e:
-        print(f"⚠️ 메타데이터 로드 실패: {e}")
-    return title, thumbnail_url
+    print(f"➡️ 재생목록 항목을 가져옵니다: {playlist_url}")
+    info = None
+    if _use_library():
+        try:
+            with stage("ytdlp_playlist"):
+                info = _extract_playlist_library(playlist_url, limit)
+        except Exception as e:
+            print(f"⚠️ yt-dlp 라이브러리 재생목록 조회 실패, CLI로 재시도합니다: {e}")
+    if info is None:
+        with stage("ytdlp_playlist"):
+            info = _extract_playlist_subprocess(playlist_url, limit)
+
+    video_ids = [entry["id"] for entry in info.get("entries") or [] if entry and entry.get("id")]
+    print(f"✅ 재생목록 항목 {len(video_ids)}개를 가져왔습니다.")
+    return video_ids[:limit] if limit else video_ids
+
+
+async def fetch_playlist_video_ids(playlist_url: str, limit: int | None = None) -> list[str]:
+    """extract_playlist_video_ids를 yt-dlp 전용 스레드 풀에서 실행합니다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ytdlp_executor, extract_playlist_video_ids, playlist_url, limit)
+
+
+def _language_code(language) -> str:
+    # translation_languages 항목은 라이브러리 버전에 따라 dict 또는 객체입니다.
+    code = language.get("language_code") if isinstance(language, dict) else language.language_code
+    return code.split("-")[0].lower()
+
 
-async def get_youtube_transcript_only(video_url: str) -> str | None: # Changed to async def
+def choose_caption_track(tracks, languages: list[str] = CAPTION_LANGUAGES):
     """
-    유튜브 영상에서 스크립트만 추출합니다. 자막이 없으면 STT를 시도합니다.
+    사용 가능한 자막 트랙 중 가장 좋은 것을 고릅니다. 고를 수 없으면 None을 반환합니다.
+    우선순위: 수동 자막(languages 순) -> 자동 생성 자막(languages 순) -> languages로 번역 가능한 자막(수동 우선)
+    (트랙, 번역할 언어 또는 None, 출처 라벨)을 반환합니다. 출처 예: "manual:ko", "generated:en", "translated:ja>ko"
     """
-    video_id = video_url.split("v=")[1].split("&")[0]
-    full_transcript = None
+    tracks = list(tracks)
+    for is_generated, kind in ((False, "manual"), (True, "generated")):
+        for language in languages:
+            for track in tracks:
+                if track.is_generated == is_generated and _language_code(track) == language:
+                    return track, None, f"{kind}:{language}"
+
+    for is_generated in (False, True):
+        for language in languages:
+            for track in tracks:
+                if track.is_generated != is_generated or not track.is_translatable:
+                    continue
+                if any(_language_code(target) == language for target in track.translation_languages):
+                    return track, language, f"translated:{_language_code(track)}>{language}"
+    return None
+
+
+def _fetch_caption_segments(video_id: str) -> tuple[list[dict], str] | None:
+    """
+    영상의 자막 목록을 한 번 조회하고, choose_caption_track으로 고른 자막을 (필요하면 번역하여) 가져옵니다.
+    (자막 구간 목록, 출처 라벨)을 반환하며, 쓸 수 있는 자막이 없으면 None을 반환합니다.
+    """
+    transcript_list = YouTubeTranscriptApi().list(video_id)
+    choice = choose_caption_track(transcript_list)
+    if choice is None:
+        return None
+    track, target_language, source = choice
+    if target_language:
+        track = track.translate(target_language)
+    fetched = track.fetch()
+    segments = fetched.to_raw_data() if hasattr(fetched, "to_raw_data") else list(fetched)
+    return segments, source
+
+
+def fetch_captions(video_id: str) -> tuple[TranscriptSegments | None, str | None]:
+    """
+    youtube-transcript-api로 자막을 시간 정보(구간별 시작/길이)와 함께 가져옵니다.
+    정확한 언어(ko/en)가 없어도 자동 생성 자막이나 번역 자막을 사용하여, 비싼 음원 다운로드 + STT를 최대한 피합니다.
+    (자막 구간, 출처 라벨)을 반환하며, 자막이 없으면 (None, None)을 반환합니다.
+    받아 온 자막 원본(JSON)은 작업 파일 저장소에 보관하여 재시도 시 다시 요청하지 않습니다.
+    """
+    store = get_artifact_store()
+    cached = store.get_json(video_id, "captions.json")
+    record_cache("captions_artifact", cached is not None)
+    if cached is not None:
+        print(f"✅ 저장된 자막을 재사용합니다: {video_id}")
+        return TranscriptSegments.from_dicts(cached["segments"]) or None, cached["source"]
 
     try:
         print(f"✅ 영상 ID '{video_id}'의 자막 추출을 시도합니다.")
-        transcript_list = YouTubeTranscriptApi.get_transcript(
-            video_id, languages=["ko", "en"]
-        )
-        full_transcript = " ".join([item["text"] for item in transcript_list])
-        print("✅ 'youtube-transcript-api'를 통해 자막을 성공적으로 가져왔습니다.")
-        return full_transcript
+        with stage("caption_fetch"):
+            result = _fetch_caption_segments(video_id)
+    except Exception as e:
+        print(f"⚠️ 자막을 찾을 수 없습니다 ({e}).")
+        return None, None
+    if result is None:
+        print("⚠️ 사용할 수 있는 자막(수동/자동 생성/번역)이 없습니다.")
+        return None, None
 
+    segments, source = result
+    print(f"✅ 'youtube-transcript-api'를 통해 자막을 성공적으로 가져왔습니다. (출처: {source})")
+
+    try:
+        store.put_json(video_id, "captions.json", {"source": source, "segments": segments})
     except Exception as e:
-        print(f"⚠️ 자막을 찾을 수 없습니다 ({e}). 음원 추출 및 STT를 시작합니다.")
+        print(f"⚠️ 자막 저장 실패: {e}")
+    return TranscriptSegments.from_dicts(segments) or None, source
+
+
+def _download_audio_library(video_url: str, output_base: str, info: dict | None) -> str:
+    """
+    yt_dlp.YoutubeDL로 음원을 m4a로 내려받습니다.
+    이미 조회한 info dict가 있으면 재사용하여 메타데이터를 다시 조회하지 않습니다.
+    """
+    options = {
+        "quiet": True,
+        "no_warnings": True,
+        "noplaylist": True,
+        "format": "bestaudio/best",
+        "outtmpl": f"{output_base}.%(ext)s",
+        "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "m4a"}],
+    }
+    with yt_dlp.YoutubeDL(options) as ydl:
+        if info:
+            ydl.process_ie_result(info, download=True)
+        else:
+            ydl.download([video_url])
+    return f"{output_base}.m4a"
+
+
+def _download_audio_subprocess(video_url: str, output_base: str) -> str:
+    output_filename = f"{output_base}.m4a"
+    subprocess.run(
+        [
+            "yt-dlp",
+            "-x",
+            "--audio-format",
+            "m4a",
+            "-o",
+            output_filename,
+            video_url,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return output_filename
+
+
+@stage("audio_download")
+def download_audio(video_url: str, output_base: str, info: dict | None = None) -> str:
+    """
+    음원을 `{output_base}.m4a`로 내려받고 파일 경로를 반환합니다.
+    프로세스 내 yt-dlp 라이브러리를 우선 사용하고, 실패하면 yt-dlp CLI로 대체합니다.
+    """
+    if _use_library():
         try:
-            output_filename = f"{video_id}_audio.m4a"
-            print(f"➡️ 'yt-dlp'로 음원을 다운로드합니다...")
-            subprocess.run(
-                [
-                    "yt-dlp",
-                    "-x",
-                    "--audio-format",
-                    "m4a",
-                    "-o",
-                    output_filename,
-                    video_url,
-                ],
-                check=True,
-                capture_output=True,
-            )
-            print("✅ 음원 다운로드 완료.")
-
-            file_size = os.path.getsize(output_filename)
-            WHISPER_API_LIMIT = 25 * 1024 * 1024
-
-            client = AsyncOpenAI() # Initialize AsyncOpenAI client
-
-            if file_size < WHISPER_API_LIMIT:
-                print("➡️ 파일 크기가 작아 분할 없이 처리합니다.")
-                with open(output_filename, "rb") as audio_file:
-                    transcription = await client.audio.transcriptions.create( # Added await
-                        model="whisper-1", file=audio_file
+            return _download_audio_library(video_url, output_base, info)
+        except Exception as e:
+            print(f"⚠️ yt-dlp 라이브러리 음원 다운로드 실패, CLI로 재시도합니다: {e}")
+    return _download_audio_subprocess(video_url, output_base)
+
+
+async def transcribe_from_audio(video_url: str, info: dict | None = None) -> TranscriptSegments | None:
+    """
+    음원을 내려받아 Whisper STT로 시간 정보가 있는 스크립트를 만듭니다. 실패하면(또는 전사 결과가 비면) None을 반환합니다.
+    음원과 청크별 STT 결과는 작업 파일 저장소에 보관하므로, 재시도하면 다시 내려받지 않고
+    아직 전사하지 않은 청크부터 이어서 처리합니다.
+    """
+    video_id = _video_id(video_url)
+    store = get_artifact_store()
+    chunk_cache = ChunkResultCache(store, video_id, f"{WHISPER_MODEL}_{STT_CHUNK_SECONDS}s")
+    try:
+        with store.pin(video_id):
+            # 저장소의 디스크 I/O(파일 이동 포함)는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+            audio_path = await asyncio.to_thread(store.get_file, video_id, "audio.m4a")
+            record_cache("audio_artifact", audio_path is not None)
+            if audio_path is None:
+                print(f"➡️ 'yt-dlp'로 음원을 다운로드합니다...")
+                await report("audio_download", 0.0, "downloading audio ...")
+                loop = asyncio.get_running_loop()
+                # 작업별 임시 디렉토리에 받은 뒤 저장소로 옮기므로, 같은 영상을 동시에 받아도 파일이 충돌하지 않습니다.
+                with store.workspace(prefix=f"{video_id}_") as work_dir:
+                    downloaded = await loop.run_in_executor(
+                        _ytdlp_executor, download_audio, video_url, os.path.join(work_dir, "audio"), info
                     )
-                full_transcript = transcription.text
+                    audio_path = await asyncio.to_thread(store.put_file, video_id, "audio.m4a", downloaded)
+                print("✅ 음원 다운로드 완료.")
             else:
-                print(
-                    f"⚠️ 파일 크기({file_size / 1024 / 1024:.2f}MB)가 25MB를 초과하여 분할 처리를 시작합니다."
-                )
-                audio = AudioSegment.from_file(output_filename)
-                chunk_length_ms = 10 * 60 * 1000
-                chunks = [
-                    audio[i : i + chunk_length_ms]
-                    for i in range(0, len(audio), chunk_length_ms)
-                ]
-
-                full_transcript = ""
-                for i, chunk in enumerate(chunks):
-                    chunk_filename = f"temp_chunk_{i}.m4a"
-                    print(f"➡️ {i+1}/{len(chunks)}번째 조각 처리 중...")
-                    chunk.export(chunk_filename, format="mp4")
-                    with open(chunk_filename, "rb") as chunk_file:
-                        transcription = await client.audio.transcriptions.create( # Added await
-                            model="whisper-1", file=chunk_file
-                        )
-                        full_transcript += transcription.text + " "
-                    os.remove(chunk_filename)
-
-            os.remove(output_filename)
-            print("✅ Whisper STT 변환 완료.")
-            return full_transcript
-
-        except Exception as e_process:
-            print(f"❌ 음원 처리 중 오류 발생: {e_process}")
-            return None
+                print(f"✅ 저장된 음원을 재사용합니다: {video_id}")
+            await report("audio_download", 1.0, "audio downloaded")
+
+            segments = await transcribe_audio(str(audio_path), chunk_cache=chunk_cache)
+        print("✅ Whisper STT 변환 완료.")
+        return segments or None
+
+    except Exception as e_process:
+        print(f"❌ 음원 처리 중 오류 발생: {e_process}")
+        return None
+
 
 # 기존 get_transcript_from_youtube 함수는 이제 사용되지 않으므로 제거하거나 주석 처리합니다.
 # 테스트 코드 (필요시 주석 해제 후 사용)
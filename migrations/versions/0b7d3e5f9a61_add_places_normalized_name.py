@@ -0,0 +1,69 @@
+"""add normalized_name column and index to places
+
+Revision ID: 0b7d3e5f9a61
+Revises: f3a8c1d94b27
+Create Date: 2026-10-18 16:05:31.774120
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7d3e5f9a61'
+down_revision: Union[str, Sequence[str], None] = 'f3a8c1d94b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+# 마이그레이션은 작성 시점의 동작으로 고정해야 하므로 nlp.chunking을 가져오지 않고 복사해 둡니다.
+def normalize_name(name: str) -> str:
+    name = unicodedata.normalize("NFKC", name).casefold()
+    return re.sub(r"[\W_]+", "", name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('places', sa.Column('normalized_name', sa.String(), nullable=True))
+    op.create_index(op.f('ix_places_normalized_name'), 'places', ['normalized_name'], unique=False)
+
+    # 기존 장소의 normalized_name을 채웁니다.
+    bind = op.get_bind()
+    places = sa.table(
+        'places',
+        sa.column('place_id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('normalized_name', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(places.c.place_id, places.c.name)
+            .where(places.c.place_id > last_id)
+            .order_by(places.c.place_id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            places.update()
+            .where(places.c.place_id == sa.bindparam('b_place_id'))
+            .values(normalized_name=sa.bindparam('b_normalized_name')),
+            [
+                {'b_place_id': row.place_id, 'b_normalized_name': normalize_name(row.name)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].place_id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_places_normalized_name'), table_name='places')
+    op.drop_column('places', 'normalized_name')
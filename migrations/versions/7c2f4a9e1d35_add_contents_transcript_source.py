@@ -0,0 +1,28 @@
+"""add transcript_source column to contents
+
+Revision ID: 7c2f4a9e1d35
+Revises: 0b7d3e5f9a61
+Create Date: 2026-10-18 17:21:09.418263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f4a9e1d35'
+down_revision: Union[str, Sequence[str], None] = '0b7d3e5f9a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contents', sa.Column('transcript_source', sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contents', 'transcript_source')
@@ -0,0 +1,30 @@
+"""add transcript segments to contents and start_seconds to content_places
+
+Revision ID: a4e9d2b6c813
+Revises: 7c2f4a9e1d35
+Create Date: 2026-10-18 18:02:47.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e9d2b6c813'
+down_revision: Union[str, Sequence[str], None] = '7c2f4a9e1d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contents', sa.Column('segments', sa.LargeBinary(), nullable=True))
+    op.add_column('content_places', sa.Column('start_seconds', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('content_places', 'start_seconds')
+    op.drop_column('contents', 'segments')
@@ -0,0 +1,37 @@
+"""add llm_cache table
+
+Revision ID: c5e1a7d2f903
+Revises: a3aafd2b327a
+Create Date: 2026-10-18 10:12:31.402115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1a7d2f903'
+down_revision: Union[str, Sequence[str], None] = 'a3aafd2b327a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'llm_cache',
+        sa.Column('cache_key', sa.String(length=255), nullable=False),
+        sa.Column('value', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('accessed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('cache_key'),
+    )
+    op.create_index(op.f('ix_llm_cache_accessed_at'), 'llm_cache', ['accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_llm_cache_accessed_at'), table_name='llm_cache')
+    op.drop_table('llm_cache')
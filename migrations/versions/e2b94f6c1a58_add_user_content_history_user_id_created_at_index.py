@@ -0,0 +1,33 @@
+"""add (user_id, created_at desc) index to user_content_history
+
+Revision ID: e2b94f6c1a58
+Revises: c5e1a7d2f903
+Create Date: 2026-10-18 13:40:02.518734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b94f6c1a58'
+down_revision: Union[str, Sequence[str], None] = 'c5e1a7d2f903'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_user_content_history_user_id_created_at',
+        'user_content_history',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_content_history_user_id_created_at', table_name='user_content_history')
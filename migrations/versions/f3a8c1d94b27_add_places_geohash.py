@@ -0,0 +1,95 @@
+"""add geohash column and index to places
+
+Revision ID: f3a8c1d94b27
+Revises: e2b94f6c1a58
+Create Date: 2026-10-18 15:12:44.209318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c1d94b27'
+down_revision: Union[str, Sequence[str], None] = 'e2b94f6c1a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# 마이그레이션은 작성 시점의 동작으로 고정해야 하므로 app.utils.geo를 가져오지 않고 복사해 둡니다.
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+
+
+def geohash_encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 번째 비트는 경도, 홀수 번째 비트는 위도
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('places', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index(op.f('ix_places_geohash'), 'places', ['geohash'], unique=False)
+
+    # 기존 장소의 geohash를 채웁니다.
+    bind = op.get_bind()
+    places = sa.table(
+        'places',
+        sa.column('place_id', sa.Integer),
+        sa.column('lat', sa.Float),
+        sa.column('lng', sa.Float),
+        sa.column('geohash', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(places.c.place_id, places.c.lat, places.c.lng)
+            .where(
+                places.c.place_id > last_id,
+                places.c.lat.is_not(None),
+                places.c.lng.is_not(None),
+            )
+            .order_by(places.c.place_id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            places.update()
+            .where(places.c.place_id == sa.bindparam('b_place_id'))
+            .values(geohash=sa.bindparam('b_geohash')),
+            [
+                {'b_place_id': row.place_id, 'b_geohash': geohash_encode(row.lat, row.lng, GEOHASH_PRECISION)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].place_id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_places_geohash'), table_name='places')
+    op.drop_column('places', 'geohash')
@@ -28,6 +28,8 @@ class Contents(Base):
     - content_id: 콘텐츠 고유 ID (기본 키, 예: YouTube video ID)
     - content_type: 콘텐츠 유형 (예: 'youtube')
     - transcript: 콘텐츠의 텍스트 스크립트
+    - transcript_source: 스크립트 출처 (예: 'manual:ko', 'generated:en', 'translated:ja>ko', 'stt')
+    - segments: 시간 정보가 있는 스크립트 구간 (nlp.segments.TranscriptSegments.pack() 형식의 압축 바이너리)
     - processed_at: 콘텐츠 처리 시간
     - places: 이 콘텐츠와 연결된 장소들 (ContentPlaces를 통한 관계)
     - title: 콘텐츠 제목
@@ -39,6 +41,8 @@ class Contents(Base):
     content_id = Column(String(255), primary_key=True)
     content_type = Column(String(50), nullable=False)
     transcript = Column(Text)
+    transcript_source = Column(String(50), nullable=True)
+    segments = Column(LargeBinary, nullable=True)
     processed_at = Column(
         DateTime(timezone=True),
         default=datetime.datetime.now(datetime.UTC),
@@ -61,6 +65,8 @@ class Places(Base):
     - name: 장소 이름
     - lat: 장소의 위도
     - lng: 장소의 경도
+    - geohash: 위경도의 geohash (B-tree 인덱스, 접두사 범위로 주변/영역 검색)
+    - normalized_name: 비교용으로 정규화한 이름 (중복 장소 판별용 인덱스)
     - contents: 이 장소와 연결된 콘텐츠들 (ContentPlaces를 통한 관계)
     - __table_args__: 이름, 위도, 경도의 조합은 고유해야 합니다.
     """
@@ -70,6 +76,8 @@ class Places(Base):
     name = Column(String, nullable=False)
     lat = Column(Float)
     lng = Column(Float)
+    geohash = Column(String(12), nullable=True, index=True)
+    normalized_name = Column(String, nullable=True, index=True)
 
     # Relationship to Contents
     contents = relationship(
@@ -89,6 +97,7 @@ class ContentPlaces(Base):
     - id: 고유 ID (기본 키)
     - content_id: Contents 테이블의 content_id를 참조하는 외래 키
     - place_id: Places 테이블의 place_id를 참조하는 외래 키
+    - start_seconds: 영상에서 장소가 처음 언급된 시각(초). 시간 정보가 없던 콘텐츠는 NULL
     - UniqueConstraint: content_id와 place_id의 조합은 고유해야 합니다.
     """
 
@@ -96,6 +105,7 @@ class ContentPlaces(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     content_id = Column(String(255), ForeignKey("contents.content_id"))
     place_id = Column(Integer, ForeignKey("places.place_id"))
+    start_seconds = Column(Float, nullable=True)
     __table_args__ = (UniqueConstraint("content_id", "place_id"),)
 
 
@@ -107,6 +117,7 @@ class UserContentHistory(Base):
     - content_id: Contents 테이블의 content_id를 참조하는 외래 키
     - created_at: 기록 생성 시간
     - UniqueConstraint: user_id와 content_id의 조합은 고유해야 합니다.
+    - Index: (user_id, created_at DESC) 기록 페이지 조회용 복합 인덱스
     """
 
     __tablename__ = "user_content_history"
@@ -118,8 +129,28 @@ class UserContentHistory(Base):
         server_default=func.now(),        # DB가 직접 현재시간(UTC) 채움
         nullable=False,
     )
-    __table_args__ = (UniqueConstraint("user_id", "content_id"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "content_id"),
+        # 사용자별 최신순 키셋 페이지네이션용 인덱스
+        Index("ix_user_content_history_user_id_created_at", user_id, created_at.desc()),
+    )
 
     # <<< 추가: 쿼리 최적화를 위해 relationship을 추가합니다.
     content = relationship("Contents")
     user = relationship("Users")
+
+
+class LLMCache(Base):
+    """
+    LLM 장소 추출 결과 캐시를 저장하는 데이터베이스 모델입니다. (LLM_CACHE_BACKEND=postgres)
+    - cache_key: (스크립트 해시, 프롬프트 해시, 모델 이름)으로 만든 키 (기본 키)
+    - value: 추출 결과 JSON 문자열
+    - created_at: 저장 시간 (TTL 계산 기준)
+    - accessed_at: 마지막 조회 시간 (LRU 제거 기준)
+    """
+
+    __tablename__ = "llm_cache"
+    cache_key = Column(String(255), primary_key=True)
+    value = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    accessed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
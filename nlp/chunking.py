@@ -0,0 +1,126 @@
+import os
+import re
+import unicodedata
+
+from app.utils.geo import haversine_m
+
+# 토큰 수 추정치: 한국어/영어가 섞인 스크립트 기준으로 보수적으로 잡은 값입니다.
+CHARS_PER_TOKEN = float(os.getenv("GEMINI_CHARS_PER_TOKEN", 2.0))
+# 이 토큰 수를 넘는 스크립트는 청크로 나누어 처리합니다.
+CHUNK_MAX_TOKENS = int(os.getenv("GEMINI_CHUNK_MAX_TOKENS", 6000))
+# 청크 경계에 걸친 장소 이름을 놓치지 않도록 앞 청크와 겹치는 토큰 수
+CHUNK_OVERLAP_TOKENS = int(os.getenv("GEMINI_CHUNK_OVERLAP_TOKENS", 300))
+# 이름이 같은 장소를 같은 곳으로 볼 최대 거리(미터)
+MERGE_DISTANCE_M = float(os.getenv("GEMINI_MERGE_DISTANCE_M", 300))
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def split_transcript_spans(
+    transcript: str,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> list[tuple[int, int]]:
+    """
+    split_transcript와 같은 기준으로 나눈 청크들의 (시작, 끝) 문자 위치를 반환합니다.
+    위치는 공백을 하나로 정리한 스크립트(" ".join(transcript.split())) 기준입니다.
+    (TranscriptSegments.text는 이미 이 형태이므로 위치를 그대로 영상 시각으로 되돌릴 수 있습니다.)
+    """
+    words = transcript.split()
+    if estimate_tokens(transcript) <= max_tokens:
+        return [(0, len(" ".join(words)))]
+
+    max_chars = int(max_tokens * CHARS_PER_TOKEN)
+    overlap_chars = int(overlap_tokens * CHARS_PER_TOKEN)
+    # 각 단어의 시작 문자 위치
+    positions = []
+    position = 0
+    for word in words:
+        positions.append(position)
+        position += len(word) + 1
+
+    spans = []
+    start = 0
+    while start < len(words):
+        end = start
+        length = 0
+        while end < len(words) and (length + len(words[end]) + 1 <= max_chars or end == start):
+            length += len(words[end]) + 1
+            end += 1
+        spans.append((positions[start], positions[end - 1] + len(words[end - 1])))
+        if end >= len(words):
+            break
+
+        # 다음 청크는 overlap_chars만큼 앞에서 시작합니다. (최소 한 단어는 전진)
+        back = end
+        back_length = 0
+        while back > start + 1 and back_length + len(words[back - 1]) + 1 <= overlap_chars:
+            back -= 1
+            back_length += len(words[back]) + 1
+        start = back
+    return spans
+
+
+def split_transcript(
+    transcript: str,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> list[str]:
+    """
+    스크립트를 토큰 수 기준으로 겹치는 윈도우들로 나눕니다.
+    단어 중간에서 자르지 않도록 공백 단위로 나누며, 짧은 스크립트는 그대로 하나의 청크로 반환합니다.
+    """
+    if estimate_tokens(transcript) <= max_tokens:
+        return [transcript]
+    normalized = " ".join(transcript.split())
+    return [normalized[start:end] for start, end in split_transcript_spans(transcript, max_tokens, overlap_tokens)]
+
+
+def normalize_name(name: str) -> str:
+    """
+    장소 이름 비교용 키를 만듭니다. (유니코드 정규화, 대소문자 무시, 공백/구두점 제거)
+    """
+    name = unicodedata.normalize("NFKC", name).casefold()
+    return re.sub(r"[\W_]+", "", name)
+
+
+def _has_coords(loc: dict) -> bool:
+    return loc.get("lat") is not None and loc.get("lng") is not None
+
+
+def merge_locations(partials: list[list], distance_m: float = MERGE_DISTANCE_M) -> list[dict]:
+    """
+    청크별로 추출된 장소 목록들을 하나로 합치고 중복을 제거합니다.
+    정규화한 이름이 같고 좌표가 distance_m 이내(또는 한쪽 좌표가 없음)이면 같은 장소로 보고,
+    좌표가 있는 항목을 우선 남깁니다. 처음 등장한 순서를 유지하며, 영상 시각(start_seconds)은 가장 이른 값을 남깁니다.
+    """
+    merged: list[dict] = []
+    by_name: dict[str, list[int]] = {}
+
+    for locations in partials:
+        for loc in locations or []:
+            if not isinstance(loc, dict) or not loc.get("name"):
+                continue
+            key = normalize_name(loc["name"])
+            match = None
+            for idx in by_name.get(key, []):
+                existing = merged[idx]
+                if not _has_coords(existing) or not _has_coords(loc):
+                    match = idx
+                    break
+                if haversine_m(existing["lat"], existing["lng"], loc["lat"], loc["lng"]) <= distance_m:
+                    match = idx
+                    break
+
+            if match is None:
+                by_name.setdefault(key, []).append(len(merged))
+                merged.append(dict(loc))
+                continue
+            if not _has_coords(merged[match]) and _has_coords(loc):
+                merged[match] = {**merged[match], "lat": loc["lat"], "lng": loc["lng"]}
+            start = loc.get("start_seconds")
+            if start is not None and (merged[match].get("start_seconds") is None or start < merged[match]["start_seconds"]):
+                merged[match] = {**merged[match], "start_seconds": start}
+    return merged
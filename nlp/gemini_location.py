@@ -1,7 +1,95 @@
+import asyncio
 import json
 import os
+import random
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+
+from app.utils.metrics import stage
+from app.utils.progress import report, report_places
+from nlp.chunking import merge_locations, split_transcript_spans
+from nlp.llm_cache import get_llm_cache, make_cache_key
+from nlp.segments import TranscriptSegments
+
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash")
+# 프로세스 전체에서 동시에 진행할 수 있는 Gemini 호출 수
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 4))
+# 호출 1회당 타임아웃(초)과 재시도 설정
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", 120))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 3))
+GEMINI_BACKOFF_BASE_SECONDS = float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", 1.0))
+GEMINI_BACKOFF_MAX_SECONDS = float(os.getenv("GEMINI_BACKOFF_MAX_SECONDS", 30.0))
+# 긴 스크립트를 청크로 나눌 때, 한 영상에서 동시에 처리할 청크 수
+GEMINI_CHUNK_CONCURRENCY = int(os.getenv("GEMINI_CHUNK_CONCURRENCY", 4))
+
+# 재시도할 HTTP 상태 코드 (rate limit, 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_client: genai.Client | None = None
+_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+
+def get_client() -> genai.Client:
+    """
+    프로세스 전체에서 공유하는 Gemini 클라이언트를 반환합니다.
+    API 키는 환경변수 GEMINI_API_KEY에서 자동으로 가져옵니다.
+    """
+    global _client
+    if _client is None:
+        _client = genai.Client()
+    return _client
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, asyncio.TimeoutError):
+        return True
+    if isinstance(e, errors.APIError):
+        return getattr(e, "code", None) in RETRYABLE_STATUS_CODES
+    return False
+
+
+def _backoff_delay(attempt: int) -> float:
+    """지수 백오프에 full jitter를 적용한 대기 시간(초)을 계산합니다."""
+    cap = min(GEMINI_BACKOFF_MAX_SECONDS, GEMINI_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+async def generate_content(prompt: str, model_name: str = GEMINI_MODEL_NAME):
+    """
+    Gemini 비동기 API를 호출합니다.
+    - 전역 세마포어로 동시 호출 수를 제한합니다.
+    - 호출마다 타임아웃을 적용합니다.
+    - 429/5xx 및 타임아웃은 지터가 적용된 지수 백오프로 재시도합니다.
+    """
+    client = get_client()
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        try:
+            async with _semaphore:
+                return await asyncio.wait_for(
+                    client.aio.models.generate_content(model=model_name, contents=prompt),
+                    timeout=GEMINI_TIMEOUT_SECONDS,
+                )
+        except Exception as e:
+            if attempt >= GEMINI_MAX_RETRIES or not _is_retryable(e):
+                raise
+            delay = _backoff_delay(attempt)
+            print(f"⚠️ Gemini 호출 실패 ({type(e).__name__}: {e}). {delay:.1f}초 후 재시도합니다. ({attempt + 1}/{GEMINI_MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
+
+def _with_timestamps(locations: list, segments: TranscriptSegments | None, span: tuple[int, int]) -> list:
+    """
+    청크(span: 문자 위치)에서 추출된 장소마다 영상 시각(start_seconds)을 붙입니다.
+    청크 안에서 이름이 처음 나오는 구간의 시각을 쓰고, 이름을 찾지 못하면(로마자 표기/번역 차이) None을 씁니다.
+    (청크 시작 시각 같은 추정값은 클라이언트가 실제 위치로 믿고 이동하며, 저장 시 LEAST()로 실제 값을 덮어씁니다)
+    """
+    if not segments:
+        return locations
+    return [
+        {**loc, "start_seconds": segments.find_name(loc.get("name"), span[0], span[1])}
+        for loc in locations
+        if isinstance(loc, dict)
+    ]
 
 
 class GeminiService:
@@ -10,6 +98,8 @@ class GeminiService:
     """
 
     def __init__(self):
+        self.model_name = GEMINI_MODEL_NAME
+        self.cache = get_llm_cache()
         self.prompt_template = """You are an expert AI specializing in analyzing YouTube food vlogs to extract restaurant and cafe names.
 Your task is to identify all the specific names of places like restaurants, cafes, bakeries, and food stalls that the vlogger visits or mentions in the provided script.
 
@@ -37,32 +127,97 @@ Text: "{transcript}"
 JSON Result:
 """
 
-    async def extract_locations_from_transcript(self, transcript: str) -> list:
+    async def extract_locations_from_transcript(
+        self, transcript: str, segments: TranscriptSegments | None = None
+    ) -> list:
         """
         Google Gemini API를 사용하여 주어진 텍스트(YouTube 스크립트)에서 장소 이름과 좌표를 비동기적으로 추출합니다.
+        긴 스크립트는 겹치는 청크로 나누어 동시에 추출한 뒤, 이름과 좌표 근접도로 중복을 제거해 합칩니다.
 
         Args:
             transcript (str): 장소 정보를 추출할 텍스트 스크립트.
+            segments (TranscriptSegments | None): transcript의 시간 정보 (segments.text == transcript).
+                주어지면 각 장소에 처음 언급된 영상 시각(start_seconds)을 붙입니다.
 
         Returns:
-            list: 추출된 장소 정보(이름, 위도, 경도)를 담은 딕셔너리 리스트.
+            list: 추출된 장소 정보(이름, 위도, 경도[, start_seconds])를 담은 딕셔너리 리스트.
             장소 추출에 실패하거나 텍스트가 없으면 빈 리스트를 반환합니다.
         """
         if not transcript:
             print("⚠️ 처리할 텍스트가 없어 장소 추출을 건너뜁니다.")
             return []
 
+        if segments is not None:
+            transcript = segments.text
+        spans = split_transcript_spans(transcript)
+        normalized = " ".join(transcript.split())
+        await report("llm", 0.0, "finding locations ...")
+        if len(spans) == 1:
+            locations = _with_timestamps(await self._extract_cached(transcript), segments, spans[0])
+            await report_places(locations)
+            await report("llm", 1.0, "locations found")
+            return locations
+
+        print(f"➡️ 스크립트가 길어 {len(spans)}개 청크로 나누어 추출합니다.")
+        semaphore = asyncio.Semaphore(GEMINI_CHUNK_CONCURRENCY)
+        done = 0
+
+        async def extract_chunk(span: tuple[int, int]) -> list:
+            nonlocal done
+            async with semaphore:
+                partial = await self._extract_cached(normalized[span[0]:span[1]])
+            # LLM 캐시는 텍스트 기준이므로 시각은 캐시 밖에서 청크 위치로 계산해 붙입니다.
+            partial = _with_timestamps(partial, segments, span)
+            # 청크 결과를 전체 병합을 기다리지 않고 바로 전달합니다. (최종 결과는 병합/정규화된 목록)
+            done += 1
+            await report_places(partial)
+            await report(
+                "llm",
+                done / len(spans),
+                f"finding locations {done}/{len(spans)}",
+                chunk=done,
+                chunks=len(spans),
+            )
+            return partial
+
+        partials = await asyncio.gather(*(extract_chunk(span) for span in spans))
+        locations = merge_locations(partials)
+        print(f"✅ 청크별 추출 결과 병합 완료: {sum(len(p) for p in partials)}개 -> {len(locations)}개")
+        return locations
+
+    async def _extract_cached(self, transcript: str) -> list:
+        """
+        한 덩어리의 텍스트에서 장소를 추출합니다.
+        (텍스트, 프롬프트, 모델)이 같은 결과는 LLM 캐시에서 바로 반환합니다.
+        """
+        cache_key = make_cache_key(transcript, self.prompt_template, self.model_name)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                print(f"✅ LLM 캐시 적중. Gemini 호출을 건너뜁니다. ({self.cache.stats()})")
+                return cached
+
+        locations = await self._call_gemini(transcript)
+        if locations is None:
+            return []
+        # 실패(None)는 캐시하지 않고, 정상적으로 파싱된 결과만 캐시합니다.
+        if self.cache is not None:
+            await self.cache.set(cache_key, locations)
+        return locations
+
+    async def _call_gemini(self, transcript: str) -> list | None:
+        """
+        Gemini를 호출하고 JSON 결과를 파싱합니다. 실패하면 None을 반환합니다.
+        """
         print("➡️ Gemini API로 장소 및 좌표 추출을 시작합니다. (비동기)")
 
         prompt = self.prompt_template.format(transcript=transcript)
 
-        # API 키는 환경변수 GEMINI_API_KEY에서 자동으로 가져옴
-        client = genai.Client()
-        model_name = "gemini-2.5-flash"
         response = None
         try:
             print("DEBUG: Gemini API 호출 직전.")
-            response = client.models.generate_content(model=model_name, contents=prompt)
+            async with stage("gemini"):
+                response = await generate_content(prompt, self.model_name)
             print("DEBUG: Gemini API 호출 완료.")
 
             # Google GenAI SDK의 올바른 응답 텍스트 접근 방법
@@ -70,7 +225,7 @@ JSON Result:
                 result_text = response.text.strip().lstrip("```json").rstrip("```")
             else:
                 print("❌ 응답에서 텍스트를 찾을 수 없습니다.")
-                return []
+                return None
             locations = json.loads(result_text)
             print("✅ Gemini 장소 추출 완료.")
             print(locations)
@@ -79,4 +234,4 @@ JSON Result:
             print(f"❌ Gemini API 처리 중 오류 발생: {e}")
             if response:
                 print(f"받은 응답: {response.text}")
-            return []
+            return None
@@ -0,0 +1,255 @@
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.utils.metrics import record_cache
+
+# 캐시 설정
+# LLM_CACHE_BACKEND: "sqlite"(기본) | "postgres" | "none"
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "sqlite").strip().lower()
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(Path(__file__).resolve().parents[1] / ".cache" / "llm_cache.sqlite3"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", 30 * 24 * 60 * 60))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000))
+# 저장된 값(JSON, UTF-8)의 전체 크기 상한(바이트). 넘으면 오래 사용하지 않은 항목부터 지웁니다.
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(transcript: str, prompt_template: str, model_name: str) -> str:
+    """
+    (스크립트 해시, 프롬프트 템플릿 해시, 모델 이름)으로 캐시 키를 만듭니다.
+    같은 스크립트가 다른 URL로 들어와도 같은 키가 되고, 프롬프트나 모델이 바뀌면 키가 바뀝니다.
+    """
+    return f"{_sha256(transcript)}:{_sha256(prompt_template)[:16]}:{model_name}"
+
+
+class CacheBackend(abc.ABC):
+    """
+    LLM 결과 캐시 저장소 인터페이스입니다.
+    값은 JSON 문자열로 저장하며, TTL 만료와 개수/크기 기반 LRU 제거를 지원해야 합니다.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str, ttl_seconds: int) -> str | None:
+        """키에 해당하는 값을 반환합니다. 없거나 TTL이 지났으면 None."""
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: str, max_entries: int, max_bytes: int | None = None):
+        """
+        값을 저장하고, 항목 수가 max_entries를 넘거나 값의 전체 크기(UTF-8 바이트)가 max_bytes를 넘으면
+        오래 사용하지 않은 항목부터 지웁니다.
+        """
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    로컬 SQLite 파일을 사용하는 캐시 저장소입니다.
+    sqlite3 호출은 블로킹이므로 스레드에서 실행합니다.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " cache_key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    def _get(self, key: str, ttl_seconds: int) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def _set(self, key: str, value: str, max_entries: int, max_bytes: int | None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO llm_cache (cache_key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(cache_key) DO UPDATE SET value = excluded.value,"
+                " created_at = excluded.created_at, accessed_at = excluded.accessed_at",
+                (key, value, now, now),
+            )
+            # 최근에 사용되지 않은 항목부터 제거하여 max_entries를 유지합니다.
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE cache_key IN ("
+                " SELECT cache_key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (max_entries,),
+            )
+            if max_bytes is not None:
+                # 최근 사용 순으로 누적한 크기가 max_bytes를 넘는 항목부터 제거합니다.
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE cache_key IN ("
+                    " SELECT cache_key FROM ("
+                    "  SELECT cache_key, SUM(length(CAST(value AS BLOB))) OVER ("
+                    "   ORDER BY accessed_at DESC, cache_key ROWS UNBOUNDED PRECEDING) AS running_bytes"
+                    "  FROM llm_cache)"
+                    " WHERE running_bytes > ?)",
+                    (max_bytes,),
+                )
+            self._conn.commit()
+
+    async def get(self, key: str, ttl_seconds: int) -> str | None:
+        return await asyncio.to_thread(self._get, key, ttl_seconds)
+
+    async def set(self, key: str, value: str, max_entries: int, max_bytes: int | None = None):
+        await asyncio.to_thread(self._set, key, value, max_entries, max_bytes)
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    애플리케이션 DB의 llm_cache 테이블(models.LLMCache)을 사용하는 캐시 저장소입니다.
+    여러 서버 프로세스가 같은 캐시를 공유해야 할 때 사용합니다.
+    """
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from app.db.database import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+
+    async def get(self, key: str, ttl_seconds: int) -> str | None:
+        from sqlalchemy import delete, func, select, update
+        from models import LLMCache
+
+        async with self.session_factory() as db:
+            result = await db.execute(select(LLMCache).filter(LLMCache.cache_key == key))
+            entry = result.scalars().first()
+            if entry is None:
+                return None
+            if time.time() - entry.created_at.timestamp() > ttl_seconds:
+                await db.execute(delete(LLMCache).filter(LLMCache.cache_key == key))
+                await db.commit()
+                return None
+            await db.execute(
+                update(LLMCache).filter(LLMCache.cache_key == key).values(accessed_at=func.now())
+            )
+            await db.commit()
+            return entry.value
+
+    async def set(self, key: str, value: str, max_entries: int, max_bytes: int | None = None):
+        from sqlalchemy import delete, func, select
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from models import LLMCache
+
+        async with self.session_factory() as db:
+            stmt = pg_insert(LLMCache).values(cache_key=key, value=value)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LLMCache.cache_key],
+                set_={"value": stmt.excluded.value, "created_at": func.now(), "accessed_at": func.now()},
+            )
+            await db.execute(stmt)
+            stale_keys = (
+                select(LLMCache.cache_key)
+                .order_by(LLMCache.accessed_at.desc())
+                .offset(max_entries)
+                .scalar_subquery()
+            )
+            await db.execute(delete(LLMCache).filter(LLMCache.cache_key.in_(stale_keys)))
+            if max_bytes is not None:
+                running_bytes = func.sum(func.octet_length(LLMCache.value)).over(
+                    order_by=(LLMCache.accessed_at.desc(), LLMCache.cache_key)
+                )
+                ranked = select(LLMCache.cache_key, running_bytes.label("running_bytes")).subquery()
+                over_budget = select(ranked.c.cache_key).filter(ranked.c.running_bytes > max_bytes)
+                await db.execute(delete(LLMCache).filter(LLMCache.cache_key.in_(over_budget)))
+            await db.commit()
+
+
+class LLMResultCache:
+    """
+    LLM 추출 결과 캐시입니다.
+    캐시 오류는 추출을 막지 않도록 로그만 남기고 캐시 미스로 처리합니다.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        max_bytes: int | None = LLM_CACHE_MAX_BYTES,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> list | None:
+        try:
+            value = await self.backend.get(key, self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ LLM 캐시 조회 실패: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+            record_cache("llm", False)
+            return None
+        self.hits += 1
+        record_cache("llm", True)
+        return json.loads(value)
+
+    async def set(self, key: str, locations: list):
+        try:
+            await self.backend.set(
+                key, json.dumps(locations, ensure_ascii=False), self.max_entries, self.max_bytes
+            )
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ LLM 캐시 저장 실패: {e}")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+_cache: LLMResultCache | None = None
+
+
+def get_llm_cache() -> LLMResultCache | None:
+    """
+    설정(LLM_CACHE_BACKEND)에 따라 프로세스 전체에서 공유하는 캐시를 반환합니다.
+    "none"이면 None을 반환합니다.
+    """
+    global _cache
+    if _cache is None:
+        if LLM_CACHE_BACKEND == "none":
+            return None
+        if LLM_CACHE_BACKEND == "postgres":
+            backend = PostgresCacheBackend()
+        elif LLM_CACHE_BACKEND == "sqlite":
+            backend = SQLiteCacheBackend(LLM_CACHE_PATH)
+        else:
+            raise ValueError(f"지원하지 않는 LLM_CACHE_BACKEND: {LLM_CACHE_BACKEND}")
+        _cache = LLMResultCache(backend)
+    return _cache
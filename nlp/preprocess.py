@@ -0,0 +1,203 @@
+import os
+import re
+import unicodedata
+
+from nlp.chunking import estimate_tokens
+from nlp.segments import TranscriptSegments
+
+# 장소 단서가 있는 문장(과 그 앞뒤 문장)만 남길지 여부. 재현율 손실 가능성이 있어 기본값은 끕니다.
+PREPROCESS_PLACE_FILTER = os.getenv("PREPROCESS_PLACE_FILTER", "false").lower() in ("1", "true", "yes")
+# 장소 단서 문장 앞뒤로 함께 남길 문장 수
+PLACE_CONTEXT_SENTENCES = int(os.getenv("PREPROCESS_PLACE_CONTEXT_SENTENCES", 1))
+# 시간 정보가 있는 스크립트에서 장소 단서 구간 앞뒤로 함께 남길 시간(초)
+PLACE_CONTEXT_SECONDS = float(os.getenv("PREPROCESS_PLACE_CONTEXT_SECONDS", 20))
+# 연속 반복을 찾을 최대 구(phrase) 길이(단어 수)
+REPEAT_MAX_WORDS = 8
+# 이 횟수 이상 연속으로 반복될 때만 합칩니다. ("Bora Bora", "쏘쏘"처럼 두 번 겹친 이름은 그대로 둡니다)
+REPEAT_MIN_COUNT = 3
+# 문장 부호가 없는 자막을 문장 대신 나눌 단어 수
+SENTENCE_FALLBACK_WORDS = 15
+
+# [음악], [Music], [박수] 처럼 대괄호로 감싼 효과음 표기와 음표 기호
+_BRACKET_TAG = re.compile(r"\[[^\[\]]{0,30}\]|[♪♫♬]+")
+_PAREN_TAG = re.compile(
+    r"\((?:음악|박수|웃음|웃음소리|박수 소리|효과음|music|applause|laughter|laughs|laughing|cheering)\)",
+    re.IGNORECASE,
+)
+_SPEAKER_MARK = re.compile(r"&gt;&gt;|>>")
+# ㅋㅎㅠㅜ는 _word_key()의 NFKC 정규화 후 조합형 자모(\u110f, \u1112, \u1172, \u116e)가 됩니다.
+# "오"(숫자 5), "와"(~와/과), "에"처럼 실제 단어일 수 있는 한 글자는 두 번 이상 늘어졌을 때만 필러로 봅니다.
+_FILLER_WORD = re.compile(
+    r"^(?:[음으어아흠엄]+|에{2,}|우와+|와{2,}|오{2,}|헐|[ㅋㅎㅠㅜ\u110f\u1112\u1172\u116e]+|u+m+|u+h+|h+m+|e+r+m*|a+h+|o+h+)$",
+    re.IGNORECASE,
+)
+_FILLER_PHRASE = re.compile(r"\b(?:you know|i mean)\b,?", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+_PLACE_CUE = re.compile(
+    r"식당|맛집|카페|커피|베이커리|빵집|제과|분식|국밥|해장국|국수|냉면|갈비|고깃집|횟집|포차|주점|술집|시장|본점|지점|호텔|"
+    r"가게|상호|라는 곳|이라는|역(?:\s|에|$)|\b(?:restaurant|cafe|café|coffee|bakery|bar|pub|bistro|diner|grill|"
+    r"kitchen|market|station|shop|store|hotel|street|avenue|called|named)\b",
+    re.IGNORECASE,
+)
+
+
+class PreprocessResult:
+    """전처리된 스크립트와 토큰 수 추정치입니다. 시간 정보가 있으면 segments.text == text 입니다."""
+
+    def __init__(self, text: str, original_tokens: int, tokens: int, segments: TranscriptSegments | None = None):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.tokens = tokens
+        self.segments = segments
+
+    @property
+    def reduction(self) -> float:
+        """줄어든 토큰 비율 (0~1)"""
+        if not self.original_tokens:
+            return 0.0
+        return max(0.0, 1 - self.tokens / self.original_tokens)
+
+
+def _word_key(word: str) -> str:
+    # 반복/필러 판별용 키: 유니코드 정규화, 대소문자 무시, 앞뒤 구두점 제거
+    return unicodedata.normalize("NFKC", word).casefold().strip(".,!?~…·'\"-")
+
+
+def trim_overlaps(texts: list[str], max_overlap_words: int = 30) -> list[str]:
+    """
+    롤링 자막처럼 앞 구간의 끝과 겹치는 각 구간의 앞부분을 잘라 낸 구간 텍스트 목록을 반환합니다.
+    (구간 수와 순서는 그대로이며, 전부 겹친 구간은 빈 문자열이 됩니다.)
+    """
+    trimmed = []
+    keys: list[str] = []
+    for text in texts:
+        segment = text.split()
+        segment_keys = [_word_key(word) for word in segment]
+        overlap = 0
+        for size in range(min(len(segment), len(keys), max_overlap_words), 0, -1):
+            if keys[-size:] == segment_keys[:size]:
+                overlap = size
+                break
+        trimmed.append(" ".join(segment[overlap:]))
+        keys.extend(segment_keys[overlap:])
+    return trimmed
+
+
+def merge_caption_segments(texts: list[str], max_overlap_words: int = 30) -> str:
+    """
+    자막 구간들을 하나의 문자열로 합치면서, 롤링 자막처럼 앞 구간의 끝과 겹치는 부분은 한 번만 남깁니다.
+    예: ["오늘은 성수동에", "성수동에 있는 카페"] -> "오늘은 성수동에 있는 카페"
+    """
+    return " ".join(text for text in trim_overlaps(texts, max_overlap_words) if text)
+
+
+def strip_noise(text: str) -> str:
+    """효과음 표기([음악], (박수) 등), 화자 표시, 필러(음, 어, um, uh, ㅋㅋ 등)를 지웁니다."""
+    text = _BRACKET_TAG.sub(" ", text)
+    text = _PAREN_TAG.sub(" ", text)
+    text = _SPEAKER_MARK.sub(" ", text)
+    text = _FILLER_PHRASE.sub(" ", text)
+    return " ".join(word for word in text.split() if not _FILLER_WORD.match(_word_key(word) or "-"))
+
+
+def collapse_repeats(text: str, max_words: int = REPEAT_MAX_WORDS, min_count: int = REPEAT_MIN_COUNT) -> str:
+    """
+    min_count번 이상 연속으로 반복되는 단어/구를 한 번만 남깁니다.
+    두 번 겹친 것은 "Bora Bora Cafe", "쏘쏘 식당" 같은 이름일 수 있으므로 그대로 둡니다.
+    (롤링 자막의 두 번 겹침은 trim_overlaps/merge_caption_segments가 따로 정리합니다)
+    예: "진짜 진짜 진짜 맛있다" -> "진짜 맛있다", "Bora Bora Cafe" -> "Bora Bora Cafe"
+    """
+    words = text.split()
+    keys = [_word_key(word) for word in words]
+    changed = True
+    while changed:
+        # 짧은 반복을 먼저 합쳐야 더 긴 구의 반복이 드러납니다.
+        changed = False
+        for size in range(1, max_words + 1):
+            i = 0
+            while i + min_count * size <= len(words):
+                phrase = keys[i:i + size]
+                end = i + size
+                while keys[end:end + size] == phrase:
+                    end += size
+                if (end - i) // size >= min_count:
+                    del words[i + size:end]
+                    del keys[i + size:end]
+                    changed = True
+                i += 1
+    return " ".join(words)
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    문장 부호 기준으로 문장을 나눕니다. 문장 부호가 없는 자동 생성 자막처럼 긴 문장은
+    SENTENCE_FALLBACK_WORDS 단어씩 나눕니다.
+    """
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        for start in range(0, len(words), SENTENCE_FALLBACK_WORDS):
+            sentences.append(" ".join(words[start:start + SENTENCE_FALLBACK_WORDS]))
+    return sentences
+
+
+def keep_place_sentences(text: str, context: int = PLACE_CONTEXT_SENTENCES) -> str:
+    """
+    장소 단서(식당, 카페, 역, restaurant, called 등)가 있는 문장과 그 앞뒤 context개 문장만 남깁니다.
+    단서가 있는 문장이 하나도 없으면 원문을 그대로 반환합니다.
+    """
+    sentences = split_sentences(text)
+    keep = set()
+    for i, sentence in enumerate(sentences):
+        if _PLACE_CUE.search(sentence):
+            keep.update(range(max(0, i - context), min(len(sentences), i + context + 1)))
+    if not keep:
+        return text
+    return " ".join(sentences[i] for i in sorted(keep))
+
+
+def preprocess_transcript(transcript: str, place_filter: bool = PREPROCESS_PLACE_FILTER) -> PreprocessResult:
+    """
+    LLM에 보내기 전에 스크립트를 줄입니다.
+    효과음 표기와 필러를 지우고, 연속 반복(롤링 자막 중복 포함)을 합치며,
+    place_filter가 켜져 있으면 장소 단서 주변 문장만 남깁니다.
+    """
+    original_tokens = estimate_tokens(transcript)
+    text = collapse_repeats(strip_noise(transcript))
+    if place_filter:
+        text = keep_place_sentences(text)
+    return PreprocessResult(text, original_tokens, estimate_tokens(text))
+
+
+def keep_place_segments(segments: TranscriptSegments, context_seconds: float = PLACE_CONTEXT_SECONDS) -> TranscriptSegments:
+    """
+    장소 단서가 있는 구간과 그 앞뒤 context_seconds초 안의 구간만 남깁니다.
+    단서가 있는 구간이 하나도 없으면 그대로 반환합니다.
+    """
+    cue_times = [
+        (start, start + duration)
+        for start, duration, text in zip(segments.starts, segments.durations, segments.texts)
+        if _PLACE_CUE.search(text)
+    ]
+    if not cue_times:
+        return segments
+    texts = [
+        text if any(low - context_seconds <= start <= high + context_seconds for low, high in cue_times) else ""
+        for start, text in zip(segments.starts, segments.texts)
+    ]
+    return segments.with_texts(texts)
+
+
+def preprocess_segments(segments: TranscriptSegments, place_filter: bool = PREPROCESS_PLACE_FILTER) -> PreprocessResult:
+    """
+    시간 정보가 있는 스크립트를 구간 단위로 전처리합니다. (preprocess_transcript와 같은 단계)
+    구간별로 효과음/필러/반복을 지운 뒤 롤링 자막의 겹침을 잘라 내므로, 남은 텍스트의 문자 위치를
+    여전히 구간 시각으로 되돌릴 수 있습니다. 결과의 segments를 LLM 단계에 함께 넘깁니다.
+    """
+    original_tokens = estimate_tokens(segments.text)
+    texts = trim_overlaps([collapse_repeats(strip_noise(text)) for text in segments.texts])
+    cleaned = segments.with_texts(texts)
+    if place_filter:
+        cleaned = keep_place_segments(cleaned)
+    text = cleaned.text
+    return PreprocessResult(text, original_tokens, estimate_tokens(text), segments=cleaned)
@@ -0,0 +1,175 @@
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+
+from nlp.chunking import normalize_name
+
+# 묶음 형식: 매직(버전 포함), 구간 수, [시작(ms)] * n, [길이(ms)] * n, [텍스트 바이트 수] * n, UTF-8 텍스트 (전체를 zlib 압축)
+_MAGIC = b"TSG1"
+_HEADER = struct.Struct("<4sI")
+# 4바이트 부호 없는 정수 배열 형식 (플랫폼마다 "I"/"L"의 크기가 다를 수 있습니다)
+_U32 = "I" if array("I").itemsize == 4 else "L"
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class TranscriptSegments:
+    """
+    시간 정보가 있는 스크립트입니다. (시작 초, 길이 초, 텍스트)를 병렬 배열로 보관합니다.
+    - text: 구간 텍스트를 공백 하나로 이어 붙인 문자열. 청크/LLM 단계는 이 문자열의 문자 위치를 사용하고,
+      time_at()/find_name()으로 문자 위치를 영상 시각으로 되돌립니다.
+    - pack()/unpack(): DB(Contents.segments)에 저장하는 압축된 바이너리 형식입니다.
+    """
+
+    __slots__ = ("starts", "durations", "texts", "_offsets")
+
+    def __init__(self, starts=(), durations=(), texts=()):
+        starts, durations, texts = list(starts), list(durations), list(texts)
+        if not (len(starts) == len(durations) == len(texts)):
+            raise ValueError("starts, durations, texts의 길이가 같아야 합니다.")
+        # 문자 위치 계산이 단순하도록 구간 안의 공백을 하나로 정리하고, 빈 구간은 뺍니다.
+        rows = [(s, d, " ".join(t.split())) for s, d, t in zip(starts, durations, texts)]
+        rows = [row for row in rows if row[2]]
+        self.starts = array("d", (r[0] for r in rows))
+        self.durations = array("d", (r[1] for r in rows))
+        self.texts = [r[2] for r in rows]
+        self._offsets: list[int] | None = None
+
+    @classmethod
+    def from_dicts(cls, items: list[dict], offset: float = 0.0) -> "TranscriptSegments":
+        """youtube-transcript-api 형식([{"text", "start", "duration"}])에서 만듭니다. offset초만큼 시각을 옮깁니다."""
+        return cls(
+            (float(item.get("start") or 0.0) + offset for item in items),
+            (float(item.get("duration") or 0.0) for item in items),
+            (item.get("text") or "" for item in items),
+        )
+
+    @classmethod
+    def concat(cls, parts: list["TranscriptSegments"]) -> "TranscriptSegments":
+        merged = cls()
+        for part in parts:
+            merged.starts.extend(part.starts)
+            merged.durations.extend(part.durations)
+            merged.texts.extend(part.texts)
+        return merged
+
+    def to_dicts(self) -> list[dict]:
+        return [
+            {"start": start, "duration": duration, "text": text}
+            for start, duration, text in zip(self.starts, self.durations, self.texts)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def end(self) -> float:
+        if not self.texts:
+            return 0.0
+        return max(start + duration for start, duration in zip(self.starts, self.durations))
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.texts)
+
+    def offsets(self) -> list[int]:
+        """각 구간이 text에서 시작하는 문자 위치"""
+        if self._offsets is None:
+            offsets = []
+            position = 0
+            for text in self.texts:
+                offsets.append(position)
+                position += len(text) + 1
+            self._offsets = offsets
+        return self._offsets
+
+    def index_at(self, char_offset: int) -> int:
+        """text의 문자 위치가 속한 구간 번호"""
+        return max(0, bisect_right(self.offsets(), char_offset) - 1)
+
+    def time_at(self, char_offset: int) -> float | None:
+        """text의 문자 위치가 속한 구간의 시작 시각(초)"""
+        if not self.texts:
+            return None
+        return self.starts[self.index_at(char_offset)]
+
+    def find_name(self, name: str, start_char: int = 0, end_char: int | None = None) -> float | None:
+        """
+        text[start_char:end_char] 범위의 구간들에서 장소 이름이 처음 나오는 시각(초)을 찾습니다.
+        이름이 두 구간에 걸쳐 나뉘어 있어도 찾도록 이웃한 두 구간을 이어서 비교합니다. 못 찾으면 None.
+        """
+        key = normalize_name(name or "")
+        if not key or not self.texts:
+            return None
+        first = self.index_at(start_char)
+        last = self.index_at(end_char if end_char is not None else len(self.text))
+        keys = [normalize_name(self.texts[i]) for i in range(first, last + 1)]
+        for i, segment_key in enumerate(keys):
+            if key in segment_key:
+                return self.starts[first + i]
+            # 다음 구간 안에 온전히 있으면 다음 구간의 시각을 써야 하므로, 걸쳐 있을 때만 이 구간으로 봅니다.
+            if i + 1 < len(keys) and key not in keys[i + 1] and key in segment_key + keys[i + 1]:
+                return self.starts[first + i]
+        return None
+
+    def between(self, start: float, end: float) -> "TranscriptSegments":
+        """
+        [start, end) 초 구간과 겹치는 구간들만 남긴 사본 (시각은 원래 영상 기준 그대로)
+        정확히 start에 끝나는 구간은 겹치지 않는 것으로 보고, 길이가 0인 구간은 시작 시각으로 판단합니다.
+        """
+        rows = [
+            (s, d, t)
+            for s, d, t in zip(self.starts, self.durations, self.texts)
+            if s < end and (s + d > start or s >= start)
+        ]
+        return TranscriptSegments([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows])
+
+    def with_texts(self, texts: list[str]) -> "TranscriptSegments":
+        """같은 시각에 텍스트만 바꾼 사본을 만듭니다. 텍스트가 빈 구간은 뺍니다."""
+        return TranscriptSegments(self.starts, self.durations, texts)
+
+    def pack(self) -> bytes:
+        encoded = [text.encode("utf-8") for text in self.texts]
+        body = b"".join(
+            [
+                _HEADER.pack(_MAGIC, len(encoded)),
+                _to_little_endian(array(_U32, (round(s * 1000) for s in self.starts))),
+                _to_little_endian(array(_U32, (round(d * 1000) for d in self.durations))),
+                _to_little_endian(array(_U32, (len(e) for e in encoded))),
+                *encoded,
+            ]
+        )
+        return zlib.compress(body)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "TranscriptSegments":
+        body = zlib.decompress(data)
+        magic, count = _HEADER.unpack_from(body)
+        if magic != _MAGIC:
+            raise ValueError("알 수 없는 스크립트 구간 형식입니다.")
+        position = _HEADER.size
+        arrays = []
+        for _ in range(3):
+            arrays.append(_from_little_endian(_U32, body[position:position + 4 * count]))
+            position += 4 * count
+        starts_ms, durations_ms, lengths = arrays
+        texts = []
+        for length in lengths:
+            texts.append(body[position:position + length].decode("utf-8"))
+            position += length
+        return cls((s / 1000 for s in starts_ms), (d / 1000 for d in durations_ms), texts)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+자막 언어 협상(STT 회피율) 측정 스크립트
+영상별 자막 트랙 목록 픽스처(scripts/fixtures/caption_tracks.json)에 대해
+기존 방식(ko/en 자막만 사용)과 crawlers.youtube.choose_caption_track(수동 -> 자동 생성 -> 번역)의
+선택 결과를 비교하고, 음원 다운로드 + STT를 피한 비율을 출력합니다. 네트워크를 사용하지 않습니다.
+
+사용 예:
+    python scripts/bench_caption_negotiation.py
+    python scripts/bench_caption_negotiation.py --fixture my_tracks.json --languages ko,en
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from crawlers.youtube import choose_caption_track
+
+
+def legacy_choice(tracks, languages: list[str]) -> str | None:
+    """기존 get_transcript(languages=...) 동작: 정확한 언어의 수동 자막, 없으면 자동 생성 자막"""
+    for is_generated, kind in ((False, "manual"), (True, "generated")):
+        for language in languages:
+            for track in tracks:
+                if track.is_generated == is_generated and track.language_code == language:
+                    return f"{kind}:{language}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자막 언어 협상 STT 회피율 측정")
+    parser.add_argument("--fixture", default=str(project_root / "scripts" / "fixtures" / "caption_tracks.json"))
+    parser.add_argument("--languages", default="ko,en", help="선호 언어 (쉼표로 구분, 우선순위 순)")
+    args = parser.parse_args()
+
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    with open(args.fixture, encoding="utf-8") as f:
+        videos = json.load(f)
+
+    legacy_hits = 0
+    negotiated_hits = 0
+    print(f"{'video_id':<28} {'기존':<16} {'협상':<20}")
+    for video in videos:
+        tracks = [SimpleNamespace(**track) for track in video["tracks"]]
+        legacy = legacy_choice(tracks, languages)
+        choice = choose_caption_track(tracks, languages)
+        negotiated = choice[2] if choice else None
+        legacy_hits += legacy is not None
+        negotiated_hits += negotiated is not None
+        print(f"{video['video_id']:<28} {legacy or 'STT':<16} {negotiated or 'STT':<20}")
+
+    total = len(videos)
+    print()
+    print(f"📊 영상 {total}개")
+    print(f"   기존 STT 회피율: {legacy_hits / total:.0%} ({legacy_hits}/{total})")
+    print(f"   협상 STT 회피율: {negotiated_hits / total:.0%} ({negotiated_hits}/{total})")
+
+
+if __name__ == "__main__":
+    main()
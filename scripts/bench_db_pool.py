@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+DB 연결 풀링 모드별 연결 설정 지연 시간 벤치마크 스크립트
+로컬 Postgres(.env의 DATABASE_URL)에 대해 각 DB_POOL_MODE로 엔진을 만들고,
+세션 획득 + `SELECT 1` 한 번에 걸리는 시간을 측정합니다.
+
+사용 예:
+    python scripts/bench_db_pool.py --iterations 200 --concurrency 10
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db.database import async_db_url, build_engine_kwargs, POOL_MODES
+
+
+async def run_mode(pool_mode: str, iterations: int, concurrency: int) -> list[float]:
+    """한 풀링 모드에 대해 iterations번 세션 획득 + 쿼리 지연 시간(ms)을 측정합니다."""
+    engine = create_async_engine(async_db_url, **build_engine_kwargs(pool_mode))
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one_request():
+        async with semaphore:
+            start = time.perf_counter()
+            async with session_factory() as session:
+                await session.execute(text("SELECT 1"))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # 워밍업: 풀 모드에서 연결을 미리 채워 정상 상태(steady state)를 측정합니다.
+    await asyncio.gather(*(one_request() for _ in range(concurrency)))
+    latencies.clear()
+
+    await asyncio.gather(*(one_request() for _ in range(iterations)))
+    await engine.dispose()
+    return latencies
+
+
+def summarize(pool_mode: str, latencies: list[float]):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
+    print(
+        f"{pool_mode:<24} n={len(ordered):<5} "
+        f"mean={statistics.mean(ordered):8.2f}ms "
+        f"p50={statistics.median(ordered):8.2f}ms "
+        f"p95={p95:8.2f}ms "
+        f"max={ordered[-1]:8.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="DB 풀링 모드별 연결 지연 시간 비교")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=list(POOL_MODES), choices=POOL_MODES)
+    args = parser.parse_args()
+
+    print(f"🚀 DB 풀링 벤치마크 (iterations={args.iterations}, concurrency={args.concurrency})\n")
+    for pool_mode in args.modes:
+        latencies = await run_mode(pool_mode, args.iterations, args.concurrency)
+        summarize(pool_mode, latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+동시 로그인 부하에서 비밀번호 검증 처리량과 이벤트 루프 지연을 비교하는 벤치마크 스크립트
+- inline: 이벤트 루프에서 bcrypt를 직접 실행 (기존 방식)
+- executor: 전용 스레드 풀에서 실행 (hash_utils.verify_and_update_async)
+
+DB 없이 해시 검증 부분만 측정합니다.
+
+사용 예:
+    python scripts/bench_login.py --logins 64 --concurrency 16
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils import hash as hash_utils
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """interval마다 깨어나며, 예정 시각보다 늦게 깨어난 최대 지연(ms)을 측정합니다."""
+    max_lag = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, loop.time() - expected)
+    return max_lag * 1000
+
+
+async def run(mode: str, hashed: str, logins: int, concurrency: int) -> tuple[float, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if mode == "inline":
+                hash_utils.verify_and_update("password123", hashed)
+            else:
+                await hash_utils.verify_and_update_async("password123", hashed)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    max_lag_ms = await lag_task
+    return logins / elapsed, max_lag_ms
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="동시 로그인 처리량 벤치마크")
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    hashed = hash_utils.get_password_hash("password123")
+    print(
+        f"🚀 로그인 벤치마크 (rounds={hash_utils.BCRYPT_ROUNDS}, workers={hash_utils.BCRYPT_MAX_WORKERS}, "
+        f"logins={args.logins}, concurrency={args.concurrency})\n"
+    )
+    for mode in ("inline", "executor"):
+        throughput, max_lag_ms = await run(mode, hashed, args.logins, args.concurrency)
+        print(f"{mode:<10} {throughput:8.1f} logins/s   max event-loop lag {max_lag_ms:8.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
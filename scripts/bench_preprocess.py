@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+스크립트 전처리(nlp.preprocess) 입력 크기 감소 / 재현율 측정 스크립트
+장소 이름이 라벨링된 픽스처(scripts/fixtures/transcripts.json)에 대해
+기존 방식(자막 구간을 공백으로 이어 붙인 원문)과 전처리 결과의 추정 토큰 수를 비교하고,
+라벨링된 장소 이름이 전처리 후에도 텍스트에 남아 있는 비율(재현율)을 출력합니다.
+LLM을 호출하지 않으므로, 재현율은 "LLM이 볼 수 있는 장소 이름"의 비율입니다.
+자막 구간 픽스처는 구간마다 SECONDS_PER_SEGMENT초 간격의 시각을 붙여 실제 파이프라인과 같은
+구간 단위 전처리(preprocess_segments)를 거치고, 남은 장소 이름이 가리키는 영상 시각도 함께 출력합니다.
+
+사용 예:
+    python scripts/bench_preprocess.py
+    python scripts/bench_preprocess.py --place-filter
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from nlp.chunking import estimate_tokens, normalize_name
+from nlp.preprocess import preprocess_segments, preprocess_transcript
+from nlp.segments import TranscriptSegments
+
+# 픽스처 자막 구간 하나의 길이(초). 롤링 자막은 보통 2~4초 간격으로 바뀝니다.
+SECONDS_PER_SEGMENT = 3.0
+
+
+def place_recall(text: str, places: list[str]) -> tuple[int, int]:
+    """라벨링된 장소 이름 중 텍스트에 남아 있는 개수와 전체 개수를 반환합니다."""
+    normalized = normalize_name(text)
+    return sum(normalize_name(place) in normalized for place in places), len(places)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크립트 전처리 입력 크기 감소/재현율 측정")
+    parser.add_argument("--fixture", default=str(project_root / "scripts" / "fixtures" / "transcripts.json"))
+    parser.add_argument("--place-filter", action="store_true", help="장소 단서 주변 문장만 남기는 필터도 적용")
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        videos = json.load(f)
+
+    total_before = total_after = 0
+    found_total = places_total = 0
+    print(f"{'video_id':<24} {'출처':<18} {'토큰(전)':>8} {'토큰(후)':>8} {'감소':>6} {'재현율':>7}")
+    for video in videos:
+        if "segments" in video:
+            raw = " ".join(video["segments"])
+            count = len(video["segments"])
+            segments = TranscriptSegments(
+                [i * SECONDS_PER_SEGMENT for i in range(count)], [SECONDS_PER_SEGMENT] * count, video["segments"]
+            )
+            result = preprocess_segments(segments, place_filter=args.place_filter)
+        else:
+            raw = video["transcript"]
+            result = preprocess_transcript(raw, place_filter=args.place_filter)
+
+        before = estimate_tokens(raw)
+        found, count = place_recall(result.text, video["places"])
+        total_before += before
+        total_after += result.tokens
+        found_total += found
+        places_total += count
+        print(
+            f"{video['video_id']:<24} {video['source']:<18} {before:>8} {result.tokens:>8} "
+            f"{1 - result.tokens / before:>6.0%} {f'{found}/{count}':>7}"
+        )
+        for place in video["places"]:
+            if normalize_name(place) not in normalize_name(result.text):
+                print(f"   ⚠️ 누락: {place}")
+            elif result.segments is not None:
+                print(f"   📍 {place} @ {result.segments.find_name(place):.0f}s")
+
+    print()
+    print(f"📊 영상 {len(videos)}개 (장소 필터: {'켬' if args.place_filter else '끔'})")
+    print(f"   추정 토큰: {total_before} -> {total_after} ({1 - total_after / total_before:.0%} 감소)")
+    print(f"   장소 재현율: {found_total / places_total:.0%} ({found_total}/{places_total})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+/api/v1/users/history 응답 직렬화 비용 비교 벤치마크 스크립트
+- pydantic: 기록마다 UserContentHistoryResponse/Place 모델을 만들고 FastAPI처럼 다시 검증 후 JSON으로 직렬화
+- orjson: ORM 객체를 dict로 바로 변환해 orjson으로 직렬화 (app.utils.serialization)
+
+DB 없이 ORM 객체와 같은 속성을 가진 가짜 객체로 측정합니다.
+
+사용 예:
+    python scripts/bench_serialization.py --records 50 --places 10 --repeat 200
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from pydantic import TypeAdapter
+
+from app.schemas.users import UserContentHistoryResponse, Place
+from app.utils.serialization import dumps, history_to_dict
+
+
+def make_records(records: int, places: int) -> list:
+    result = []
+    for i in range(records):
+        content = SimpleNamespace(
+            content_id=f"video{i:05d}",
+            title=f"서울 맛집 브이로그 {i}",
+            thumbnail_url=f"https://i.ytimg.com/vi/video{i:05d}/maxresdefault.jpg",
+            youtube_url=f"https://www.youtube.com/watch?v=video{i:05d}",
+            places=[
+                SimpleNamespace(name=f"맛집 {i}-{j}", lat=37.5 + j * 0.001, lng=127.0 + j * 0.001)
+                for j in range(places)
+            ],
+        )
+        result.append(SimpleNamespace(content=content, created_at=datetime.now(timezone.utc), id=i))
+    return result
+
+
+def pydantic_path(records: list, adapter: TypeAdapter) -> bytes:
+    response_data = [
+        UserContentHistoryResponse(
+            id=r.content.content_id,
+            title=r.content.title,
+            created_at=r.created_at,
+            thumbnail_url=r.content.thumbnail_url,
+            youtube_url=r.content.youtube_url,
+            places=[Place.from_orm(p) for p in r.content.places],
+        )
+        for r in records
+    ]
+    # FastAPI는 response_model로 한 번 더 검증한 뒤 직렬화합니다.
+    validated = adapter.validate_python([m.model_dump() for m in response_data])
+    return adapter.dump_json(validated)
+
+
+def orjson_path(records: list) -> bytes:
+    return dumps([history_to_dict(r, [(p, None) for p in r.content.places]) for r in records if r.content])
+
+
+def bench(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="history 응답 직렬화 비용 비교")
+    parser.add_argument("--records", type=int, default=50)
+    parser.add_argument("--places", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.places)
+    adapter = TypeAdapter(List[UserContentHistoryResponse])
+
+    pydantic_ms = bench(lambda: pydantic_path(records, adapter), args.repeat)
+    orjson_ms = bench(lambda: orjson_path(records), args.repeat)
+    print(f"🚀 records={args.records}, places/record={args.places}, repeat={args.repeat}\n")
+    print(f"pydantic  {pydantic_ms:8.3f} ms/request")
+    print(f"orjson    {orjson_ms:8.3f} ms/request")
+    print(f"saved     {pydantic_ms - orjson_ms:8.3f} ms/request ({pydantic_ms / orjson_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
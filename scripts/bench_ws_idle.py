@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+WebSocket 유휴 연결 부하 테스트 스크립트
+실행 중인 서버(/ws/process)에 유휴 연결 N개를 열어 두고, 서버 프로세스의 메모리(RSS)와
+CPU 사용 시간을 주기적으로 기록합니다. 연결 수가 늘어도 유휴 상태의 CPU가 평탄해야 합니다.
+(/proc 를 읽으므로 서버와 같은 Linux 호스트에서 실행해야 합니다.)
+
+사용 예:
+    uvicorn app.main:app --port 8000 &
+    python scripts/bench_ws_idle.py --pid $! --connections 2000 --duration 120
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import websockets
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def read_process_stats(pid: int) -> tuple[float, float]:
+    """서버 프로세스의 (RSS MB, 누적 CPU 초)를 /proc에서 읽습니다."""
+    rss_kb = 0
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+                break
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime, stime (stat의 14, 15번째 필드. 괄호 뒤 기준 12, 13번째)
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    return rss_kb / 1024, cpu_seconds
+
+
+async def idle_client(url: str, stop: asyncio.Event, counters: dict):
+    """연결을 열어 두고 서버의 ping 프레임에 pong으로 응답합니다."""
+    try:
+        async with websockets.connect(url, open_timeout=30, ping_interval=None) as ws:
+            counters["open"] += 1
+            while not stop.is_set():
+                try:
+                    message = await asyncio.wait_for(ws.recv(), timeout=1)
+                except asyncio.TimeoutError:
+                    continue
+                counters["frames"] += 1
+                if '"ping"' in message:
+                    await ws.send('{"action": "pong"}')
+    except Exception:
+        counters["failed"] += 1
+    finally:
+        counters["open"] = max(counters["open"] - 1, 0)
+
+
+async def run(url: str, pid: int | None, connections: int, ramp_per_second: int, duration: float, interval: float):
+    stop = asyncio.Event()
+    counters = {"open": 0, "failed": 0, "frames": 0}
+    tasks = []
+
+    print(f"🚀 {url} 에 유휴 연결 {connections}개를 엽니다. (초당 {ramp_per_second}개)")
+    for i in range(connections):
+        tasks.append(asyncio.create_task(idle_client(url, stop, counters)))
+        if (i + 1) % ramp_per_second == 0:
+            await asyncio.sleep(1)
+
+    print(f"{'경과(s)':>8} {'연결':>6} {'실패':>6} {'프레임':>8} {'RSS(MB)':>9} {'CPU(%)':>7}")
+    start = time.monotonic()
+    last_cpu = last_time = None
+    while time.monotonic() - start < duration:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        rss_mb, cpu_percent = float("nan"), float("nan")
+        if pid:
+            rss_mb, cpu_seconds = read_process_stats(pid)
+            if last_cpu is not None:
+                cpu_percent = (cpu_seconds - last_cpu) / (now - last_time) * 100
+            last_cpu, last_time = cpu_seconds, now
+        print(
+            f"{now - start:8.1f} {counters['open']:6d} {counters['failed']:6d} "
+            f"{counters['frames']:8d} {rss_mb:9.1f} {cpu_percent:7.1f}"
+        )
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print("✨ 완료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket 유휴 연결 부하 테스트")
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws/process")
+    parser.add_argument("--pid", type=int, default=None, help="메모리/CPU를 기록할 서버 프로세스 PID")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--ramp-per-second", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=60, help="연결을 유지할 시간(초)")
+    parser.add_argument("--interval", type=float, default=5, help="통계 출력 주기(초)")
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.url, args.pid, args.connections, args.ramp_per_second, args.duration, args.interval)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+중복 장소 정리(compaction) 스크립트
+이름 철자나 LLM 좌표가 조금씩 달라 여러 행으로 저장된 같은 장소를 하나로 합치고,
+content_places 연결을 대표 장소로 옮깁니다. cron 등으로 주기적으로 실행할 수 있습니다.
+
+사용 예:
+    python scripts/compact_places.py --dry-run
+    python scripts/compact_places.py --distance-m 150 --similarity 0.5
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.database import AsyncSessionLocal
+from app.services.canonicalizer import (
+    PLACE_MERGE_DISTANCE_M,
+    PLACE_NAME_SIMILARITY,
+    compact_duplicate_places,
+)
+
+
+async def run(distance_m: float, similarity: float, dry_run: bool):
+    async with AsyncSessionLocal() as db:
+        stats = await compact_duplicate_places(db, distance_m, similarity, dry_run=dry_run)
+
+    print(f"🔍 검사한 장소: {stats['scanned']}개")
+    print(f"🔗 병합 그룹: {stats['groups']}개 (중복 장소 {stats['duplicates']}개)")
+    if dry_run:
+        print("ℹ️  --dry-run: 변경 사항을 저장하지 않았습니다.")
+    else:
+        print(f"✅ 연결이 갱신된 콘텐츠: {stats['contents']}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="중복 장소 정리")
+    parser.add_argument("--distance-m", type=float, default=PLACE_MERGE_DISTANCE_M, help="같은 장소로 볼 최대 거리(미터)")
+    parser.add_argument("--similarity", type=float, default=PLACE_NAME_SIMILARITY, help="같은 장소로 볼 최소 이름 유사도(0~1)")
+    parser.add_argument("--dry-run", action="store_true", help="병합 대상만 집계하고 저장하지 않습니다.")
+    args = parser.parse_args()
+    asyncio.run(run(args.distance_m, args.similarity, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
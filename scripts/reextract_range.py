@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+영상 일부 구간 재추출 스크립트
+DB에 저장된 스크립트 구간(Contents.segments)에서 지정한 시간 범위만 다시 LLM으로 추출하고,
+그 범위에서 처음 언급된 장소 연결을 새 결과로 바꿉니다. 영상/자막/음원은 다시 받지 않습니다.
+
+사용 예:
+    python scripts/reextract_range.py --video-id dQw4w9WgXcQ --start 120 --end 300
+    python scripts/reextract_range.py --video-id dQw4w9WgXcQ --start 2:00 --end 5:00
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리로 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tasks import reextract_time_range
+
+
+def parse_seconds(value: str) -> float:
+    """초 단위 숫자 또는 "1:30", "1:02:03" 형식을 초로 바꿉니다."""
+    seconds = 0.0
+    for part in value.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "--:--"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+async def run(video_id: str, start: float, end: float):
+    result = await reextract_time_range(video_id, start, end)
+    if result["status"] != "Completed":
+        print(f"❌ 재추출 실패: {result['message']}")
+        return
+    print(f"✅ {format_seconds(start)} ~ {format_seconds(end)} 구간에서 장소 {len(result['places'])}개를 다시 연결했습니다.")
+    for place in result["places"]:
+        print(f"   [{format_seconds(place['start_seconds'])}] {place['name']} ({place['lat']}, {place['lng']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영상 일부 구간 재추출")
+    parser.add_argument("--video-id", required=True)
+    parser.add_argument("--start", type=parse_seconds, required=True, help="시작 시각 (초 또는 mm:ss)")
+    parser.add_argument("--end", type=parse_seconds, required=True, help="끝 시각 (초 또는 mm:ss, 포함하지 않음)")
+    args = parser.parse_args()
+    if args.end <= args.start:
+        parser.error("--end는 --start보다 커야 합니다.")
+    asyncio.run(run(args.video_id, args.start, args.end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services import canonicalizer  # noqa: E402
+from app.services.canonicalizer import (  # noqa: E402
+    PlaceCandidate,
+    PlaceIndex,
+    canonicalize_locations,
+    compact_duplicate_places,
+    name_similarity,
+    name_trigrams,
+)
+
+# 성수동 기준 좌표. 위도 0.0001도는 약 11m입니다.
+LAT, LNG = 37.5447, 127.0582
+
+
+def _place(place_id, name, lat, lng):
+    return SimpleNamespace(place_id=place_id, name=name, lat=lat, lng=lng)
+
+
+def _similarity(a: str, b: str) -> float:
+    return name_similarity(PlaceCandidate(a, None, None).trigrams, PlaceCandidate(b, None, None).trigrams)
+
+
+def test_name_trigram_similarity():
+    assert name_trigrams("abc") == {"^ab", "abc", "bc$"}
+    assert _similarity("어니언 성수", "어니언성수") == 1.0
+    assert _similarity("어니언 성수", "어니언 성수점") >= 0.5
+    assert _similarity("Onion Seongsu", "Onion Seongsoo") >= 0.5
+    assert _similarity("성수 감자탕", "성수 족발") < 0.5
+    assert name_similarity(frozenset(), name_trigrams("abc")) == 0.0
+
+
+def test_place_index_matches_near_duplicate_within_threshold():
+    index = PlaceIndex(distance_m=150, similarity=0.5)
+    existing = PlaceCandidate("어니언 성수", LAT, LNG, place_id=1)
+    index.add(existing)
+
+    # 약 44m 떨어진 비슷한 철자
+    assert index.find(PlaceCandidate("어니언 성수점", LAT + 0.0004, LNG)) is existing
+    assert index.find(PlaceCandidate("어니언성수", LAT, LNG + 0.0003)) is existing
+
+
+def test_place_index_keeps_places_beyond_thresholds_apart():
+    index = PlaceIndex(distance_m=150, similarity=0.5)
+    index.add(PlaceCandidate("어니언 성수", LAT, LNG, place_id=1))
+
+    # 이름이 같아도 약 330m 떨어져 있으면 다른 장소입니다.
+    assert index.find(PlaceCandidate("어니언 성수", LAT + 0.003, LNG)) is None
+    # 가까워도 이름 유사도가 기준보다 낮으면 다른 장소입니다.
+    assert index.find(PlaceCandidate("성수 족발", LAT + 0.0001, LNG)) is None
+
+
+def test_place_index_prefers_most_similar_then_oldest():
+    index = PlaceIndex(distance_m=150, similarity=0.5)
+    newer = PlaceCandidate("어니언 성수", LAT, LNG, place_id=7)
+    older = PlaceCandidate("어니언 성수", LAT, LNG, place_id=3)
+    partial = PlaceCandidate("어니언 성수점", LAT, LNG, place_id=1)
+    for candidate in (newer, partial, older):
+        index.add(candidate)
+
+    assert index.find(PlaceCandidate("어니언성수", LAT + 0.0001, LNG)) is older
+
+
+def test_place_index_without_coords_needs_same_normalized_name():
+    index = PlaceIndex()
+    existing = PlaceCandidate("대림창고", None, None, place_id=1)
+    index.add(existing)
+
+    assert index.find(PlaceCandidate("대림 창고", None, None)) is existing
+    assert index.find(PlaceCandidate("대림창고 갤러리", None, None)) is None
+
+
+@pytest.fixture
+def stored_places(monkeypatch):
+    places = [
+        _place(1, "어니언 성수", LAT, LNG),
+        _place(2, "대림창고", None, None),
+    ]
+
+    async def find_places_near_points(db, points, radius_m):
+        return [p for p in places if p.lat is not None]
+
+    async def find_places_without_coords(db, normalized_names):
+        return [p for p in places if p.lat is None]
+
+    monkeypatch.setattr(canonicalizer.loc_repo, "find_places_near_points", find_places_near_points)
+    monkeypatch.setattr(canonicalizer.loc_repo, "find_places_without_coords", find_places_without_coords)
+    return places
+
+
+def test_canonicalize_locations_maps_to_existing_places(stored_places):
+    locations = [
+        {"name": "어니언 성수점", "lat": LAT + 0.0004, "lng": LNG, "start_seconds": 30.0},
+        {"name": "어니언 성수", "lat": LAT + 0.003, "lng": LNG, "start_seconds": 60.0},
+        {"name": "대림 창고", "lat": None, "lng": None, "start_seconds": 90.0},
+    ]
+    result = asyncio.run(canonicalize_locations(object(), locations))
+
+    # 기준 안: 기존 장소의 이름과 좌표로 바뀌고 나머지 필드는 유지됩니다.
+    assert result[0] == {"name": "어니언 성수", "lat": LAT, "lng": LNG, "start_seconds": 30.0}
+    # 기준 밖(약 330m): 그대로 둡니다.
+    assert result[1] == locations[1]
+    assert result[2] == {"name": "대림창고", "lat": None, "lng": None, "start_seconds": 90.0}
+
+
+def test_canonicalize_locations_merges_within_batch(stored_places):
+    locations = [
+        {"name": "Cafe Onion Seongsu", "lat": LAT + 0.01, "lng": LNG},
+        {"name": "Cafe Onion Seongsoo", "lat": LAT + 0.0102, "lng": LNG},
+        {"name": ""},
+        "not a dict",
+    ]
+    result = asyncio.run(canonicalize_locations(object(), locations))
+
+    assert len(result) == 2
+    assert result[1]["name"] == "Cafe Onion Seongsu"
+    assert (result[1]["lat"], result[1]["lng"]) == (LAT + 0.01, LNG)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.commits = 0
+
+    async def execute(self, stmt):
+        return FakeResult(self.rows)
+
+    async def commit(self):
+        self.commits += 1
+
+
+COMPACT_ROWS = [
+    _place(1, "어니언 성수", LAT, LNG),
+    _place(2, "대림창고", LAT + 0.01, LNG),
+    _place(3, "어니언 성수점", LAT + 0.0004, LNG),
+    _place(4, "어니언 성수", LAT + 0.003, LNG),
+    _place(5, "대림 창고", LAT + 0.0101, LNG),
+]
+
+
+def test_compact_duplicate_places_dry_run_groups_near_duplicates():
+    db = FakeSession(COMPACT_ROWS)
+    stats = asyncio.run(compact_duplicate_places(db, distance_m=150, similarity=0.5, dry_run=True))
+
+    assert stats == {"scanned": 5, "groups": 2, "duplicates": 2, "contents": 0}
+    assert db.commits == 0
+
+
+def test_compact_duplicate_places_merges_and_invalidates(monkeypatch):
+    pytest.importorskip("cachetools")
+    pytest.importorskip("fastapi")
+    from app.services.places_cache import places_cache
+
+    merges = []
+    invalidated = []
+
+    async def merge_places(db, canonical_id, duplicate_ids):
+        merges.append((canonical_id, duplicate_ids))
+        return {f"video-{canonical_id}"}
+
+    async def invalidate(content_id):
+        invalidated.append(content_id)
+
+    monkeypatch.setattr(canonicalizer.loc_repo, "merge_places", merge_places)
+    monkeypatch.setattr(places_cache, "invalidate", invalidate)
+
+    db = FakeSession(COMPACT_ROWS)
+    stats = asyncio.run(compact_duplicate_places(db, distance_m=150, similarity=0.5))
+
+    # 가장 오래된 장소가 대표가 되고, 330m 떨어진 같은 이름(4)은 합치지 않습니다.
+    assert merges == [(1, [3]), (2, [5])]
+    assert sorted(invalidated) == ["video-1", "video-2"]
+    assert stats["contents"] == 2
+    assert db.commits == 1
@@ -0,0 +1,110 @@
+import importlib.util
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("youtube_transcript_api")
+pytest.importorskip("openai")
+
+from crawlers.youtube import choose_caption_track  # noqa: E402
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+FIXTURE = SCRIPTS_DIR / "fixtures" / "caption_tracks.json"
+
+EXPECTED_SOURCES = {
+    "kr_vlog_manual": "manual:ko",
+    "kr_vlog_auto": "generated:ko",
+    "us_travel_manual_and_auto": "manual:en",
+    "jp_food_auto_only": "translated:ja>ko",
+    "jp_food_manual_only": "translated:ja>en",
+    "th_street_food": "translated:th>ko",
+    "fr_paris_walk": "translated:fr>ko",
+    "es_untranslatable": None,
+    "music_video_no_captions": None,
+    "kr_shorts_no_captions": None,
+    "vi_cafe_tour": "translated:vi>en",
+    "kr_mixed_en_auto": "generated:ko",
+}
+
+
+def _load_videos() -> list[dict]:
+    with open(FIXTURE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _tracks(video: dict) -> list[SimpleNamespace]:
+    return [SimpleNamespace(**track) for track in video["tracks"]]
+
+
+def _track(language_code, is_generated=False, translation_languages=()):
+    return SimpleNamespace(
+        language_code=language_code,
+        is_generated=is_generated,
+        is_translatable=bool(translation_languages),
+        translation_languages=[{"language_code": code} for code in translation_languages],
+    )
+
+
+def _source(tracks, languages=("ko", "en")):
+    choice = choose_caption_track(tracks, list(languages))
+    return choice[2] if choice else None
+
+
+def test_fixture_sources_and_stt_avoidance_rate():
+    spec = importlib.util.spec_from_file_location("bench_caption_negotiation", SCRIPTS_DIR / "bench_caption_negotiation.py")
+    bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bench)
+
+    videos = _load_videos()
+    sources = {video["video_id"]: _source(_tracks(video)) for video in videos}
+    legacy = [bench.legacy_choice(_tracks(video), ["ko", "en"]) for video in videos]
+
+    assert sources == EXPECTED_SOURCES
+    avoided = sum(source is not None for source in sources.values())
+    assert avoided / len(videos) == pytest.approx(9 / 12)
+    # 기존 방식(ko/en 자막만 사용)보다 STT를 덜 거칩니다.
+    assert sum(choice is not None for choice in legacy) == 4
+    assert avoided > sum(choice is not None for choice in legacy)
+
+
+def test_manual_beats_generated_beats_translated():
+    manual_en = _track("en")
+    generated_ko = _track("ko", is_generated=True)
+    manual_ja = _track("ja", translation_languages=["ko"])
+
+    # 선호 언어 순서보다 수동 자막이 먼저입니다.
+    assert _source([generated_ko, manual_en, manual_ja]) == "manual:en"
+    assert _source([manual_ja, generated_ko]) == "generated:ko"
+    assert _source([manual_ja]) == "translated:ja>ko"
+
+
+def test_translation_prefers_manual_then_language_order():
+    generated_th = _track("th", is_generated=True, translation_languages=["ko", "en"])
+    manual_ja = _track("ja", translation_languages=["en"])
+    manual_fr = _track("fr", translation_languages=["ko"])
+
+    assert _source([generated_th, manual_ja]) == "translated:ja>en"
+    assert _source([generated_th, manual_ja, manual_fr]) == "translated:fr>ko"
+
+    track, target_language, source = choose_caption_track([generated_th], ["ko", "en"])
+    assert track is generated_th
+    assert target_language == "ko"
+    assert source == "translated:th>ko"
+
+
+def test_exact_match_has_no_target_language_and_region_is_ignored():
+    manual_us = _track("en-US")
+    track, target_language, source = choose_caption_track([manual_us], ["ko", "en"])
+    assert track is manual_us
+    assert target_language is None
+    assert source == "manual:en"
+
+
+def test_no_usable_track_returns_none():
+    untranslatable = SimpleNamespace(
+        language_code="es", is_generated=False, is_translatable=False, translation_languages=[]
+    )
+    assert choose_caption_track([], ["ko", "en"]) is None
+    assert choose_caption_track([untranslatable], ["ko", "en"]) is None
@@ -0,0 +1,87 @@
+from nlp.chunking import (
+    CHARS_PER_TOKEN,
+    merge_locations,
+    normalize_name,
+    split_transcript,
+    split_transcript_spans,
+)
+
+TRANSCRIPT = "오늘은   성수동에\n왔어요 첫 번째는 대림창고 카페인데요 다음은 어니언 성수 그리고 마지막으로 성수 감자탕 입니다"
+
+
+def test_short_transcript_is_single_span():
+    normalized = " ".join(TRANSCRIPT.split())
+    assert split_transcript_spans(TRANSCRIPT, max_tokens=10_000) == [(0, len(normalized))]
+    assert split_transcript(TRANSCRIPT, max_tokens=10_000) == [TRANSCRIPT]
+
+
+def test_spans_cover_normalized_text_with_overlap():
+    max_tokens, overlap_tokens = 10, 3
+    normalized = " ".join(TRANSCRIPT.split())
+    spans = split_transcript_spans(TRANSCRIPT, max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+
+    assert len(spans) > 2
+    assert spans[0][0] == 0
+    assert spans[-1][1] == len(normalized)
+    for (prev_start, prev_end), (start, end) in zip(spans, spans[1:]):
+        # 다음 청크는 앞 청크 안에서 시작해 끊김 없이 이어지고, 항상 앞으로 전진합니다.
+        assert prev_start < start <= prev_end
+        assert prev_end - start <= overlap_tokens * CHARS_PER_TOKEN
+        assert end > prev_end
+    for start, end in spans:
+        # 단어 중간에서 자르지 않습니다.
+        assert start == 0 or normalized[start - 1] == " "
+        assert end == len(normalized) or normalized[end] == " "
+        assert end - start <= max_tokens * CHARS_PER_TOKEN or " " not in normalized[start:end]
+
+    chunks = split_transcript(TRANSCRIPT, max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+    assert chunks == [normalized[start:end] for start, end in spans]
+
+
+def test_overlapping_chunks_merge_to_one_place_with_earliest_start():
+    partials = [
+        [{"name": "대림창고", "lat": 37.5418, "lng": 127.0566, "start_seconds": 42.0}],
+        [
+            {"name": "대림창고", "lat": 37.5419, "lng": 127.0567, "start_seconds": 12.5},
+            {"name": "어니언 성수", "lat": 37.5447, "lng": 127.0582, "start_seconds": 80.0},
+        ],
+    ]
+    merged = merge_locations(partials)
+
+    assert [loc["name"] for loc in merged] == ["대림창고", "어니언 성수"]
+    assert merged[0]["start_seconds"] == 12.5
+    # 좌표는 처음 등장한 항목의 값을 유지합니다.
+    assert (merged[0]["lat"], merged[0]["lng"]) == (37.5418, 127.0566)
+
+
+def test_merge_keeps_same_name_far_apart_as_separate_places():
+    partials = [
+        [{"name": "스타벅스", "lat": 37.5447, "lng": 127.0558}],
+        [{"name": "스타벅스", "lat": 37.4979, "lng": 127.0276}],
+    ]
+    assert len(merge_locations(partials)) == 2
+
+
+def test_merge_fills_missing_coords_and_start():
+    partials = [
+        [{"name": "성수 감자탕", "lat": None, "lng": None, "start_seconds": None}],
+        [{"name": "성수감자탕", "lat": 37.5446, "lng": 127.0557, "start_seconds": 95.0}],
+    ]
+    assert merge_locations(partials) == [
+        {"name": "성수 감자탕", "lat": 37.5446, "lng": 127.0557, "start_seconds": 95.0}
+    ]
+
+
+def test_names_that_normalize_alike_dedupe():
+    assert normalize_name("Onion  Seongsu!") == normalize_name("onion-seongsu")
+    assert normalize_name("ＣＡＦＥ　Ｏｎｉｏｎ") == normalize_name("cafe onion")
+    assert normalize_name("대림 창고") == normalize_name("대림창고")
+
+    partials = [
+        [{"name": "Onion Seongsu", "lat": 37.5447, "lng": 127.0582}],
+        [{"name": "onion-seongsu", "lat": 37.5447, "lng": 127.0582}],
+        [{"name": "ONION_SEONGSU", "lat": None, "lng": None}],
+    ]
+    merged = merge_locations(partials)
+    assert len(merged) == 1
+    assert merged[0]["name"] == "Onion Seongsu"
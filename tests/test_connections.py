@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.services import connections  # noqa: E402
+from app.services.connections import Connection, ConnectionManager  # noqa: E402
+
+
+class FakeWebSocket:
+    """보낸 프레임과 종료 코드를 기록하는 WebSocket 대용입니다."""
+
+    def __init__(self, send_delay: float = 0.0):
+        self.send_delay = send_delay
+        self.sent: list[dict] = []
+        self.accepted = False
+        self.close_code: int | None = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, text: str):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+async def _drain(connection: Connection):
+    """writer Task가 대기열을 모두 보낼 때까지 기다립니다."""
+    for _ in range(100):
+        if not connection._frames:
+            break
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+def test_processing_frames_for_one_key_collapse_to_latest():
+    async def scenario():
+        websocket = FakeWebSocket()
+        connection = Connection("c1", websocket)
+        for progress in (10, 20, 30, 40):
+            assert connection.send({"status": "processing", "progress": progress}, key="video")
+        queued = len(connection._frames)
+        connection.start()
+        await _drain(connection)
+        await connection.close()
+        return websocket, connection, queued
+
+    websocket, connection, queued = asyncio.run(scenario())
+    assert queued == 1
+    assert connection.coalesced == 3
+    assert websocket.sent == [{"status": "processing", "progress": 40}]
+
+
+def test_other_frames_keep_their_order():
+    async def scenario():
+        websocket = FakeWebSocket()
+        connection = Connection("c1", websocket)
+        connection.send({"status": "queued", "job_id": "a"}, key="video")
+        connection.send({"status": "processing", "progress": 10}, key="video")
+        connection.send({"status": "processing", "progress": 10}, key="other")
+        connection.send({"status": "log", "message": "자막 다운로드"}, key="video")
+        connection.send({"status": "processing", "progress": 60}, key="video")
+        connection.send({"status": "completed", "places": []}, key="video")
+        connection.send({"status": "completed", "places": []}, key="video")
+        connection.start()
+        await _drain(connection)
+        await connection.close()
+        return websocket
+
+    websocket = asyncio.run(scenario())
+    assert websocket.sent == [
+        {"status": "queued", "job_id": "a"},
+        # 합쳐진 진행률 프레임은 처음 들어간 자리에서 최신 값으로 전송됩니다.
+        {"status": "processing", "progress": 60},
+        {"status": "processing", "progress": 10},
+        {"status": "log", "message": "자막 다운로드"},
+        {"status": "completed", "places": []},
+        {"status": "completed", "places": []},
+    ]
+
+
+def test_sent_slot_is_not_reused():
+    async def scenario():
+        websocket = FakeWebSocket()
+        connection = Connection("c1", websocket)
+        connection.start()
+        connection.send({"status": "processing", "progress": 10}, key="video")
+        await _drain(connection)
+        connection.send({"status": "processing", "progress": 20}, key="video")
+        await _drain(connection)
+        await connection.close()
+        return websocket
+
+    # 이미 전송된 프레임은 대체하지 않고 새 프레임으로 보냅니다.
+    assert [frame["progress"] for frame in asyncio.run(scenario()).sent] == [10, 20]
+
+
+def test_full_queue_drops_progress_but_rejects_other_frames():
+    connection = Connection("c1", FakeWebSocket(), max_queue_size=2)
+    assert connection.send({"status": "log", "message": "1"})
+    assert connection.send({"status": "log", "message": "2"})
+    assert connection.send({"status": "processing", "progress": 50}, key="video")
+    assert connection.coalesced == 1
+    assert not connection.send({"status": "completed"})
+
+
+def test_send_timeout_closes_connection(monkeypatch):
+    monkeypatch.setattr(connections, "WS_SEND_TIMEOUT_SECONDS", 0.01)
+
+    async def scenario():
+        websocket = FakeWebSocket(send_delay=1.0)
+        connection = Connection("c1", websocket)
+        connection.start()
+        connection.send({"status": "completed"})
+        await asyncio.wait_for(connection._writer, 1.0)
+        return websocket, connection, connection.send({"status": "completed"})
+
+    websocket, connection, accepted_after_close = asyncio.run(scenario())
+    assert connection.closed
+    assert websocket.close_code == 1011
+    assert websocket.sent == []
+    assert not accepted_after_close
+
+
+def test_reaper_evicts_idle_connections():
+    async def scenario():
+        manager = ConnectionManager(ping_interval=0.01, idle_timeout=60)
+        idle_ws, busy_ws = FakeWebSocket(), FakeWebSocket()
+        idle = await manager.connect(idle_ws, "idle")
+        busy = await manager.connect(busy_ws, "busy")
+        # 처리 중인 작업이 있는 연결은 오래 조용해도 끊지 않습니다.
+        release = asyncio.Event()
+        manager.run("busy", release.wait())
+        idle.last_seen -= 120
+        busy.last_seen -= 120
+
+        for _ in range(100):
+            if "idle" not in manager.active_connections and busy_ws.sent:
+                break
+            await asyncio.sleep(0.01)
+        active = set(manager.active_connections)
+
+        release.set()
+        await manager.disconnect("busy")
+        await asyncio.wait_for(manager._reaper, 1.0)
+        return idle_ws, busy_ws, idle, active
+
+    idle_ws, busy_ws, idle, active = asyncio.run(scenario())
+    assert active == {"busy"}
+    assert idle.closed
+    assert idle_ws.close_code == 1001
+    assert {"status": "ping"} in busy_ws.sent
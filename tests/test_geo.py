@@ -0,0 +1,89 @@
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+from app.utils.geo import (
+    GEOHASH_MAX_CELLS,
+    GEOHASH_PRECISION,
+    bbox_around,
+    geohash_cover,
+    geohash_encode,
+    geohash_prefix_upper_bound,
+    haversine_m,
+)
+
+MIGRATION = Path(__file__).resolve().parents[1] / "migrations" / "versions" / "f3a8c1d94b27_add_places_geohash.py"
+
+
+def test_geohash_encode_known_values():
+    # 널리 쓰이는 geohash 예시 좌표 (Jutland, Denmark)
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash_encode(37.5418, 127.0566).startswith("wydm")
+    assert len(geohash_encode(37.5418, 127.0566)) == GEOHASH_PRECISION
+    # 짧은 정밀도는 긴 정밀도의 접두사입니다.
+    assert geohash_encode(37.5418, 127.0566).startswith(geohash_encode(37.5418, 127.0566, 5))
+
+
+def test_geohash_prefix_upper_bound():
+    assert geohash_prefix_upper_bound("wydm") == "wydn"
+    assert geohash_prefix_upper_bound("wydz") == "wye"
+    assert geohash_prefix_upper_bound("zz") is None
+
+
+def _assert_cover_contains(min_lat, min_lng, max_lat, max_lng, rng, samples=500):
+    cells = geohash_cover(min_lat, min_lng, max_lat, max_lng)
+    assert 0 < len(cells) <= GEOHASH_MAX_CELLS
+    corners = [(min_lat, min_lng), (min_lat, max_lng), (max_lat, min_lng), (max_lat, max_lng)]
+    points = corners + [
+        (rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)) for _ in range(samples)
+    ]
+    for lat, lng in points:
+        geohash = geohash_encode(lat, lng)
+        assert any(geohash.startswith(cell) for cell in cells), (lat, lng, geohash, cells)
+
+
+@pytest.mark.parametrize(
+    "lat, lng, radius_m",
+    [
+        (37.5418, 127.0566, 50),
+        (37.5418, 127.0566, 1_000),
+        (37.5418, 127.0566, 30_000),
+        # geohash 셀 경계(적도, 본초 자오선)에 걸친 영역
+        (0.0, 0.0, 2_000),
+        (-33.8688, 151.2093, 5_000),
+        (64.1466, -21.9426, 10_000),
+    ],
+)
+def test_geohash_cover_misses_no_points(lat, lng, radius_m):
+    rng = random.Random(f"{lat},{lng},{radius_m}")
+    _assert_cover_contains(*bbox_around(lat, lng, radius_m), rng)
+
+
+def test_geohash_cover_clamps_to_world_bounds():
+    rng = random.Random(0)
+    _assert_cover_contains(85.0, 170.0, 90.0, 180.0, rng)
+    assert geohash_cover(-100.0, -200.0, 100.0, 200.0)
+
+
+def test_bbox_around_contains_radius():
+    lat, lng, radius_m = 37.5418, 127.0566, 1_000
+    min_lat, min_lng, max_lat, max_lng = bbox_around(lat, lng, radius_m)
+    assert haversine_m(lat, lng, max_lat, lng) == pytest.approx(radius_m, rel=1e-6)
+    assert haversine_m(lat, lng, lat, max_lng) >= radius_m * (1 - 1e-6)
+    assert min_lat < lat < max_lat and min_lng < lng < max_lng
+
+
+def test_migration_encoder_matches_app_encoder():
+    pytest.importorskip("alembic")
+    pytest.importorskip("sqlalchemy")
+    spec = importlib.util.spec_from_file_location("geohash_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    assert migration.GEOHASH_PRECISION == GEOHASH_PRECISION
+    rng = random.Random(1)
+    for _ in range(200):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        assert migration.geohash_encode(lat, lng) == geohash_encode(lat, lng)
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from app.services.jobs import JobQueue, JobStatus, MemoryJobStore, QueueFullError
+
+
+class RecordingStore(MemoryJobStore):
+    """저장될 때마다 작업 상태를 기록하는 저장소입니다."""
+
+    def __init__(self):
+        super().__init__()
+        self.history: list[tuple[str, str]] = []
+
+    async def save(self, job):
+        self.history.append((job.job_id, job.status))
+        await super().save(job)
+
+
+def test_full_queue_raises_queue_full_error():
+    async def scenario():
+        async def handler(url, user_id, subscriber):
+            return url
+
+        # 워커를 시작하지 않았으므로 대기열이 비워지지 않습니다.
+        queue = JobQueue(handler, workers=1, max_queue_size=2)
+        await queue.submit("https://youtu.be/a")
+        await queue.submit("https://youtu.be/b")
+        with pytest.raises(QueueFullError):
+            await queue.submit("https://youtu.be/c")
+        return queue.qsize()
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_job_moves_queued_running_completed():
+    async def scenario():
+        calls = []
+
+        async def handler(url, user_id, subscriber):
+            calls.append((url, user_id))
+            return {"places": [url]}
+
+        store = RecordingStore()
+        queue = JobQueue(handler, workers=1, max_queue_size=4, store=store)
+        job = await queue.submit("https://youtu.be/a", user_id=7)
+        await queue.start()
+        try:
+            result = await queue.wait(job)
+        finally:
+            await queue.stop()
+        return job, result, calls, store
+
+    job, result, calls, store = asyncio.run(scenario())
+    assert result == {"places": ["https://youtu.be/a"]}
+    assert calls == [("https://youtu.be/a", 7)]
+    assert [status for job_id, status in store.history if job_id == job.job_id] == [
+        JobStatus.QUEUED,
+        JobStatus.RUNNING,
+        JobStatus.COMPLETED,
+    ]
+    assert job.started_at <= job.finished_at
+    assert asyncio.run(store.get(job.job_id))["status"] == JobStatus.COMPLETED
+
+
+def test_handler_exception_surfaces_from_wait():
+    async def scenario():
+        async def handler(url, user_id, subscriber):
+            raise ValueError("자막을 찾을 수 없습니다")
+
+        queue = JobQueue(handler, workers=1, max_queue_size=4)
+        await queue.start()
+        try:
+            job = await queue.submit("https://youtu.be/a")
+            with pytest.raises(RuntimeError) as exc_info:
+                await queue.wait(job)
+        finally:
+            await queue.stop()
+        return job, exc_info.value
+
+    job, error = asyncio.run(scenario())
+    assert job.status == JobStatus.FAILED
+    assert str(error) == "ValueError: 자막을 찾을 수 없습니다"
+
+
+def test_worker_keeps_running_after_failed_job():
+    async def scenario():
+        async def handler(url, user_id, subscriber):
+            if url.endswith("bad"):
+                raise ValueError("bad url")
+            return url
+
+        queue = JobQueue(handler, workers=1, max_queue_size=4)
+        await queue.start()
+        try:
+            bad = await queue.submit("https://youtu.be/bad")
+            good = await queue.submit("https://youtu.be/good")
+            with pytest.raises(RuntimeError):
+                await queue.wait(bad)
+            return await queue.wait(good)
+        finally:
+            await queue.stop()
+
+    assert asyncio.run(scenario()) == "https://youtu.be/good"
+
+
+def test_stop_drains_workers():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def handler(url, user_id, subscriber):
+            started.set()
+            await asyncio.Event().wait()
+
+        queue = JobQueue(handler, workers=2, max_queue_size=4)
+        await queue.start()
+        worker_tasks = list(queue._worker_tasks)
+        job = await queue.submit("https://youtu.be/a")
+        await started.wait()
+        await queue.stop()
+        with pytest.raises(RuntimeError) as exc_info:
+            await queue.wait(job)
+        return worker_tasks, queue, job, exc_info.value
+
+    worker_tasks, queue, job, error = asyncio.run(scenario())
+    assert len(worker_tasks) == 2
+    assert all(task.done() for task in worker_tasks)
+    assert queue._worker_tasks == []
+    # 실행 중이던 작업은 기다리는 쪽이 멈추지 않도록 실패로 마무리됩니다.
+    assert job.status == JobStatus.FAILED
+    assert job.done.is_set()
+    assert str(error) == "작업이 취소되었습니다."
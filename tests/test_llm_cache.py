@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import pytest
+
+from nlp import llm_cache
+from nlp.llm_cache import LLMResultCache, SQLiteCacheBackend, make_cache_key
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_cache, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteCacheBackend(str(tmp_path / "llm_cache.sqlite3"))
+
+
+def _keys(backend: SQLiteCacheBackend) -> set[str]:
+    return {row[0] for row in backend._conn.execute("SELECT cache_key FROM llm_cache")}
+
+
+def test_make_cache_key_is_stable():
+    key = make_cache_key("오늘은 대림창고에 왔어요", "prompt {transcript}", "gemini-2.5-flash")
+    assert key == make_cache_key("오늘은 대림창고에 왔어요", "prompt {transcript}", "gemini-2.5-flash")
+    # 프로세스가 바뀌어도 같은 키가 되도록 hash() 대신 sha256을 씁니다.
+    transcript_hash, prompt_hash, model_name = key.split(":")
+    assert len(transcript_hash) == 64 and len(prompt_hash) == 16
+    assert model_name == "gemini-2.5-flash"
+
+
+def test_make_cache_key_changes_with_each_input():
+    base = make_cache_key("transcript", "prompt", "model-a")
+    assert make_cache_key("transcript!", "prompt", "model-a") != base
+    assert make_cache_key("transcript", "prompt v2", "model-a") != base
+    assert make_cache_key("transcript", "prompt", "model-b") != base
+
+
+def test_ttl_expiry_deletes_entry(backend, clock):
+    asyncio.run(backend.set("k", "[]", max_entries=10))
+    clock.now += 59
+    assert asyncio.run(backend.get("k", ttl_seconds=60)) == "[]"
+    clock.now += 2
+    assert asyncio.run(backend.get("k", ttl_seconds=60)) is None
+    assert _keys(backend) == set()
+
+
+def test_lru_eviction_by_entry_count(backend, clock):
+    for key in ("a", "b", "c"):
+        asyncio.run(backend.set(key, "[]", max_entries=3))
+        clock.now += 1
+    # a를 최근에 사용했으므로 가장 오래 사용하지 않은 b가 제거됩니다.
+    assert asyncio.run(backend.get("a", ttl_seconds=3600)) == "[]"
+    clock.now += 1
+    asyncio.run(backend.set("d", "[]", max_entries=3))
+    assert _keys(backend) == {"a", "c", "d"}
+
+
+def test_lru_eviction_by_bytes(backend, clock):
+    value = json.dumps([{"name": "대림창고"}], ensure_ascii=False)
+    size = len(value.encode("utf-8"))
+    for key in ("a", "b", "c"):
+        asyncio.run(backend.set(key, value, max_entries=100, max_bytes=size * 3))
+        clock.now += 1
+    assert _keys(backend) == {"a", "b", "c"}
+
+    asyncio.run(backend.get("a", ttl_seconds=3600))
+    clock.now += 1
+    # UTF-8 바이트 기준이므로 한글 값은 글자 수보다 크게 계산됩니다.
+    asyncio.run(backend.set("d", value, max_entries=100, max_bytes=size * 3))
+    assert _keys(backend) == {"a", "c", "d"}
+
+
+def test_result_cache_round_trip_and_stats(backend, clock):
+    cache = LLMResultCache(backend, ttl_seconds=60, max_entries=10, max_bytes=1024)
+    locations = [{"name": "대림창고", "lat": 37.54, "lng": 127.05}]
+
+    assert asyncio.run(cache.get("k")) is None
+    asyncio.run(cache.set("k", locations))
+    assert asyncio.run(cache.get("k")) == locations
+    assert cache.stats() == {"hits": 1, "misses": 1, "errors": 0}
@@ -0,0 +1,39 @@
+import pytest
+
+from nlp.segments import TranscriptSegments
+
+
+def _hangul_segments() -> TranscriptSegments:
+    return TranscriptSegments(
+        [0.0, 4.0, 9.5, 15.0],
+        [4.0, 5.5, 5.5, 3.0],
+        ["안녕하세요 오늘은 약수동에 왔어요", "첫 번째는 펑미분식이라는", "분식집인데 떡볶이가 유명해요", "다음은 대한국밥"],
+    )
+
+
+def test_find_name_hangul_transcript():
+    segments = _hangul_segments()
+    assert segments.find_name("펑미분식") == 4.0
+    assert segments.find_name("대한 국밥") == 15.0
+
+
+def test_find_name_romanized_name_misses_hangul_transcript():
+    segments = _hangul_segments()
+    assert segments.find_name("Fengmi Bunsik") is None
+    assert segments.find_name("Daehan Gukbap") is None
+
+
+def test_with_timestamps_leaves_unmatched_romanized_names_empty():
+    pytest.importorskip("google.genai")
+    from nlp.gemini_location import _with_timestamps
+
+    segments = _hangul_segments()
+    locations = [
+        {"name": "Fengmi Bunsik", "lat": 37.55, "lng": 127.01},
+        {"name": "대한국밥", "lat": None, "lng": None},
+    ]
+    timestamped = _with_timestamps(locations, segments, (0, len(segments.text)))
+
+    # 이름을 찾지 못한 장소에 청크 시작 시각(0초)을 붙이면 클라이언트가 잘못된 위치로 이동합니다.
+    assert timestamped[0]["start_seconds"] is None
+    assert timestamped[1]["start_seconds"] == 15.0
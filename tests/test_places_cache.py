@@ -0,0 +1,154 @@
+import asyncio
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cachetools")
+pytest.importorskip("fastapi")
+
+from app.services.places_cache import CachedPlaces, PlacesCache, etag_matches  # noqa: E402
+
+
+class InMemoryPlacesTier:
+    """RedisPlacesTier와 같은 인터페이스의 메모리 구현입니다. (원격 계층 대용)"""
+
+    def __init__(self):
+        self._data: dict[str, bytes] = {}
+        self.gets = 0
+
+    async def get(self, key: str) -> bytes | None:
+        self.gets += 1
+        return self._data.get(key)
+
+    async def set(self, key: str, body: bytes):
+        self._data[key] = body
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+
+class FailingPlacesTier:
+    """모든 호출이 실패하는 원격 계층입니다. (Redis 장애 상황)"""
+
+    async def get(self, key: str) -> bytes | None:
+        raise ConnectionError("redis unavailable")
+
+    async def set(self, key: str, body: bytes):
+        raise ConnectionError("redis unavailable")
+
+    async def delete(self, key: str):
+        raise ConnectionError("redis unavailable")
+
+
+class FakePlacesDB:
+    """content_id별 [(Places, start_seconds)]를 돌려주는 DB 대용입니다."""
+
+    def __init__(self, rows: dict[str, list[tuple[str, float, float, float | None]]]):
+        self.rows = rows
+        self.queries = 0
+
+    async def get_places_with_start_by_content_id(self, db, content_id: str):
+        self.queries += 1
+        return [
+            (SimpleNamespace(name=name, lat=lat, lng=lng), start)
+            for name, lat, lng, start in self.rows.get(content_id, [])
+        ]
+
+
+@pytest.fixture
+def places_db(monkeypatch):
+    fake = FakePlacesDB({"video": [("대림창고", 37.5418, 127.0566, 12.5)]})
+    module = types.ModuleType("app.repositories.locations")
+    module.get_places_with_start_by_content_id = fake.get_places_with_start_by_content_id
+    monkeypatch.setitem(sys.modules, "app.repositories.locations", module)
+    return fake
+
+
+PLACE = {"name": "대림창고", "lat": 37.5418, "lng": 127.0566, "start_seconds": 12.5}
+
+
+def test_local_lru_hit_skips_remote_and_db(places_db):
+    async def scenario():
+        remote = InMemoryPlacesTier()
+        cache = PlacesCache(remote=remote)
+        first = await cache.get_or_load(object(), "video")
+        second = await cache.get_or_load(object(), "video")
+        return remote, first, second
+
+    remote, first, second = asyncio.run(scenario())
+    assert second is first
+    assert first.places == [PLACE]
+    assert places_db.queries == 1
+    # 첫 조회에서만 원격 계층을 확인합니다.
+    assert remote.gets == 1
+
+
+def test_local_miss_falls_back_to_remote_tier(places_db):
+    async def scenario():
+        remote = InMemoryPlacesTier()
+        # 다른 프로세스가 채운 원격 계층만 있는 상황입니다.
+        await PlacesCache(remote=remote).set("video", [PLACE])
+        cache = PlacesCache(remote=remote)
+        entry = await cache.get_or_load(object(), "video")
+        return cache, entry
+
+    cache, entry = asyncio.run(scenario())
+    assert entry.places == [PLACE]
+    assert places_db.queries == 0
+    # 원격 계층에서 읽은 값은 로컬 계층에도 채워집니다.
+    assert cache._local["video"] is entry
+
+
+def test_remote_errors_fall_back_to_db(places_db):
+    async def scenario():
+        cache = PlacesCache(remote=FailingPlacesTier())
+        entry = await cache.get_or_load(object(), "video")
+        await cache.invalidate("video")
+        return entry
+
+    entry = asyncio.run(scenario())
+    assert entry.places == [PLACE]
+    assert places_db.queries == 1
+
+
+def test_empty_result_is_not_cached(places_db):
+    async def scenario():
+        cache = PlacesCache()
+        first = await cache.get_or_load(object(), "unknown")
+        second = await cache.get_or_load(object(), "unknown")
+        return first, second
+
+    assert asyncio.run(scenario()) == (None, None)
+    assert places_db.queries == 2
+
+
+def test_etag_matches_returns_304_condition():
+    entry = CachedPlaces.from_places([PLACE])
+    assert etag_matches(entry.etag, entry.etag)
+    assert etag_matches(f'"other", W/{entry.etag}', entry.etag)
+    assert etag_matches("*", entry.etag)
+    assert not etag_matches(None, entry.etag)
+    assert not etag_matches('"stale"', entry.etag)
+    # 내용이 같으면 ETag도 같아 클라이언트가 계속 304를 받습니다.
+    assert CachedPlaces.from_places([dict(PLACE)]).etag == entry.etag
+
+
+def test_reload_after_commit_replaces_stale_entry(places_db):
+    async def scenario():
+        remote = InMemoryPlacesTier()
+        cache = PlacesCache(remote=remote)
+        # 저장이 커밋되기 전에 들어온 조회가 이전 장소 목록을 캐시합니다.
+        stale = await cache.get_or_load(object(), "video")
+
+        places_db.rows["video"].append(("어니언 성수", 37.5447, 127.0582, 80.0))
+        fresh = await cache.reload(object(), "video")
+        return remote, stale, fresh, await cache.get("video"), await PlacesCache(remote=remote).get("video")
+
+    remote, stale, fresh, local, from_remote = asyncio.run(scenario())
+    assert [p["name"] for p in fresh.places] == ["대림창고", "어니언 성수"]
+    assert fresh.etag != stale.etag
+    assert not etag_matches(stale.etag, fresh.etag)
+    assert local is fresh
+    assert from_remote.etag == fresh.etag
@@ -0,0 +1,77 @@
+from nlp.preprocess import (
+    collapse_repeats,
+    merge_caption_segments,
+    preprocess_segments,
+    preprocess_transcript,
+    strip_noise,
+    trim_overlaps,
+)
+from nlp.segments import TranscriptSegments
+
+
+def test_collapse_repeats_keeps_one_of_three_or_more():
+    assert collapse_repeats("진짜 진짜 진짜 맛있다") == "진짜 맛있다"
+    assert collapse_repeats("너무 맛있다 너무 맛있다 너무 맛있다 여기") == "너무 맛있다 여기"
+    assert collapse_repeats("Wow, wow wow!") == "Wow,"
+
+
+def test_collapse_repeats_keeps_reduplicated_names():
+    assert collapse_repeats("Bora Bora Cafe") == "Bora Bora Cafe"
+    assert collapse_repeats("쏘쏘 식당 가요") == "쏘쏘 식당 가요"
+    assert collapse_repeats("진짜 진짜 맛있다") == "진짜 진짜 맛있다"
+
+
+def test_strip_noise_removes_tags_and_fillers_only():
+    text = "[음악] 음 오늘은 >> 어 (박수) 성수동에 왔어요 ㅋㅋㅋ um you know 오 번 출구"
+    # 한 글자 "오"(숫자 5)는 필러로 지우지 않습니다.
+    assert strip_noise(text) == "오늘은 성수동에 왔어요 오 번 출구"
+
+
+def test_trim_overlaps_removes_rolling_caption_overlap():
+    texts = ["오늘은 성수동에", "성수동에 있는 카페", "있는 카페", "대림창고에 왔어요"]
+    # 구간 수와 순서는 그대로이고, 전부 겹친 구간은 빈 문자열이 됩니다.
+    assert trim_overlaps(texts) == ["오늘은 성수동에", "있는 카페", "", "대림창고에 왔어요"]
+    assert merge_caption_segments(texts) == "오늘은 성수동에 있는 카페 대림창고에 왔어요"
+
+
+def test_trim_overlaps_ignores_case_and_punctuation():
+    assert trim_overlaps(["We are in Seongsu.", "seongsu, near the station"]) == [
+        "We are in Seongsu.",
+        "near the station",
+    ]
+    assert trim_overlaps(["a b c", "c d"], max_overlap_words=0) == ["a b c", "c d"]
+
+
+def test_preprocess_transcript_reports_reduction():
+    result = preprocess_transcript("[음악] 진짜 진짜 진짜 맛있다 음 어 ㅋㅋㅋ", place_filter=False)
+    assert result.text == "진짜 맛있다"
+    assert 0 < result.reduction < 1
+
+
+def test_preprocess_segments_keeps_text_in_sync_with_segments():
+    segments = TranscriptSegments(
+        [0.0, 2.0, 4.0, 6.0, 8.0],
+        [2.0, 2.0, 2.0, 2.0, 2.0],
+        ["[음악]", "오늘은 성수동에", "성수동에 있는 카페", "진짜 진짜 진짜 맛있다", "있는 카페 대림창고"],
+    )
+    result = preprocess_segments(segments, place_filter=False)
+
+    assert result.segments.text == result.text
+    assert result.text == "오늘은 성수동에 있는 카페 진짜 맛있다 있는 카페 대림창고"
+    # 남은 텍스트의 위치를 원래 구간 시각으로 되돌릴 수 있습니다.
+    assert result.segments.find_name("대림창고") == 8.0
+    assert result.segments.find_name("카페") == 4.0
+    assert result.tokens < result.original_tokens
+
+
+def test_preprocess_segments_place_filter_keeps_text_in_sync():
+    segments = TranscriptSegments(
+        [0.0, 30.0, 60.0, 120.0],
+        [5.0, 5.0, 5.0, 5.0],
+        ["안녕하세요 여러분", "오늘 날씨가 좋네요", "여기 카페 이름은 어니언이에요", "구독 좋아요 부탁드려요"],
+    )
+    result = preprocess_segments(segments, place_filter=True)
+
+    assert result.segments.text == result.text
+    assert "어니언" in result.text
+    assert "구독" not in result.text
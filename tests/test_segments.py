@@ -0,0 +1,83 @@
+import zlib
+
+import pytest
+
+from nlp.segments import TranscriptSegments
+
+
+def _segments() -> TranscriptSegments:
+    return TranscriptSegments(
+        [0.0, 4.0, 9.5, 15.0],
+        [4.0, 5.5, 5.5, 3.0],
+        ["안녕하세요 오늘은 약수동에 왔어요", "첫 번째는 펑미분식이라는", "분식집인데 떡볶이가 유명해요", "다음은 대한국밥"],
+    )
+
+
+def _round_trip(segments: TranscriptSegments) -> TranscriptSegments:
+    return TranscriptSegments.unpack(segments.pack())
+
+
+def test_pack_unpack_round_trip():
+    segments = _segments()
+    restored = _round_trip(segments)
+    assert restored.to_dicts() == segments.to_dicts()
+    assert restored.text == segments.text
+
+
+def test_pack_unpack_unicode_texts():
+    segments = TranscriptSegments(
+        [0.0, 1.25, 2.5, 3.75],
+        [1.25, 1.25, 1.25, 1.25],
+        ["Café ☕ 성수", "東京 ラーメン", "emoji 🍜🍣 time", "ｆｕｌｌｗｉｄｔｈ  and\ttabs"],
+    )
+    restored = _round_trip(segments)
+    assert restored.texts == ["Café ☕ 성수", "東京 ラーメン", "emoji 🍜🍣 time", "ｆｕｌｌｗｉｄｔｈ and tabs"]
+    assert restored.to_dicts() == segments.to_dicts()
+
+
+def test_pack_unpack_empty():
+    assert len(_round_trip(TranscriptSegments())) == 0
+    # 빈 텍스트 구간은 저장 전에 빠집니다.
+    restored = _round_trip(TranscriptSegments([0.0, 1.0, 2.0], [1.0, 1.0, 1.0], ["", "  ", "안녕"]))
+    assert restored.to_dicts() == [{"start": 2.0, "duration": 1.0, "text": "안녕"}]
+
+
+def test_pack_rounds_times_to_milliseconds():
+    restored = _round_trip(TranscriptSegments([1.23456], [0.0004], ["a"]))
+    assert restored.starts[0] == 1.235
+    assert restored.durations[0] == 0.0
+
+
+def test_unpack_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        TranscriptSegments.unpack(zlib.compress(b"XXXX\x00\x00\x00\x00"))
+
+
+def _starts(segments: TranscriptSegments) -> list[float]:
+    return list(segments.starts)
+
+
+def test_between_is_half_open():
+    segments = _segments()  # [0, 4), [4, 9.5), [9.5, 15), [15, 18)
+    assert _starts(segments.between(4.0, 9.5)) == [4.0]
+    assert _starts(segments.between(0.0, 4.0)) == [0.0]
+    assert _starts(segments.between(3.999, 4.0)) == [0.0]
+    assert _starts(segments.between(3.999, 4.001)) == [0.0, 4.0]
+    assert _starts(segments.between(18.0, 30.0)) == []
+    assert _starts(segments.between(0.0, 100.0)) == [0.0, 4.0, 9.5, 15.0]
+
+
+def test_between_partial_overlap_keeps_original_times():
+    part = _segments().between(5.0, 10.0)
+    assert part.to_dicts() == [
+        {"start": 4.0, "duration": 5.5, "text": "첫 번째는 펑미분식이라는"},
+        {"start": 9.5, "duration": 5.5, "text": "분식집인데 떡볶이가 유명해요"},
+    ]
+    assert part.find_name("펑미분식") == 4.0
+
+
+def test_between_zero_length_segment_uses_start_time():
+    segments = TranscriptSegments([0.0, 5.0, 10.0], [5.0, 0.0, 5.0], ["a", "b", "c"])
+    assert _starts(segments.between(5.0, 10.0)) == [5.0]
+    assert _starts(segments.between(0.0, 5.0)) == [0.0]
+    assert _starts(segments.between(5.0, 5.0)) == []
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_do_runs_once_and_shares_result():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fn(publish):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "places"
+
+        callers = [asyncio.create_task(flights.do("video", fn)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers)
+        return calls, results
+
+    calls, results = asyncio.run(scenario())
+    assert calls == 1
+    assert [result for result, _ in results] == ["places"] * 5
+    # 처음 호출한 쪽만 작업을 시작하고, 나머지는 공유 결과를 받습니다.
+    assert [shared for _, shared in results] == [False, True, True, True, True]
+
+
+def test_progress_reaches_every_subscriber():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+        received = {"a": [], "b": []}
+
+        async def fn(publish):
+            await release.wait()
+            await publish({"progress": 50})
+            return "done"
+
+        def subscriber(name):
+            async def callback(data):
+                received[name].append(data)
+
+            return callback
+
+        first = asyncio.create_task(flights.do("video", fn, subscriber=subscriber("a")))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.join("video", subscriber("b")))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+        return received
+
+    assert asyncio.run(scenario()) == {"a": [{"progress": 50}], "b": [{"progress": 50}]}
+
+
+def test_exception_reaches_every_waiter():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def fn(publish):
+            await release.wait()
+            raise ValueError("gemini failed")
+
+        callers = [asyncio.create_task(flights.do("video", fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert len(results) == 3
+    assert all(isinstance(result, ValueError) and str(result) == "gemini failed" for result in results)
+
+
+def test_cancelling_one_waiter_does_not_cancel_shared_run():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+        finished = False
+
+        async def fn(publish):
+            nonlocal finished
+            await release.wait()
+            finished = True
+            return "places"
+
+        first = asyncio.create_task(flights.do("video", fn))
+        second = asyncio.create_task(flights.do("video", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first, await second, finished
+
+    first, second_result, finished = asyncio.run(scenario())
+    assert first.cancelled()
+    assert second_result == ("places", True)
+    assert finished
+
+
+def test_forget_clears_key_so_next_call_runs_again():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+
+        async def fn(publish):
+            nonlocal calls
+            calls += 1
+            return calls
+
+        first = await flights.do("video", fn)
+        # done 콜백(_forget)은 다음 루프 반복에서 실행됩니다.
+        await asyncio.sleep(0)
+        in_flight = flights.in_flight("video")
+        second = await flights.do("video", fn)
+        return first, second, in_flight, calls
+
+    first, second, in_flight, calls = asyncio.run(scenario())
+    assert not in_flight
+    assert first == (1, False)
+    assert second == (2, False)
+    assert calls == 2
+
+
+def test_forget_runs_after_failure_too():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fn(publish):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await flights.do("video", fn)
+        await asyncio.sleep(0)
+        return flights.in_flight("video")
+
+    assert asyncio.run(scenario()) is False
+
+
+def test_join_on_idle_key_returns_none():
+    async def scenario():
+        return await SingleFlight().join("video")
+
+    assert asyncio.run(scenario()) == (None, False)